@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+# (mtime_ns, size) of a file, or None when it does not exist
+FileSig = Optional[Tuple[int, int]]
+
+
+def _file_sig(path: str) -> FileSig:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ArtifactCache:
+    """
+    In-memory cache of values derived from artifact files.
+
+    Each entry remembers the mtime/size of every file it was built from
+    (including files that were missing, so a newly added file also counts as
+    a change). A lookup re-stats those files and rebuilds only when one of
+    them changed, so edited or regenerated CSVs are picked up without a
+    restart while unchanged ones are never re-parsed. At most max_entries
+    values are kept; the least recently used one is dropped first. Builds
+    run outside the lock, so lookups from worker threads never wait on one.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[FileSig, ...], List[str], object]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def peek(self, key: Hashable, paths: Sequence[str]) -> Optional[object]:
+        """
+        The cached value for key if it is still current, else None (no build).
+        """
+        sig = tuple(_file_sig(p) for p in paths)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != sig:
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def get(self, key: Hashable, paths: Sequence[str], build: Callable[[], object]) -> object:
+        """
+        Return the cached value for key, rebuilding it if any of paths changed.
+        """
+        sig = tuple(_file_sig(p) for p in paths)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == sig:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[2]
+            self.misses += 1
+        value = build()
+        with self._lock:
+            self._entries[key] = (sig, list(paths), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def get_json(self, key: Hashable, paths: Sequence[str], build: Callable[[], object]) -> bytes:
+        """
+        Like get(), but caches the payload already serialized as JSON bytes.
+        """
+        return self.get(key, paths, lambda: dump_json(build()))
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Drop stale entries (or every entry if force) and return how many went.
+        """
+        with self._lock:
+            if force:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            stale = [
+                key
+                for key, (sig, paths, _) in self._entries.items()
+                if tuple(_file_sig(p) for p in paths) != sig
+            ]
+            for key in stale:
+                self._entries.pop(key, None)
+            return len(stale)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def dump_json(payload: object) -> bytes:
+    # Same settings as FastAPI's default JSONResponse
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-row scoring calls into one matrix call.
+
+    Rows submitted from /api/predict wait in a queue until either max_rows
+    rows are pending or max_wait_ms has passed since the first one arrived;
+    the whole queue is then scored with a single awaited score_fn(X) call
+    (e.g. on the CPU executor) and each caller gets back its own probability.
+    The queue lives on the event loop, so no locking is needed, and the loop
+    keeps serving while a batch is scored.
+    """
+
+    def __init__(
+        self,
+        score_fn: Callable[[np.ndarray], Awaitable[np.ndarray]],
+        max_rows: int = 64,
+        max_wait_ms: float = 2.0,
+    ):
+        self.score_fn = score_fn
+        self.max_rows = max(1, int(max_rows))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._pending: List[Tuple[np.ndarray, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._scoring: Set[asyncio.Task] = set()  # batches being scored
+
+        self.batches = 0
+        self.rows = 0
+        self.max_batch = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.size_hist: Dict[int, int] = {}
+
+    async def submit(self, x: np.ndarray) -> float:
+        """
+        Queue one (1, n_features) row and wait for its probability.
+        """
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((x, fut, time.perf_counter()))
+
+        if len(self._pending) >= self.max_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._score(batch))
+        self._scoring.add(task)
+        task.add_done_callback(self._scoring.discard)
+
+    async def _score(self, batch: List[Tuple[np.ndarray, asyncio.Future, float]]) -> None:
+        started = time.perf_counter()
+        try:
+            probs = await self.score_fn(np.vstack([x for x, _, _ in batch]))
+        except Exception as e:
+            for _, fut, _ in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+        else:
+            for (_, fut, _), p in zip(batch, probs):
+                if not fut.done():  # caller may have disconnected
+                    fut.set_result(float(p))
+
+        waits = [started - t0 for _, _, t0 in batch]
+        self.batches += 1
+        self.rows += len(batch)
+        self.max_batch = max(self.max_batch, len(batch))
+        self.wait_sum += sum(waits)
+        self.wait_max = max(self.wait_max, max(waits))
+        bucket = 1 << (len(batch) - 1).bit_length()  # 1, 2, 4, 8, ...
+        self.size_hist[bucket] = self.size_hist.get(bucket, 0) + 1
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Batch-size and queue-wait statistics since startup.
+        """
+        return {
+            "max_rows": self.max_rows,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch,
+            "batch_size_hist": {f"<={k}": v for k, v in sorted(self.size_hist.items())},
+            "mean_queue_wait_ms": 1000.0 * self.wait_sum / self.rows if self.rows else 0.0,
+            "max_queue_wait_ms": 1000.0 * self.wait_max,
+        }
@@ -0,0 +1,227 @@
+"""
+In-process benchmarks for the scoring and dashboard endpoints.
+
+Synthetic transactions in FEATURE_ORDER are drawn around seed rows (the
+feature medians plus the rows of top_risks.csv) with a fixed seed, then each
+path is timed through the ASGI app with FastAPI's TestClient (no network):
+
+    /api/predict (single row, a new row per call so the prediction cache
+    never answers; predict_cached repeats one row), /api/predict-csv at each
+    --sizes row count, /api/curves and /api/metrics (cached and cold),
+    /api/top-risks
+
+Save a baseline, then compare a later run against it; the comparison exits
+with status 1 when any case's median is slower than baseline * (1 + tolerance):
+
+    python -m backend.bench --save bench_baseline.json
+    python -m backend.bench --compare bench_baseline.json --tolerance 0.25
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .transforms import BUNDLE, FEATURE_ORDER
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+
+def seed_rows(art_dir: Optional[str] = None) -> np.ndarray:
+    """
+    Seed matrix: the median row plus every top_risks.csv row (FEATURE_ORDER).
+    """
+    from .columnar import read_table
+    from .config import ARTIFACT_DIR
+
+    rows = [BUNDLE.median_vec]
+    top = read_table(os.path.join(art_dir or ARTIFACT_DIR, "top_risks"))
+    if top is not None:
+        cols = {str(c).lower(): c for c in top.columns}
+        seeds = np.column_stack(
+            [
+                pd.to_numeric(top[cols[k.lower()]], errors="coerce").to_numpy(dtype=float)
+                if k.lower() in cols
+                else np.full(len(top), np.nan)
+                for k in FEATURE_ORDER
+            ]
+        )
+        seeds = np.where(np.isnan(seeds), BUNDLE.median_vec, seeds)
+        rows.extend(seeds)
+    return np.vstack(rows)
+
+
+def synthetic_transactions(n_rows: int, seed: int = 0, seeds: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """
+    n_rows transactions: a random seed row plus Gaussian noise scaled to the
+    spread of the seeds; Time and Amount stay non-negative.
+    """
+    rng = np.random.default_rng(seed)
+    seeds = seed_rows() if seeds is None else seeds
+    spread = seeds.std(axis=0) if len(seeds) > 1 else np.ones(seeds.shape[1])
+    spread = np.where(spread > 0, spread, 1.0)
+    X = seeds[rng.integers(0, len(seeds), n_rows)] + rng.standard_normal((n_rows, seeds.shape[1])) * spread * 0.25
+    for k in ("Time", "Amount"):
+        j = FEATURE_ORDER.index(k)
+        X[:, j] = np.abs(X[:, j])
+    return pd.DataFrame(X, columns=FEATURE_ORDER)
+
+
+def _time(fn: Callable[[], object], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(0.95 * len(samples)))], 3),
+        "min_ms": round(samples[0], 3),
+        "n": repeat,
+    }
+
+
+def _ok(resp):
+    if resp.status_code != 200:
+        raise RuntimeError(f"{resp.request.method} {resp.request.url} -> {resp.status_code}: {resp.text[:200]}")
+    return resp
+
+
+def run(sizes=DEFAULT_SIZES, repeat: int = 20, seed: int = 0, client=None) -> Dict[str, object]:
+    """
+    Run every case and return {"meta": ..., "results": {case: timings}}.
+    Uses client when given, else a TestClient over the app.
+    """
+    from fastapi.testclient import TestClient
+
+    from .main import app
+
+    if client is not None:
+        return {"meta": _meta(seed, sizes), "results": _run_cases(client, sizes, repeat, seed)}
+    with TestClient(app) as client:
+        return {"meta": _meta(seed, sizes), "results": _run_cases(client, sizes, repeat, seed)}
+
+
+def _run_cases(client, sizes, repeat: int, seed: int) -> Dict[str, Dict[str, float]]:
+    from . import inference
+
+    seeds = seed_rows()
+    results: Dict[str, Dict[str, float]] = {}
+    rows = itertools.cycle(synthetic_transactions(repeat * 10 + 1, seed, seeds).to_dict(orient="records"))
+    results["predict"] = _time(
+        lambda: _ok(client.post("/api/predict", json={"input": next(rows)})), repeat * 10
+    )
+    one = next(rows)  # cached by the warmup call, then every call hits
+    results["predict_cached"] = _time(
+        lambda: _ok(client.post("/api/predict", json={"input": one})), repeat * 10
+    )
+
+    for n in sizes:
+        body = synthetic_transactions(n, seed, seeds).to_csv(index=False).encode()
+        reps = max(1, min(repeat, int(2_000_000 / max(n, 1)) // 10))
+        results[f"predict_csv_{n}"] = _time(
+            lambda: _ok(client.post("/api/predict-csv", files={"file": ("bench.csv", body, "text/csv")})),
+            reps,
+            warmup=1 if n <= 100_000 else 0,
+        )
+        del body
+
+    results["top_risks"] = _time(lambda: _ok(client.get("/api/top-risks")), repeat)
+    for name, url in (("curves", "/api/curves"), ("metrics", "/api/metrics")):
+        results[name] = _time(lambda: _ok(client.get(url)), repeat)
+
+        def cold():
+            inference.ARTIFACTS.refresh(force=True)
+            _ok(client.get(url))
+
+        results[f"{name}_cold"] = _time(cold, max(3, repeat // 4))
+
+    return results
+
+
+def _meta(seed: int, sizes) -> Dict[str, object]:
+    import lightgbm
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "lightgbm": lightgbm.__version__,
+        "seed": seed,
+        "sizes": list(sizes),
+    }
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object], tolerance: float) -> List[str]:
+    """
+    Print a current-vs-baseline table; return the cases slower than tolerance allows.
+    """
+    regressions = []
+    base = baseline.get("results", {})
+    print(f"{'case':<24}{'baseline ms':>14}{'current ms':>14}{'ratio':>9}")
+    for case, cur in current["results"].items():
+        ref = base.get(case)
+        if ref is None:
+            print(f"{case:<24}{'-':>14}{cur['median_ms']:>14.3f}{'new':>9}")
+            continue
+        ratio = cur["median_ms"] / ref["median_ms"] if ref["median_ms"] else float("inf")
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(case)
+            flag = "  SLOWER"
+        print(f"{case:<24}{ref['median_ms']:>14.3f}{cur['median_ms']:>14.3f}{ratio:>9.2f}{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.bench", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated /api/predict-csv row counts")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline median")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    current = run(sizes, args.repeat, args.seed)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print("wrote", args.save)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        slower = compare(current, baseline, args.tolerance)
+        if slower:
+            print(f"{len(slower)} case(s) slower than baseline by more than {args.tolerance:.0%}:", ", ".join(slower))
+            return 1
+        return 0
+
+    print(json.dumps(current["results"], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Persistent scoring channel for continuous transaction feeds.
+
+One connection carries any number of transactions. Each is a JSON object:
+either {"id": ..., "input": {feature: value}} or the feature dict itself
+(an "id" key is echoed back and not used as a feature). Results come back
+in arrival order as {"id", "probability", "decision"}.
+
+WebSocket (/api/stream) protocol, with credit-based flow control:
+
+  server -> {"type": "hello", "credit": W, "max_batch": B, "threshold", "model"}
+  client -> a frame holding one transaction, a JSON array of them, or
+            NDJSON lines
+  server -> {"type": "scores", "results": [...], "credit": n}
+  server -> {"type": "error", "detail": ...} before closing on a bad frame
+
+A client may have at most W transactions sent and not yet answered; each
+"scores" message returns n credits. Sending beyond the credit is a
+protocol error (close code 1008), so the server never buffers more than W
+rows per connection. Rows that arrived are scored together, up to
+max_batch per model call, waiting at most max_wait_ms for more.
+
+NDJSON over HTTP (/api/predict/ndjson) is the same without credits: one
+transaction per request line, one result line per transaction, and the
+request body is read only as fast as results are sent back.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+
+try:  # optional fast JSON decoder
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - depends on the environment
+    _loads = json.loads
+
+# (id or None, features) per transaction
+Item = Tuple[object, Dict[str, object]]
+
+
+class ProtocolError(ValueError):
+    """A frame or line that is not a transaction, or a client over its credit."""
+
+
+def split_item(obj: object) -> Item:
+    if not isinstance(obj, dict):
+        raise ProtocolError("Each transaction must be a JSON object.")
+    if isinstance(obj.get("input"), dict):
+        return obj.get("id"), obj["input"]
+    if "id" in obj:
+        obj = dict(obj)
+        return obj.pop("id"), obj
+    return None, obj
+
+
+def parse_line(line: bytes) -> Item:
+    try:
+        return split_item(_loads(line))
+    except ProtocolError:
+        raise
+    except Exception as e:
+        raise ProtocolError(f"Invalid JSON: {e}")
+
+
+def parse_frame(data: bytes) -> List[Item]:
+    """
+    Transactions in one WebSocket frame: an object, an array, or NDJSON.
+    """
+    try:
+        obj = _loads(data)
+    except Exception:
+        return [parse_line(line) for line in data.splitlines() if line.strip()]
+    if isinstance(obj, list):
+        return [split_item(o) for o in obj]
+    return [split_item(obj)]
+
+
+class LineSplitter:
+    """
+    Complete NDJSON lines out of request-body chunks, none longer than
+    max_line_bytes.
+
+    feed() returns the lines a chunk completes. A line over the limit,
+    finished or still pending, stops the stream: feed() returns the lines
+    before it and sets `error`, and nothing is returned after that.
+    """
+
+    def __init__(self, max_line_bytes: int):
+        self.max_line_bytes = max(1, int(max_line_bytes))
+        self.error: Optional[str] = None
+        self._buf = b""
+
+    def _fail(self) -> None:
+        self.error = f"Line longer than {self.max_line_bytes} bytes."
+        self._buf = b""
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        if self.error is not None:
+            return []
+        self._buf += chunk
+        lines: List[bytes] = []
+        if b"\n" in chunk:  # the pending bytes had none, so only then split
+            *lines, self._buf = self._buf.split(b"\n")
+        for i, line in enumerate(lines):
+            if len(line) > self.max_line_bytes:
+                self._fail()
+                return lines[:i]
+        if len(self._buf) > self.max_line_bytes:
+            self._fail()
+        return lines
+
+    def close(self) -> List[bytes]:
+        """
+        The last line when the body did not end with a newline.
+        """
+        rest, self._buf = self._buf, b""
+        return [rest] if rest.strip() and self.error is None else []
+
+
+class CreditWindow:
+    """
+    Per-connection buffer of received, unscored transactions.
+
+    accept() enforces the credit (at most `window` transactions in flight,
+    i.e. received and not yet released after their results were sent);
+    next_batch() hands the scorer up to max_batch of them, waiting up to
+    max_wait_ms for a batch to fill once the first row is there. Runs on
+    the event loop only, like MicroBatcher.
+    """
+
+    def __init__(self, window: int, max_batch: int, max_wait_ms: float):
+        self.window = max(1, int(window))
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.in_flight = 0
+        self.closed = False
+        self._rows: List[Item] = []
+        self._arrived = asyncio.Event()
+
+    def accept(self, items: List[Item]) -> None:
+        if self.in_flight + len(items) > self.window:
+            raise ProtocolError(
+                f"Credit exceeded: {self.in_flight} in flight + {len(items)} sent > window {self.window}."
+            )
+        self.in_flight += len(items)
+        self._rows.extend(items)
+        self._arrived.set()
+
+    def close(self, discard: bool = False) -> None:
+        # discard: the client is gone, so rows not yet scored are dropped
+        self.closed = True
+        if discard:
+            self._rows = []
+        self._arrived.set()
+
+    def release(self, n: int) -> None:
+        self.in_flight -= n
+
+    async def next_batch(self) -> Optional[List[Item]]:
+        """
+        The next rows to score, or None once closed and drained.
+        """
+        while not self._rows:
+            if self.closed:
+                return None
+            self._arrived.clear()
+            await self._arrived.wait()
+        deadline = time.perf_counter() + self.max_wait
+        # no point waiting once the client has used up its credit
+        while len(self._rows) < self.max_batch and self.in_flight < self.window and not self.closed:
+            left = deadline - time.perf_counter()
+            if left <= 0:
+                break
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), left)
+            except asyncio.TimeoutError:
+                break
+        batch, self._rows = self._rows[: self.max_batch], self._rows[self.max_batch :]
+        return batch
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body generator keeps reading the request body.
+
+    Starlette's version listens for the client disconnecting by calling
+    receive() alongside the body (on ASGI servers before spec 2.4), which
+    would swallow the request chunks the generator is waiting for. Here only
+    the generator receives; a client that goes away ends request.stream()
+    with ClientDisconnect instead.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
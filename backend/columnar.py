@@ -0,0 +1,159 @@
+"""
+Typed binary columnar copies of the CSV artifacts, loaded via memory-mapping.
+
+A table "<base>.csv" gets a sibling directory "<base>.npcols/" holding one
+2-D .npy block per dtype (shape n_columns x n_rows, so the transposed
+memmap is exactly the layout pandas keeps internally) plus meta.json with
+the column order and the mtime/size of the CSV it was converted from.
+Loading maps the blocks read-only without parsing or copying; a copy whose
+CSV has changed since conversion is ignored so stale data is never served.
+
+Convert every CSV in one or more artifact folders with:
+
+    python -m backend.columnar backend/model_artifacts backend/model_artifacts_CTGAN
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+COLUMNAR_SUFFIX = ".npcols"
+_META = "meta.json"
+_NUMERIC_KINDS = "biuf"
+
+
+def columnar_meta_path(path_no_ext: str) -> str:
+    return os.path.join(path_no_ext + COLUMNAR_SUFFIX, _META)
+
+
+def _csv_sig(path_no_ext: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path_no_ext + ".csv")
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def write_columnar(path_no_ext: str, df: pd.DataFrame) -> bool:
+    """
+    Write df as <path_no_ext>.npcols/. Returns False (writing nothing) when a
+    column cannot be stored faithfully, e.g. strings with missing values.
+    """
+    blocks: Dict[str, List[str]] = {}
+    for c in df.columns:
+        col = df[c]
+        if col.dtype.kind in _NUMERIC_KINDS:
+            key = col.dtype.str
+        elif col.dtype.kind == "O" or pd.api.types.is_string_dtype(col.dtype):
+            if col.isna().any():
+                return False
+            key = "str"
+        else:
+            return False
+        blocks.setdefault(key, []).append(str(c))
+
+    out_dir = path_no_ext + COLUMNAR_SUFFIX
+    tmp_dir = out_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    meta_blocks = []
+    for i, (key, cols) in enumerate(blocks.items()):
+        sub = df[cols]
+        arr = sub.astype(str).to_numpy(dtype=str) if key == "str" else sub.to_numpy()
+        fname = f"block{i}.npy"
+        np.save(os.path.join(tmp_dir, fname), np.ascontiguousarray(arr.T))
+        meta_blocks.append({"file": fname, "columns": cols})
+
+    meta = {
+        "columns": [str(c) for c in df.columns],
+        "rows": int(len(df)),
+        "blocks": meta_blocks,
+        "source": _csv_sig(path_no_ext),
+    }
+    with open(os.path.join(tmp_dir, _META), "w") as f:
+        json.dump(meta, f)
+
+    # Move the previous copy aside rather than deleting it in place: a reader
+    # then sees either the whole old copy, the whole new one or none (and
+    # falls back to the CSV), never a half-deleted folder
+    old_dir = out_dir + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.isdir(out_dir):
+        os.replace(out_dir, old_dir)
+    os.replace(tmp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return True
+
+
+def read_columnar(path_no_ext: str) -> Optional[pd.DataFrame]:
+    """
+    Memory-map <path_no_ext>.npcols/ into a read-only DataFrame, or None if
+    there is no copy or the CSV changed after it was written.
+    """
+    meta_path = columnar_meta_path(path_no_ext)
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        source = meta.get("source")
+        if source is not None and _csv_sig(path_no_ext) not in (None, source):
+            return None
+
+        folder = os.path.dirname(meta_path)
+        frames = []
+        for block in meta["blocks"]:
+            arr = np.load(os.path.join(folder, block["file"]), mmap_mode="r")
+            frames.append(pd.DataFrame(arr.T, columns=block["columns"], copy=False))
+        if not frames:
+            return pd.DataFrame(index=range(meta.get("rows", 0)))
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, axis=1)
+        return df[meta["columns"]]
+    except Exception as e:
+        print(f"[WARN] Ignoring columnar copy of {path_no_ext}:", e)
+        return None
+
+
+def read_table(path_no_ext: str) -> Optional[pd.DataFrame]:
+    """
+    Prefer the memory-mapped columnar copy, fall back to {path_no_ext}.csv;
+    None when neither exists.
+    """
+    df = read_columnar(path_no_ext)
+    if df is not None:
+        return df
+    p = path_no_ext + ".csv"
+    if os.path.exists(p):
+        return pd.read_csv(p)
+    return None
+
+
+def convert_dir(art_dir: str) -> List[str]:
+    """
+    Write a columnar copy next to every CSV in art_dir; returns the bases converted.
+    """
+    done = []
+    for name in sorted(os.listdir(art_dir)):
+        if not name.endswith(".csv"):
+            continue
+        base = os.path.join(art_dir, name[:-4])
+        if write_columnar(base, pd.read_csv(base + ".csv")):
+            done.append(base)
+        else:
+            print(f"[WARN] Skipped {base}.csv (column types not storable)")
+    return done
+
+
+if __name__ == "__main__":
+    from .config import ARTIFACT_DIR
+
+    for d in sys.argv[1:] or [ARTIFACT_DIR]:
+        for base in convert_dir(d):
+            print("wrote", base + COLUMNAR_SUFFIX)
@@ -11,5 +11,93 @@ ALLOWED_ORIGINS = [
 
 ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", "backend/model_artifacts")
 
+# Rows parsed and scored per chunk by /api/predict-csv/stream
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "20000"))
+
+# Tree scorer: "lightgbm" (Booster.predict) or "flat" (packed NumPy arrays)
+TREE_ENGINE = os.getenv("TREE_ENGINE", "lightgbm").lower()
+# Batches larger than this still go to LightGBM's multithreaded predictor
+FLAT_ENGINE_MAX_ROWS = int(os.getenv("FLAT_ENGINE_MAX_ROWS", "1"))
+
+# Per-model registry: models kept loaded, and an optional process RSS budget
+# (MB, 0 = none) above which the least recently used models are evicted
+MODEL_CACHE_MAX_MODELS = int(os.getenv("MODEL_CACHE_MAX_MODELS", "4"))
+MODEL_RSS_BUDGET_MB = float(os.getenv("MODEL_RSS_BUDGET_MB", "0"))
+
+# Opt-in process-pool sharding for uploads of at least SHARD_MIN_ROWS rows
+# (SHARD_WORKERS <= 1 disables it)
+SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", "0"))
+SHARD_MIN_ROWS = int(os.getenv("SHARD_MIN_ROWS", "200000"))
+
+# Opt-in micro-batching of concurrent /api/predict calls
+MICROBATCH_ENABLED = os.getenv("MICROBATCH_ENABLED", "0").lower() in ("1", "true", "yes")
+MICROBATCH_MAX_ROWS = int(os.getenv("MICROBATCH_MAX_ROWS", "64"))
+MICROBATCH_MAX_WAIT_MS = float(os.getenv("MICROBATCH_MAX_WAIT_MS", "2"))
+
+# Background scoring jobs (/api/jobs): spool folder for uploads and results,
+# jobs run at once, jobs allowed to wait, and how long results are kept (s)
+JOB_SPOOL_DIR = os.getenv("JOB_SPOOL_DIR", "backend/job_spool")
+JOB_MAX_CONCURRENT = int(os.getenv("JOB_MAX_CONCURRENT", "1"))
+JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", "16"))
+JOB_TTL_SECONDS = float(os.getenv("JOB_TTL_SECONDS", "3600"))
+
+# Startup: regenerate missing curve artifacts in a "background" thread,
+# "sync" (before serving) or "off"; dummy rows scored by the warmup (0 = skip)
+STARTUP_CURVES = os.getenv("STARTUP_CURVES", "background").lower()
+WARMUP_ROWS = int(os.getenv("WARMUP_ROWS", "64"))
+
+# Per-request sampling profiler ("X-Profile: 1" header); off unless enabled
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0").lower() in ("1", "true", "yes")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+
+# Live per-model top risks (/api/top-risks): rows kept, and an optional folder
+# the trackers are saved to on shutdown and reloaded from on startup
+TOPK_SIZE = int(os.getenv("TOPK_SIZE", "500"))
+TOPK_PERSIST_DIR = os.getenv("TOPK_PERSIST_DIR", "")
+
+# /api/predict result cache (entries, 0 = off; TTL in seconds; optional
+# rounding of the feature vector before hashing) and batch row de-duplication
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL_S = float(os.getenv("PREDICTION_CACHE_TTL_S", "300"))
+PREDICTION_CACHE_DECIMALS = (
+    int(os.getenv("PREDICTION_CACHE_DECIMALS")) if os.getenv("PREDICTION_CACHE_DECIMALS") else None
+)
+PREDICTION_DEDUP = os.getenv("PREDICTION_DEDUP", "1").lower() in ("1", "true", "yes")
+
+# CPU-bound request work (parsing, scoring, artifact builds) runs on this many
+# worker threads; once CPU_MAX_QUEUED more tasks are waiting, new requests get
+# a 503 with Retry-After (seconds)
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(min(4, os.cpu_count() or 1))))
+CPU_MAX_QUEUED = int(os.getenv("CPU_MAX_QUEUED", "32"))
+CPU_RETRY_AFTER_S = int(os.getenv("CPU_RETRY_AFTER_S", "1"))
+
+# Per-row reason codes (?explain=top_k): reasons per row, rows explained per
+# request at most, and explanation time allowed as a multiple of the time the
+# request spent before it (parse + fill + score)
+EXPLAIN_TOP_K = int(os.getenv("EXPLAIN_TOP_K", "3"))
+EXPLAIN_MAX_ROWS = int(os.getenv("EXPLAIN_MAX_ROWS", "1000"))
+EXPLAIN_COST_MULTIPLE = float(os.getenv("EXPLAIN_COST_MULTIPLE", "1.0"))
+
+# Drift monitor (/api/drift): features are judged once DRIFT_MIN_ROWS rows
+# were scored, and flagged when the mean moves more than DRIFT_MEAN_Z reference
+# std devs, the std leaves [1/DRIFT_STD_RATIO, DRIFT_STD_RATIO] x reference,
+# or more than DRIFT_FILL_RATE of cells were median-filled; the score
+# histogram is flagged above DRIFT_PSI
+DRIFT_ENABLED = os.getenv("DRIFT_ENABLED", "1").lower() in ("1", "true", "yes")
+DRIFT_MIN_ROWS = int(os.getenv("DRIFT_MIN_ROWS", "500"))
+DRIFT_MEAN_Z = float(os.getenv("DRIFT_MEAN_Z", "0.5"))
+DRIFT_STD_RATIO = float(os.getenv("DRIFT_STD_RATIO", "2.0"))
+DRIFT_FILL_RATE = float(os.getenv("DRIFT_FILL_RATE", "0.05"))
+DRIFT_PSI = float(os.getenv("DRIFT_PSI", "0.2"))
+
+# Persistent scoring channel (/api/stream WebSocket, /api/predict/ndjson):
+# transactions a client may have in flight (credit window), rows scored per
+# model call at most, how long a batch waits for more rows (ms), and the
+# longest NDJSON line accepted (bytes)
+CHANNEL_WINDOW = int(os.getenv("CHANNEL_WINDOW", "1024"))
+CHANNEL_MAX_BATCH = int(os.getenv("CHANNEL_MAX_BATCH", "256"))
+CHANNEL_MAX_WAIT_MS = float(os.getenv("CHANNEL_MAX_WAIT_MS", "1"))
+CHANNEL_MAX_LINE_BYTES = int(os.getenv("CHANNEL_MAX_LINE_BYTES", "65536"))
+
 print("ARTIFACT_DIR:", ARTIFACT_DIR)
 print("CORS allowed origins:", ALLOWED_ORIGINS)
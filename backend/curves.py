@@ -0,0 +1,307 @@
+"""
+ROC / PR / threshold-sweep artifacts from one sorted pass over the scores.
+
+CurveCounts keeps the distinct scores of a labelled evaluation set (in
+ascending order) with the number of positives and negatives at each one.
+Every curve point is a cumulative count over those arrays, so the scores
+are sorted once per build, not once per sklearn call. Merging new rows
+into an existing CurveCounts is a stable sort of two sorted runs. That is
+linear, so appended labels are folded in without re-reading the whole
+set.
+
+The counts are persisted next to the artifacts (CURVE_STATE_FILE), together
+with how many bytes of test_scored.csv they cover. The next build then only
+parses the rows appended after that offset. Every file is written to a
+temporary name and renamed over the old one, so readers never see a
+half-written artifact.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import zlib
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .columnar import read_columnar
+from .operating_points import ScoreIndex
+
+# np.trapz was renamed np.trapezoid in NumPy 2.0 (and later removed)
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+CURVE_STATE_FILE = "curve_state.npz"
+_CHECK_BYTES = 4096  # bytes before the covered offset that must be unchanged
+
+
+class CurveCounts:
+    """
+    Positive / negative counts per distinct score (ascending).
+    """
+
+    def __init__(self, scores: np.ndarray, pos: np.ndarray, neg: np.ndarray):
+        self.scores = np.asarray(scores, dtype=np.float64)
+        self.pos = np.asarray(pos, dtype=np.int64)
+        self.neg = np.asarray(neg, dtype=np.int64)
+
+    @classmethod
+    def from_labels(cls, y_true: np.ndarray, y_score: np.ndarray) -> "CurveCounts":
+        y = np.asarray(y_true).astype(bool)
+        scores, inverse = np.unique(np.asarray(y_score, dtype=np.float64), return_inverse=True)
+        total = np.bincount(inverse, minlength=len(scores))
+        pos = np.bincount(inverse, weights=y, minlength=len(scores)).astype(np.int64)
+        return cls(scores, pos, total - pos)
+
+    @property
+    def positives(self) -> int:
+        return int(self.pos.sum())
+
+    @property
+    def negatives(self) -> int:
+        return int(self.neg.sum())
+
+    @property
+    def n(self) -> int:
+        return self.positives + self.negatives
+
+    def merge(self, other: "CurveCounts") -> "CurveCounts":
+        """
+        Counts of both sets together (the inputs are left untouched).
+        """
+        scores = np.concatenate([self.scores, other.scores])
+        # Two sorted runs: the stable (tim)sort merges them in linear time
+        order = np.argsort(scores, kind="stable")
+        scores = scores[order]
+        starts = np.flatnonzero(np.r_[True, scores[1:] != scores[:-1]])
+        pos = np.add.reduceat(np.concatenate([self.pos, other.pos])[order], starts)
+        neg = np.add.reduceat(np.concatenate([self.neg, other.neg])[order], starts)
+        return CurveCounts(scores[starts], pos, neg)
+
+    def _descending(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # (thresholds, tps, fps): rows with score >= threshold, highest first
+        return self.scores[::-1], np.cumsum(self.pos[::-1]), np.cumsum(self.neg[::-1])
+
+    def roc(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (fpr, tpr, thresholds) like sklearn's roc_curve (drop_intermediate).
+        """
+        thresholds, tps, fps = self._descending()
+        if len(fps) > 2:  # keep only the corners of the curve
+            keep = np.r_[True, np.logical_or(np.diff(fps, 2), np.diff(tps, 2)), True]
+            thresholds, tps, fps = thresholds[keep], tps[keep], fps[keep]
+        tps, fps = np.r_[0, tps], np.r_[0, fps]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fpr = fps / fps[-1] if fps[-1] > 0 else np.full(len(fps), np.nan)
+            tpr = tps / tps[-1] if tps[-1] > 0 else np.full(len(tps), np.nan)
+        return fpr, tpr, np.r_[np.inf, thresholds]
+
+    def pr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (precision, recall, thresholds) like sklearn's precision_recall_curve.
+        """
+        thresholds, tps, fps = self._descending()
+        ps = tps + fps
+        precision = np.divide(tps, ps, out=np.zeros(len(ps)), where=ps != 0)
+        recall = tps / tps[-1] if len(tps) and tps[-1] > 0 else np.ones(len(tps))
+        return np.r_[precision[::-1], 1.0], np.r_[recall[::-1], 0.0], thresholds[::-1]
+
+    def average_precision(self) -> float:
+        precision, recall, _ = self.pr()
+        return float(-np.sum(np.diff(recall) * precision[:-1]))
+
+    def roc_auc(self) -> float:
+        fpr, tpr, _ = self.roc()
+        return float(_trapezoid(tpr, fpr))
+
+    def sweep(self, thresholds: Iterable[float]) -> pd.DataFrame:
+        """
+        Confusion counts at each threshold (flagged when score >= threshold),
+        in the columns of threshold_sweep.csv, from the same ScoreIndex that
+        answers /api/operating-points.
+        """
+        cols = ScoreIndex.from_counts(self.scores, self.pos, self.neg).counts(list(thresholds))
+        return pd.DataFrame(
+            {
+                "threshold": cols["threshold"],
+                "precision": cols["precision"],
+                "recall": cols["recall"],
+                "false_pos": cols["fp"],
+                "false_neg": cols["fn"],
+                "true_pos": cols["tp"],
+            }
+        )
+
+
+# -----------------------------------------------------------------------------
+# Atomic writes
+# -----------------------------------------------------------------------------
+def _tmp_path(path: str) -> str:
+    return f"{path}.tmp{os.getpid()}"
+
+
+def write_csv_atomic(path: str, df: pd.DataFrame) -> None:
+    """
+    df.to_csv(path), visible to readers only once complete.
+    """
+    tmp = _tmp_path(path)
+    try:
+        df.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+# -----------------------------------------------------------------------------
+# Persisted counts and the part of test_scored.csv they cover
+# -----------------------------------------------------------------------------
+def _crc(path: str, start: int, end: int) -> int:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return zlib.crc32(f.read(end - start))
+
+
+def source_signature(csv_path: str, covered: int) -> Dict[str, object]:
+    """
+    Fingerprint of the first `covered` bytes of csv_path: the file may grow
+    past them, but an edit inside them forces a full rebuild.
+    """
+    return {
+        "bytes": covered,
+        "head_crc": _crc(csv_path, 0, min(covered, _CHECK_BYTES)),
+        "tail_crc": _crc(csv_path, max(0, covered - _CHECK_BYTES), covered),
+    }
+
+
+def covered_bytes(csv_path: str) -> int:
+    """
+    Bytes of csv_path up to and including its last newline (a trailing
+    partial row is left for the next build).
+    """
+    size = os.path.getsize(csv_path)
+    with open(csv_path, "rb") as f:
+        f.seek(max(0, size - 1))
+        if size == 0 or f.read(1) == b"\n":
+            return size
+        # rare: no trailing newline, scan back for the last one
+        f.seek(0)
+        return f.read().rfind(b"\n") + 1
+
+
+def save_state(art_dir: str, counts: CurveCounts, meta: Dict[str, object]) -> None:
+    path = os.path.join(art_dir, CURVE_STATE_FILE)
+    tmp = _tmp_path(path) + ".npz"  # np.savez appends .npz otherwise
+    try:
+        np.savez(tmp, scores=counts.scores, pos=counts.pos, neg=counts.neg, meta=json.dumps(meta))
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_state(art_dir: str) -> Optional[Tuple[CurveCounts, Dict[str, object]]]:
+    path = os.path.join(art_dir, CURVE_STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as z:
+            counts = CurveCounts(z["scores"], z["pos"], z["neg"])
+            return counts, json.loads(str(z["meta"]))
+    except Exception as e:
+        print(f"[WARN] Ignoring {path}:", e)
+        return None
+
+
+def appended_rows(csv_path: str, meta: Dict[str, object]) -> Optional[Tuple[pd.DataFrame, int]]:
+    """
+    (rows added to csv_path since meta["source"] was recorded, new covered
+    offset), or None when the covered part changed and the counts must be
+    rebuilt.
+    """
+    source = meta.get("source")
+    if not source or not os.path.exists(csv_path):
+        return None
+    covered = int(source["bytes"])
+    end = covered_bytes(csv_path)
+    if end < covered or source_signature(csv_path, covered) != source:
+        return None
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        f.seek(covered)
+        tail = f.read(end - covered)
+    return pd.read_csv(io.BytesIO(header + tail)), end
+
+
+def _read_covered(csv_path: str) -> Tuple[pd.DataFrame, Optional[int]]:
+    # The columnar copy when it matches the CSV (no parsing), else the CSV
+    # up to its last complete row; the offset is None for a columnar-only table
+    base = csv_path[: -len(".csv")]
+    if not os.path.exists(csv_path):
+        df = read_columnar(base)
+        if df is None:
+            raise FileNotFoundError(f"Missing table: {csv_path}")
+        return df, None
+    end = covered_bytes(csv_path)
+    df = read_columnar(base)
+    if df is not None and os.path.getsize(csv_path) == end:
+        return df, end
+    with open(csv_path, "rb") as f:
+        return pd.read_csv(io.BytesIO(f.read(end))), end
+
+
+def _counts_of(df: pd.DataFrame, label_col: str, proba_col: str) -> CurveCounts:
+    y_true = pd.to_numeric(df[label_col], errors="coerce").fillna(0).astype(int).to_numpy()
+    y_score = pd.to_numeric(df[proba_col], errors="coerce").fillna(0.0).to_numpy()
+    return CurveCounts.from_labels(y_true, y_score)
+
+
+def update_counts(
+    art_dir: str,
+    find_cols: Callable[[pd.DataFrame], Tuple[str, str]],
+    full: bool = False,
+) -> Tuple[CurveCounts, Dict[str, object], Dict[str, object]]:
+    """
+    Counts for art_dir/test_scored.csv: the persisted counts plus any
+    appended rows, or a full recount (full=True, no usable state, or the
+    covered part of the file changed). find_cols picks the (label,
+    probability) columns of a full read.
+
+    Returns (counts, state meta to save once the artifacts are written,
+    {"mode": "full" | "incremental" | "unchanged", "rows", "added"}).
+    """
+    csv_path = os.path.join(art_dir, "test_scored.csv")
+    state = None if full else load_state(art_dir)
+    if state is not None:
+        counts, meta = state
+        tail = appended_rows(csv_path, meta)
+        if tail is not None:
+            new, end = tail
+            if len(new):
+                counts = counts.merge(_counts_of(new, meta["label_col"], meta["proba_col"]))
+            meta = {**meta, "source": source_signature(csv_path, end)}
+            mode = "incremental" if len(new) else "unchanged"
+            return counts, meta, {"mode": mode, "rows": counts.n, "added": len(new)}
+
+    df, end = _read_covered(csv_path)
+    label_col, proba_col = find_cols(df)
+    counts = _counts_of(df, label_col, proba_col)
+    meta = {
+        "label_col": label_col,
+        "proba_col": proba_col,
+        "source": source_signature(csv_path, end) if end is not None else None,
+    }
+    return counts, meta, {"mode": "full", "rows": counts.n, "added": counts.n}
+
+
+def is_stale(art_dir: str) -> bool:
+    """
+    True when test_scored.csv has complete rows the persisted counts do not
+    cover (or there are no usable persisted counts).
+    """
+    csv_path = os.path.join(art_dir, "test_scored.csv")
+    state = load_state(art_dir)
+    if state is None or not state[1].get("source") or not os.path.exists(csv_path):
+        return True
+    return covered_bytes(csv_path) != int(state[1]["source"]["bytes"])
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling of the polyline (x, y).
+
+    Returns the indices of the n_out points that best preserve the visual
+    shape: the first and last points are always kept, and from each of the
+    n_out - 2 buckets in between the point forming the largest triangle with
+    the previously kept point and the next bucket's centroid is picked.
+    Works on any point order (ROC curves ascend, PR curves descend in recall).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def decimate_curve(
+    x: List[float], y: List[float], max_points: Optional[int]
+) -> Tuple[List[float], List[float]]:
+    """
+    Downsample a pair of coordinate lists to at most max_points with LTTB.
+    """
+    if max_points is None or len(x) <= max_points:
+        return x, y
+    idx = lttb_indices(np.asarray(x), np.asarray(y), max_points)
+    return [x[i] for i in idx], [y[i] for i in idx]
@@ -0,0 +1,356 @@
+"""
+Constant-memory drift monitoring of scored traffic.
+
+Every scored batch updates, per FEATURE_ORDER column, a FeatureSketch
+(count, NaN count, mean/M2, median-fill count and a log-linear bucket
+histogram for quantiles), plus a fixed-bin ScoreSketch of the probabilities.
+Updates are a handful of whole-matrix NumPy calls, memory does not grow with
+traffic, and two sketches merge exactly (merge()), so per-worker or
+per-window sketches can be combined.
+
+DriftMonitor.report() compares the live sketches with reference stats taken
+from the model's training scaler (mean_ / scale_) and, when the model ships
+a scored evaluation set, with its score histogram (PSI).
+
+The scaler is the reference because it is the only artifact with a mean and
+std for every feature over all training traffic. synthetic_quality_check.csv
+has Real_Mean / Real_Std only for V1, V4, V14 and Amount, and they describe
+the real fraud rows the generator was fitted to, in scaled units. Judging
+mostly legitimate traffic against them would flag every healthy feed (V14's
+fraud mean is 7 training std devs below the overall one). They are reported
+next to the live stats as fraud_ref_mean / fraud_ref_std, converted to raw
+units, but never flagged. fraud_metadata.json only carries the operating
+threshold and summary metrics, no per-feature distributions.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Log-linear buckets: 2**_MANT_BITS per power of two for |x| in
+# [2**_EXP_MIN, 2**_EXP_MAX) (~1.5% relative error), mirrored for negatives,
+# one bucket for zero/tiny values; |x| outside the range is clamped
+_MANT_BITS = 5
+_EXP_MIN, _EXP_MAX = -16, 32
+_SIDE = (_EXP_MAX - _EXP_MIN) << _MANT_BITS
+_N_BUCKETS = 2 * _SIDE + 1
+_ZERO = _SIDE
+_KEY_OFFSET = (1023 + _EXP_MIN) << _MANT_BITS
+
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def _bucket_lut() -> np.ndarray:
+    """
+    Bucket for every value of the top 17 bits of a float64 (sign, exponent,
+    _MANT_BITS mantissa bits), so bucketing a batch is a shift and a gather;
+    NaN / inf map to the extra slot _N_BUCKETS, which is discarded.
+    """
+    raw = np.arange(1 << (12 + _MANT_BITS), dtype=np.int64)
+    negative = raw >> (11 + _MANT_BITS) == 1
+    magnitude = raw & ((1 << (11 + _MANT_BITS)) - 1)
+    key = np.clip(magnitude - _KEY_OFFSET, -1, _SIDE - 1)  # -1: below range, "zero"
+    lut = np.where(negative, _ZERO - 1 - key, _ZERO + 1 + key)
+    lut[magnitude >> _MANT_BITS == 2047] = _N_BUCKETS
+    return lut.astype(np.int32)
+
+
+_LUT = _bucket_lut()
+_SHIFT = np.uint64(52 - _MANT_BITS)
+
+
+def _bucket_values() -> np.ndarray:
+    """
+    Representative (geometric mid) value of every bucket, in index order.
+    """
+    key = np.arange(_SIDE)
+    exp = (key >> _MANT_BITS) + _EXP_MIN
+    frac = (key & ((1 << _MANT_BITS) - 1)) + 0.5
+    mag = np.ldexp(1.0 + frac / (1 << _MANT_BITS), exp)
+    return np.concatenate((-mag[::-1], [0.0], mag))
+
+
+_BUCKET_VALUES = _bucket_values()
+
+
+class FeatureSketch:
+    """
+    Mergeable per-column summaries of an (n_rows, n_features) stream.
+    """
+
+    def __init__(self, n_features: int):
+        self.n_features = n_features
+        self.count = np.zeros(n_features, dtype=np.int64)  # finite values
+        self.nan = np.zeros(n_features, dtype=np.int64)  # NaN / inf
+        self.fills = np.zeros(n_features, dtype=np.int64)
+        self.rows = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+        self.buckets = np.zeros((n_features, _N_BUCKETS), dtype=np.int64)
+        self._offsets = np.arange(n_features, dtype=np.int32) * (_N_BUCKETS + 1)
+
+    def update(self, X: np.ndarray, fills: Optional[np.ndarray] = None) -> None:
+        """
+        Add a batch (raw units, after median filling); fills holds how many
+        cells of each column were median-filled.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        if not len(X):
+            return
+        finite = np.isfinite(X)
+        if finite.all():  # the usual case: plain column sums
+            n = np.full(self.n_features, len(X), dtype=np.int64)
+            b_mean = X.sum(axis=0) / len(X)
+            D = X - b_mean
+        else:
+            n = finite.sum(axis=0)
+            Xz = np.where(finite, X, 0.0)
+            b_mean = Xz.sum(axis=0) / np.maximum(n, 1)
+            D = np.where(finite, Xz - b_mean, 0.0)
+        b_m2 = np.einsum("ij,ij->j", D, D)
+
+        # Chan et al. pairwise merge of (count, mean, M2)
+        total = self.count + n
+        delta = b_mean - self.mean
+        safe = np.maximum(total, 1)
+        self.mean = self.mean + delta * n / safe
+        self.m2 = self.m2 + b_m2 + delta**2 * self.count * n / safe
+        self.count = total
+        self.nan += len(X) - n
+        self.rows += len(X)
+        if fills is not None:
+            self.fills += np.asarray(fills, dtype=np.int64)
+
+        idx = _LUT[X.view(np.uint64) >> _SHIFT]
+        idx += self._offsets
+        counts = np.bincount(idx.ravel(), minlength=self.n_features * (_N_BUCKETS + 1))
+        self.buckets += counts.reshape(self.n_features, _N_BUCKETS + 1)[:, :_N_BUCKETS]
+
+    def merge(self, other: "FeatureSketch") -> None:
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        safe = np.maximum(total, 1)
+        self.mean = self.mean + delta * other.count / safe
+        self.m2 = self.m2 + other.m2 + delta**2 * self.count * other.count / safe
+        self.count = total
+        self.nan += other.nan
+        self.fills += other.fills
+        self.rows += other.rows
+        self.buckets += other.buckets
+
+    def std(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, np.sqrt(self.m2 / np.maximum(self.count - 1, 1)), np.nan)
+
+    def quantiles(self, qs: Sequence[float] = QUANTILES) -> np.ndarray:
+        """
+        (n_features, len(qs)) approximate quantiles (NaN for empty columns).
+        """
+        cum = np.cumsum(self.buckets, axis=1)
+        out = np.full((self.n_features, len(qs)), np.nan)
+        for j in range(self.n_features):
+            if cum[j, -1]:
+                pos = np.searchsorted(cum[j], np.asarray(qs) * cum[j, -1], side="left")
+                out[j] = _BUCKET_VALUES[np.minimum(pos, _N_BUCKETS - 1)]
+        return out
+
+
+class ScoreSketch:
+    """
+    Fixed-bin histogram of probabilities in [0, 1], plus the alert count.
+    """
+
+    def __init__(self, bins: int = 20):
+        self.edges = np.linspace(0.0, 1.0, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.alerts = 0
+        self.total = 0.0
+
+    def update(self, probs: np.ndarray, thresh: float) -> None:
+        p = np.asarray(probs, dtype=np.float64).reshape(-1)
+        p = p[np.isfinite(p)]
+        bins = np.minimum((p * len(self.counts)).astype(np.int64), len(self.counts) - 1)
+        self.counts += np.bincount(np.maximum(bins, 0), minlength=len(self.counts))
+        self.alerts += int((p >= thresh).sum())
+        self.total += float(p.sum())
+
+    def merge(self, other: "ScoreSketch") -> None:
+        self.counts += other.counts
+        self.alerts += other.alerts
+        self.total += other.total
+
+
+def psi(expected: np.ndarray, actual: np.ndarray, eps: float = 1e-4) -> Optional[float]:
+    """
+    Population stability index between two histograms over the same bins.
+    """
+    e, a = np.asarray(expected, float), np.asarray(actual, float)
+    if e.sum() <= 0 or a.sum() <= 0:
+        return None
+    e = np.maximum(e / e.sum(), eps)
+    a = np.maximum(a / a.sum(), eps)
+    return float(((a - e) * np.log(a / e)).sum())
+
+
+def _num(v) -> Optional[float]:
+    v = float(v)
+    return None if v != v else v
+
+
+class DriftMonitor:
+    """
+    Live feature and score sketches for one model, compared on demand with
+    its reference stats.
+
+    Single rows from /api/predict are buffered and added in blocks of
+    row_block, so they also take the vectorized path. fraud_mean / fraud_std
+    (NaN where unknown) are the fraud-class stats reported alongside.
+    """
+
+    def __init__(
+        self,
+        feature_names: List[str],
+        ref_mean: Optional[np.ndarray] = None,
+        ref_std: Optional[np.ndarray] = None,
+        ref_scores: Optional[np.ndarray] = None,
+        row_block: int = 256,
+        fraud_mean: Optional[np.ndarray] = None,
+        fraud_std: Optional[np.ndarray] = None,
+    ):
+        self.feature_names = list(feature_names)
+        self.ref_mean = ref_mean
+        self.ref_std = ref_std
+        self.fraud_mean = fraud_mean
+        self.fraud_std = fraud_std
+        self.features = FeatureSketch(len(feature_names))
+        self.scores = ScoreSketch()
+        self.ref_scores = None
+        if ref_scores is not None:
+            self.ref_scores = ScoreSketch(len(self.scores.counts))
+            self.ref_scores.update(ref_scores, np.inf)
+        self.row_block = row_block
+        self._rows: List[np.ndarray] = []
+        self._row_fills: List[np.ndarray] = []
+        self._row_probs: List[float] = []
+        self._row_thresh: List[float] = []
+        self._lock = threading.Lock()
+
+    def observe_features(self, X: np.ndarray, fills: Optional[np.ndarray] = None) -> None:
+        """
+        Add a filled batch in raw units (call before it is scaled in place).
+        """
+        with self._lock:
+            self.features.update(X, fills)
+
+    def observe_scores(self, probs: np.ndarray, thresh: float) -> None:
+        with self._lock:
+            self.scores.update(probs, thresh)
+
+    def observe_row(self, x: np.ndarray, prob: float, thresh: float, fills: np.ndarray) -> None:
+        with self._lock:
+            self._rows.append(np.asarray(x, dtype=np.float64).reshape(-1))
+            self._row_fills.append(fills)
+            self._row_probs.append(prob)
+            self._row_thresh.append(thresh)
+            if len(self._rows) >= self.row_block:
+                self._flush_rows()
+
+    def _flush_rows(self) -> None:
+        if not self._rows:
+            return
+        self.features.update(np.vstack(self._rows), np.sum(self._row_fills, axis=0))
+        probs = np.asarray(self._row_probs)
+        for t in set(self._row_thresh):  # usually one operating threshold
+            sel = np.asarray(self._row_thresh) == t
+            self.scores.update(probs[sel], t)
+        self._rows, self._row_fills, self._row_probs, self._row_thresh = [], [], [], []
+
+    def reset(self) -> None:
+        with self._lock:
+            self.features = FeatureSketch(len(self.feature_names))
+            self.scores = ScoreSketch(len(self.scores.counts))
+            self._rows, self._row_fills, self._row_probs, self._row_thresh = [], [], [], []
+
+    def report(
+        self,
+        min_rows: int = 500,
+        mean_z: float = 0.5,
+        std_ratio: float = 2.0,
+        fill_rate: float = 0.05,
+        psi_limit: float = 0.2,
+    ) -> Dict[str, object]:
+        """
+        Live stats next to the reference for every feature and the score,
+        with the checks that failed. Nothing is flagged before min_rows rows.
+        """
+        with self._lock:
+            self._flush_rows()
+            fs = self.features
+            mean, std, qs = fs.mean.copy(), fs.std(), fs.quantiles()
+            count, nan, fills, rows = fs.count.copy(), fs.nan.copy(), fs.fills.copy(), fs.rows
+            sc = self.scores
+            score_counts, alerts, score_total = sc.counts.copy(), sc.alerts, sc.total
+
+        judged = rows >= min_rows
+        features = []
+        for j, name in enumerate(self.feature_names):
+            rate = fills[j] / rows if rows else None
+            item: Dict[str, object] = {
+                "feature": name,
+                "count": int(count[j]),
+                "nan_rate": nan[j] / rows if rows else None,
+                "fill_rate": rate,
+                "mean": _num(mean[j]) if count[j] else None,
+                "std": _num(std[j]),
+                "quantiles": {f"p{int(q * 100)}": _num(v) for q, v in zip(QUANTILES, qs[j])},
+            }
+            flags = []
+            if self.ref_mean is not None and self.ref_std is not None and count[j]:
+                ref_sd = float(self.ref_std[j]) or 1.0
+                z = (mean[j] - self.ref_mean[j]) / ref_sd
+                ratio = std[j] / ref_sd
+                item.update(
+                    ref_mean=float(self.ref_mean[j]),
+                    ref_std=float(self.ref_std[j]),
+                    mean_shift_z=_num(z),
+                    std_ratio=_num(ratio),
+                )
+                if judged and abs(z) > mean_z:
+                    flags.append("mean_shift")
+                if judged and ratio == ratio and not (1 / std_ratio <= ratio <= std_ratio):
+                    flags.append("std_ratio")
+            if self.fraud_mean is not None and self.fraud_mean[j] == self.fraud_mean[j]:
+                item.update(
+                    fraud_ref_mean=float(self.fraud_mean[j]),
+                    fraud_ref_std=_num(self.fraud_std[j]) if self.fraud_std is not None else None,
+                )
+            if judged and rate is not None and rate > fill_rate:
+                flags.append("fill_rate")
+            item["flags"] = flags
+            features.append(item)
+
+        n_scores = int(score_counts.sum())
+        score: Dict[str, object] = {
+            "count": n_scores,
+            "mean": score_total / n_scores if n_scores else None,
+            "alert_rate": alerts / n_scores if n_scores else None,
+            "histogram": {"edges": self.scores.edges.tolist(), "counts": score_counts.tolist()},
+            "flags": [],
+        }
+        if self.ref_scores is not None:
+            score["ref_histogram"] = self.ref_scores.counts.tolist()
+            score["psi"] = psi(self.ref_scores.counts, score_counts)
+            if judged and score["psi"] is not None and score["psi"] > psi_limit:
+                score["flags"].append("psi")
+
+        drifted = [f["feature"] for f in features if f["flags"]]
+        return {
+            "rows": int(rows),
+            "min_rows": min_rows,
+            "status": "insufficient_data" if not judged else ("drift" if drifted or score["flags"] else "ok"),
+            "drifted_features": drifted,
+            "features": features,
+            "score": score,
+        }
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, TypeVar
+
+from .telemetry import TELEMETRY
+
+T = TypeVar("T")
+
+
+class OverloadedError(RuntimeError):
+    """Raised by CpuExecutor.run when max_queued tasks are already waiting."""
+
+
+class CpuExecutor:
+    """
+    Bounded thread pool for the CPU-bound part of request handlers (CSV
+    parsing, scoring, artifact builds), so the event loop keeps serving.
+
+    At most `workers` tasks run at once and up to `max_queued` more wait for
+    a worker. A new request arriving with the queue full is rejected at once
+    (OverloadedError, a 503 with Retry-After) instead of queueing behind work
+    it would time out on. Follow-up steps of a request that was already
+    admitted pass admit=False, so it is never dropped halfway.
+    """
+
+    def __init__(self, workers: int, max_queued: int, retry_after_s: float = 1.0):
+        self.workers = max(1, int(workers))
+        self.max_queued = max(0, int(max_queued))
+        self.retry_after_s = retry_after_s
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="cpu")
+        self._lock = threading.Lock()
+        self._pending = 0  # submitted and not finished (running + queued)
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+
+        self._depth = TELEMETRY.gauge("cpu_queue_depth")
+        self._busy = TELEMETRY.gauge("cpu_tasks_running")
+        self._wait = TELEMETRY.histogram("cpu_queue_wait_seconds")
+        self._done = TELEMETRY.counter("cpu_tasks_total", result="done")
+        self._rejects = TELEMETRY.counter("cpu_tasks_total", result="rejected")
+
+    @property
+    def queued(self) -> int:
+        return self._pending - self._running
+
+    async def run(self, fn: Callable[..., T], *args, admit: bool = True, **kwargs) -> T:
+        """
+        Run fn(*args, **kwargs) on a worker thread and await its result.
+        """
+        with self._lock:
+            if admit and self._pending >= self.workers + self.max_queued:
+                self.rejected += 1
+                self._rejects.inc()
+                raise OverloadedError(f"{self._pending} tasks already running or waiting")
+            self._pending += 1
+            self._depth.set(self._pending - self._running)
+
+        fut = self._pool.submit(self._call, time.perf_counter(), fn, args, kwargs)
+        fut.add_done_callback(self._finished)
+        # Cancelling the awaiting request cancels the task if it has not started
+        return await asyncio.wrap_future(fut)
+
+    def _call(self, submitted: float, fn: Callable[..., T], args, kwargs) -> T:
+        self._wait.observe(time.perf_counter() - submitted)
+        with self._lock:
+            self._running += 1
+            self._depth.set(self._pending - self._running)
+        self._busy.inc()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._busy.dec()
+            with self._lock:
+                self._running -= 1
+
+    def _finished(self, fut: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+            self._depth.set(self._pending - self._running)
+        self._done.inc()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_p50_s": self._wait.quantile(0.5),
+            "queue_wait_p99_s": self._wait.quantile(0.99),
+        }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
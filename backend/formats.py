@@ -0,0 +1,144 @@
+"""
+Response encodings for scored frames (/api/predict-csv).
+
+The body format follows the Accept header:
+
+  - application/json (default): {"columns", "rows" | "data", "threshold"}
+    with layout=records (one object per row, the original shape) or
+    layout=columnar (one array per column under "data")
+  - text/csv: streamed in STREAM_CHUNK_ROWS slices
+  - application/vnd.apache.arrow.stream: Arrow IPC stream (needs pyarrow)
+
+JSON is encoded with orjson when it is installed (NumPy columns are written
+directly, NaN becomes null), else with the same settings as FastAPI's
+default encoder.
+"""
+from __future__ import annotations
+
+from io import BytesIO
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+
+from .artifact_cache import dump_json
+
+try:  # optional fast JSON encoder
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+LAYOUTS = ("records", "columnar")
+
+
+_MEDIA_TYPES = {"json": "application/json", "csv": "text/csv", "arrow": ARROW_STREAM}
+
+
+def _accept_ranges(accept: str) -> Iterator[Tuple[str, float]]:
+    """
+    (media range, q) for each entry of an Accept header; bad q values are skipped.
+    """
+    for part in accept.lower().split(","):
+        media, *params = [p.strip() for p in part.split(";")]
+        if not media:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = -1.0
+        if 0.0 <= q <= 1.0:
+            yield media, q
+
+
+def negotiate(accept: str) -> str:
+    """
+    "arrow", "csv" or "json" for an Accept header (JSON unless asked otherwise).
+
+    Each format takes the q of the most specific range matching it (exact,
+    then type/*, then */*), so "*/*, text/csv;q=0" still rules CSV out; the
+    highest q wins, ties going to the range listed first, then to JSON.
+    """
+    ranges = list(_accept_ranges(accept or ""))
+    best, best_rank = "json", None
+    for fmt, media in _MEDIA_TYPES.items():
+        kind = media.split("/")[0]
+        match = None
+        for pos, (rng, q) in enumerate(ranges):
+            specificity = {media: 2, kind + "/*": 1, "*/*": 0}.get(rng)
+            if specificity is not None and (match is None or specificity > match[0]):
+                match = (specificity, q, pos)
+        if match is None or match[1] <= 0:
+            continue
+        rank = (match[1], match[0], -match[2])
+        if best_rank is None or rank > best_rank:
+            best, best_rank = fmt, rank
+    return best
+
+
+def _column_values(col: pd.Series):
+    if orjson is not None and col.dtype.kind in "biuf":
+        return np.ascontiguousarray(col.to_numpy())
+    if col.dtype.kind == "f":
+        return [None if v != v else v for v in col.tolist()]
+    return col.astype(object).where(col.notna(), None).tolist()
+
+
+def encode_json(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return dump_json(payload)
+
+
+def json_body(
+    df: pd.DataFrame, threshold: float, layout: str = "records", extra: Optional[Dict[str, object]] = None
+) -> bytes:
+    columns = [str(c) for c in df.columns]
+    if layout == "columnar":
+        data = {name: _column_values(df[c]) for name, c in zip(columns, df.columns)}
+        payload = {"columns": columns, "data": data, "n_rows": len(df), "threshold": threshold}
+    else:
+        payload = {"columns": columns, "rows": df.to_dict(orient="records"), "threshold": threshold}
+    return encode_json({**payload, **(extra or {})})
+
+
+def _csv_chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[str]:
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start : start + chunk_rows].to_csv(index=False, header=start == 0)
+
+
+def arrow_body(df: pd.DataFrame) -> bytes:
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise HTTPException(status_code=406, detail="Arrow output needs pyarrow on the server.")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def frame_response(
+    df: pd.DataFrame,
+    threshold: float,
+    fmt: str,
+    layout: str = "records",
+    chunk_rows: int = 20000,
+    extra: Optional[Dict[str, object]] = None,
+) -> Response:
+    """
+    Encode a scored frame as fmt ("json", "csv" or "arrow"). extra keys are
+    added to the JSON object; CSV and Arrow bodies only carry the frame.
+    """
+    if fmt == "csv":
+        return StreamingResponse(_csv_chunks(df, chunk_rows), media_type="text/csv")
+    if fmt == "arrow":
+        return Response(content=arrow_body(df), media_type=ARROW_STREAM)
+    return Response(content=json_body(df, threshold, layout, extra), media_type="application/json")
@@ -1,34 +1,117 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import os
 import re
+import threading
+import time
 from io import BytesIO
-from typing import Dict, Optional, Tuple, List
+from typing import AsyncIterator, Dict, Iterator, Optional, Tuple, List
 
-import joblib
 import numpy as np
 import pandas as pd
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Header, Query, Request
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from sklearn.metrics import roc_curve, precision_recall_curve, auc, average_precision_score
 
-from .config import ARTIFACT_DIR
-from .transforms import fill_and_order_features, to_model_space, FEATURE_ORDER
+from .artifact_cache import ArtifactCache, dump_json
+from .batching import MicroBatcher
+from .channel import (
+    CreditWindow,
+    DuplexStreamingResponse,
+    Item,
+    LineSplitter,
+    ProtocolError,
+    parse_frame,
+    parse_line,
+)
+from .columnar import columnar_meta_path, read_table, write_columnar
+from .curves import CurveCounts, is_stale, save_state, update_counts, write_csv_atomic
+from .decimation import decimate_curve
+from .drift import DriftMonitor
+from .executor import CpuExecutor, OverloadedError
+from .explain import ExplainBudget, reason_records, top_reasons
+from .formats import LAYOUTS, encode_json, frame_response, negotiate
+from .ingest import iter_upload, read_upload
+from .jobs import JobManager, QueueFullError
+from .operating_points import ScoreIndex
+from .prediction_cache import PredictionCache, RowDeduplicator, row_key
+from .config import (
+    ARTIFACT_DIR,
+    CHANNEL_MAX_BATCH,
+    CHANNEL_MAX_LINE_BYTES,
+    CHANNEL_MAX_WAIT_MS,
+    CHANNEL_WINDOW,
+    CPU_MAX_QUEUED,
+    CPU_RETRY_AFTER_S,
+    CPU_WORKERS,
+    DRIFT_ENABLED,
+    DRIFT_FILL_RATE,
+    DRIFT_MEAN_Z,
+    DRIFT_MIN_ROWS,
+    DRIFT_PSI,
+    DRIFT_STD_RATIO,
+    EXPLAIN_COST_MULTIPLE,
+    EXPLAIN_MAX_ROWS,
+    EXPLAIN_TOP_K,
+    JOB_MAX_CONCURRENT,
+    JOB_MAX_QUEUED,
+    JOB_SPOOL_DIR,
+    JOB_TTL_SECONDS,
+    MICROBATCH_ENABLED,
+    MICROBATCH_MAX_ROWS,
+    MICROBATCH_MAX_WAIT_MS,
+    MODEL_CACHE_MAX_MODELS,
+    MODEL_RSS_BUDGET_MB,
+    PREDICTION_CACHE_DECIMALS,
+    PREDICTION_CACHE_SIZE,
+    PREDICTION_CACHE_TTL_S,
+    PREDICTION_DEDUP,
+    SHARD_MIN_ROWS,
+    SHARD_WORKERS,
+    STARTUP_CURVES,
+    STREAM_CHUNK_ROWS,
+    TOPK_PERSIST_DIR,
+    TOPK_SIZE,
+    WARMUP_ROWS,
+)
+from .registry import MODEL_FILE, LoadedModel, ModelRegistry, load_model
+from .sharding import ShardedScorer
+from .startup import STARTUP
+from .telemetry import TELEMETRY
+from .topk import TopK, TopRiskTracker
+from .transforms import (
+    BUNDLE,
+    fill_and_order_features,
+    fill_and_order_frame,
+    fill_features_into,
+    FEATURE_ORDER,
+    to_model_space,
+)
 
 
 # -----------------------------------------------------------------------------
 # Helpers for model-specific artifact folders
 # -----------------------------------------------------------------------------
+# ?model= ids are folder-name suffixes; anything else could alias a folder
+# under several spellings ("CTGAN/.") or reach outside the artifact folders
+_MODEL_ID = re.compile(r"[A-Za-z0-9_-]+")
+
+
 def _artifact_dir_for(model: Optional[str]) -> str:
     """
     Resolve the artifact directory for a given model id.
 
     If a model-specific folder is found (e.g. backend/model_artifacts_modelId
     or backend/artifacts/modelId), return that, otherwise fall back to the
-    default ARTIFACT_DIR.
+    default ARTIFACT_DIR. Ids other than letters, digits, "_" and "-" are a
+    400, so each folder has exactly one cache key.
     """
     base = ARTIFACT_DIR
+    if model and not _MODEL_ID.fullmatch(model):
+        raise HTTPException(status_code=400, detail=f"Invalid model id '{model}'.")
     if model:
         cand = os.path.join(os.path.dirname(base), f"model_artifacts_{model}")
         if os.path.isdir(cand):
@@ -41,41 +124,330 @@ def _artifact_dir_for(model: Optional[str]) -> str:
     return base
 
 
+def _model_dir_for(model: Optional[str]) -> str:
+    """
+    Folder to load the scoring model from: the model-specific artifact folder
+    when it ships its own model file, otherwise the default ARTIFACT_DIR
+    (e.g. model_artifacts_CTGAN only carries dashboard CSVs).
+    """
+    art_dir = _artifact_dir_for(model)
+    if os.path.exists(os.path.join(art_dir, MODEL_FILE)):
+        return art_dir
+    return ARTIFACT_DIR
+
+
 # -----------------------------------------------------------------------------
 # Constants & model
 # -----------------------------------------------------------------------------
 router = APIRouter(prefix="/api", tags=["inference"])
 
-MODEL_PATH = os.path.join(ARTIFACT_DIR, "fraud_detector_lgb.pkl")  # (typo preserved in asset)
-MODEL = joblib.load(MODEL_PATH)
-DEFAULT_THRESHOLD: float = 0.45  # consider using operating_threshold from metadata
+DEFAULT_THRESHOLD: float = 0.45  # fallback when metadata has no operating_threshold
+
+# Default model is loaded eagerly; others load on first ?model= request
+with STARTUP.phase("model"):
+    DEFAULT_MODEL = load_model(ARTIFACT_DIR, DEFAULT_THRESHOLD, bundle=BUNDLE)
+MODEL = DEFAULT_MODEL.model
+
+REGISTRY = ModelRegistry(
+    lambda art_dir: load_model(art_dir, DEFAULT_THRESHOLD),
+    DEFAULT_MODEL,
+    max_models=MODEL_CACHE_MAX_MODELS,
+    rss_budget_mb=MODEL_RSS_BUDGET_MB,
+)
+
+
+async def _get_model(model: Optional[str]) -> LoadedModel:
+    model_dir = _model_dir_for(model)
+    try:
+        return await REGISTRY.aget(model_dir)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model load error ({model}): {e}")
+
+
+# Repeated /api/predict inputs skip the model; duplicate batch rows score once
+PREDICTION_CACHE = PredictionCache(
+    PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL_S, PREDICTION_CACHE_DECIMALS
+)
+DEDUP: Optional[RowDeduplicator] = RowDeduplicator() if PREDICTION_DEDUP else None
+
+
+def _score_matrix(X: np.ndarray, entry: Optional[LoadedModel] = None) -> np.ndarray:
+    """
+    Probabilities for an (n_rows, 30) matrix in FEATURE_ORDER (raw units).
+    X may be scaled in place. Identical rows are scored once.
+    """
+    entry = entry or DEFAULT_MODEL
+    if DEDUP is not None and len(X) > 1:
+        first, inverse = DEDUP.unique(X)
+        if first is not None:
+            return entry.score(X[first])[inverse]
+    return entry.score(X)
+
+
+def _score_frame(
+    df: pd.DataFrame, thresh: float, entry: Optional[LoadedModel] = None, observe: bool = True
+) -> pd.DataFrame:
+    """
+    Append fraud_probability / model_decision to df in place (one fill, one
+    scaler call, one model call for the whole frame) and return it. The
+    batch feeds the model's drift monitor unless observe is False.
+    """
+    entry = entry or DEFAULT_MODEL
+    drift = _drift_for(entry) if observe else None
+    fills = np.zeros(len(FEATURE_ORDER), dtype=np.int64) if drift is not None else None
+    with TELEMETRY.stage("frame.fill"):
+        X = fill_and_order_frame(df, entry.bundle, fills=fills)
+    if drift is not None:
+        with TELEMETRY.stage("drift.observe"):
+            drift.observe_features(X, fills)
+    probs = _score_matrix(X, entry)
+    if drift is not None:
+        drift.observe_scores(probs, thresh)
+    return _attach_scores(df, probs, thresh)
+
+
+def _attach_scores(df: pd.DataFrame, probs: np.ndarray, thresh: float) -> pd.DataFrame:
+    df["fraud_probability"] = probs
+    df["model_decision"] = (probs >= thresh).astype(int)
+    return df
+
+
+# Per-row reason codes (TreeSHAP), bounded by a per-request cost budget
+EXPLAIN = ExplainBudget(EXPLAIN_MAX_ROWS, EXPLAIN_COST_MULTIPLE)
+
+
+def _explain_k(explain: Optional[str], top_k: int) -> int:
+    """
+    Reasons per row for ?explain= (0 when explanations are off).
+    """
+    if explain in (None, "", "none"):
+        return 0
+    if explain != "top_k":
+        raise HTTPException(status_code=400, detail=f"Unsupported explain '{explain}' (use top_k).")
+    return top_k
+
+
+def _explain_matrix(X: np.ndarray, entry: LoadedModel, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k (feature index, contribution) per row of a raw-unit matrix.
+    """
+    started = time.perf_counter()
+    contrib = entry.contributions(X.copy())
+    EXPLAIN.observe(len(X), time.perf_counter() - started)
+    return top_reasons(contrib, k)
+
+
+def _explain_frame(df: pd.DataFrame, entry: LoadedModel, k: int, spent_s: float) -> int:
+    """
+    Add reason_<i> / reason_<i>_contribution columns (i = 1..k) to a scored
+    frame for the riskiest rows the budget allows; other rows are left empty.
+    Returns how many rows were explained.
+    """
+    n = EXPLAIN.rows(len(df), spent_s)
+    probs = df["fraud_probability"].to_numpy()
+    rows = np.arange(len(df)) if n >= len(df) else np.argpartition(-probs, n - 1)[:n]
+    idx, vals = _explain_matrix(fill_and_order_frame(df.iloc[rows], entry.bundle), entry, k)
+    names = np.asarray(FEATURE_ORDER, dtype=object)
+    for i in range(idx.shape[1]):
+        reason = np.full(len(df), None, dtype=object)
+        reason[rows] = names[idx[:, i]]
+        contribution = np.full(len(df), np.nan)
+        contribution[rows] = vals[:, i]
+        df[f"reason_{i + 1}"] = reason
+        df[f"reason_{i + 1}_contribution"] = contribution
+    return n
+
+
+# Constant-memory sketches of scored traffic, one monitor per model (/api/drift)
+_DRIFT_LOCK = threading.Lock()
+
+
+def _drift_for(entry: LoadedModel) -> Optional[DriftMonitor]:
+    """
+    The model's drift monitor when DRIFT_ENABLED, created on first use.
+    """
+    if not DRIFT_ENABLED:
+        return None
+    if entry.drift is None:
+        with _DRIFT_LOCK:
+            if entry.drift is None:
+                entry.drift = _new_drift_monitor(entry)
+    return entry.drift
+
+
+def _new_drift_monitor(entry: LoadedModel) -> DriftMonitor:
+    """
+    Reference stats: the training scaler's per-feature mean/std and, when the
+    model folder has a test_scored.csv, its probabilities. The fraud-class
+    Real_Mean / Real_Std of synthetic_quality_check.csv are passed along for
+    display only (see drift.py).
+    """
+    scaler = entry.bundle.scaler
+    names = getattr(scaler, "feature_names_in_", None)
+    ref_mean = ref_std = None
+    if hasattr(scaler, "mean_") and hasattr(scaler, "scale_"):
+        if names is None or list(names) == FEATURE_ORDER:
+            ref_mean = np.asarray(scaler.mean_, dtype=float)
+            ref_std = np.asarray(scaler.scale_, dtype=float)
+    ref_scores = None
+    try:
+        scored = _read_table_csv(os.path.join(entry.key, "test_scored"))
+        _, proba_col = _find_label_proba_cols(scored)
+        ref_scores = pd.to_numeric(scored[proba_col], errors="coerce").to_numpy()
+    except (FileNotFoundError, ValueError):
+        pass
+    fraud_mean, fraud_std = _fraud_reference(entry)
+    return DriftMonitor(
+        FEATURE_ORDER, ref_mean, ref_std, ref_scores, fraud_mean=fraud_mean, fraud_std=fraud_std
+    )
+
+
+def _fraud_reference(entry: LoadedModel) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Per-feature (mean, std) of the real fraud rows from the model folder's
+    synthetic_quality_check.csv, back in raw units (NaN for features it does
+    not list), or (None, None) without the file or an affine scaler.
+    """
+    bundle = entry.bundle
+    if bundle.scale_offset is None:
+        return None, None
+    try:
+        quality = _read_table_csv(os.path.join(entry.key, "synthetic_quality_check"))
+    except FileNotFoundError:
+        return None, None
+    if not {"Feature", "Real_Mean", "Real_Std"}.issubset(quality.columns):
+        return None, None
+    mean = np.full(len(FEATURE_ORDER), np.nan)
+    std = np.full(len(FEATURE_ORDER), np.nan)
+    for feature, m, sd in zip(quality["Feature"], quality["Real_Mean"], quality["Real_Std"]):
+        j = bundle.feature_index.get(str(feature))
+        if j is not None:
+            # the generator was fitted in scaled units
+            mean[j] = float(m) * bundle.scale_div[j] + bundle.scale_offset[j]
+            std[j] = float(sd) * bundle.scale_div[j]
+    return mean, std
+
+
+# Large uploads are split into row shards scored by a pre-warmed process pool
+SHARDER: Optional[ShardedScorer] = None
+if SHARD_WORKERS > 1:
+    SHARDER = ShardedScorer(SHARD_WORKERS, ARTIFACT_DIR)  # workers start in warmup()
+
+
+async def _score_frame_sharded(
+    df: pd.DataFrame, thresh: float, entry: LoadedModel
+) -> pd.DataFrame:
+    """
+    _score_frame for big frames: features are filled straight into shared
+    memory and scored across the process pool. Frames below SHARD_MIN_ROWS,
+    or any pool failure, use the in-process path.
+    """
+    if SHARDER is None or len(df) < SHARD_MIN_ROWS:
+        return await _offload(_score_frame, df, thresh, entry, admit=False)
+
+    drift = _drift_for(entry)
+    x_shm, X = SHARDER.alloc(len(df))
+    try:
+        await _offload(_fill_shard_block, df, entry, X, drift, admit=False)
+        X = None  # release the buffer view before the block is closed
+        probs = await SHARDER.score(entry.key, x_shm, len(df))
+    except Exception as e:
+        print("[WARN] Sharded scoring failed, scoring in-process:", e)
+        TELEMETRY.inc("fallbacks_total", 1, kind="shard")
+        probs = None
+    finally:
+        X = None
+        x_shm.close()
+        x_shm.unlink()
+
+    if probs is None:
+        df = await _offload(_score_frame, df, thresh, entry, False, admit=False)
+        probs = df["fraud_probability"].to_numpy()
+        if drift is not None:
+            await _offload(drift.observe_scores, probs, thresh, admit=False)
+        return df
+    return await _offload(_attach_observed_scores, df, probs, thresh, drift, admit=False)
+
+
+def _fill_shard_block(
+    df: pd.DataFrame, entry: LoadedModel, X: np.ndarray, drift: Optional[DriftMonitor]
+) -> None:
+    # Fill the shared block, and feed drift before the workers scale it in place
+    fills = np.zeros(len(FEATURE_ORDER), dtype=np.int64) if drift is not None else None
+    with TELEMETRY.stage("frame.fill"):
+        fill_and_order_frame(df, entry.bundle, out=X, fills=fills)
+    if drift is not None:
+        with TELEMETRY.stage("drift.observe"):
+            drift.observe_features(X, fills)
+
+
+def _attach_observed_scores(
+    df: pd.DataFrame, probs: np.ndarray, thresh: float, drift: Optional[DriftMonitor]
+) -> pd.DataFrame:
+    if drift is not None:
+        drift.observe_scores(probs, thresh)
+    return _attach_scores(df, probs, thresh)
+
+
+# CPU-bound request work runs here, off the event loop, with admission control
+CPU = CpuExecutor(CPU_WORKERS, CPU_MAX_QUEUED, CPU_RETRY_AFTER_S)
+
+
+async def _offload(fn, *args, admit: bool = True, **kwargs):
+    """
+    Await fn(*args, **kwargs) on the CPU executor; a full queue is a 503.
+    """
+    try:
+        return await CPU.run(fn, *args, admit=admit, **kwargs)
+    except OverloadedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server busy: {e}",
+            headers={"Retry-After": str(CPU.retry_after_s)},
+        )
 
 
 # -----------------------------------------------------------------------------
-# Simple CSV I/O helpers (no Excel support)
+# Simple table I/O helpers (CSV, or its memory-mapped columnar copy)
 # -----------------------------------------------------------------------------
 def _read_table_csv(path_no_ext: str) -> pd.DataFrame:
-    p = path_no_ext + ".csv"
-    if not os.path.exists(p):
-        raise FileNotFoundError(f"Missing table: {p}")
-    return pd.read_csv(p)
+    df = read_table(path_no_ext)
+    if df is None:
+        raise FileNotFoundError(f"Missing table: {path_no_ext}.csv")
+    return df
 
 
 def _read_csv_if_exists(path_no_ext: str) -> Optional[pd.DataFrame]:
     """
-    Return DataFrame if {path_no_ext}.csv exists, else None.
+    Return DataFrame if {path_no_ext}.csv (or its columnar copy) exists, else None.
+    """
+    return read_table(path_no_ext)
+
+
+def _artifact_paths(art_dir: str, bases: List[str]) -> List[str]:
+    """
+    CSV and columnar-copy paths for the given base names in art_dir (used
+    as cache keys).
     """
-    p = path_no_ext + ".csv"
-    if os.path.exists(p):
-        return pd.read_csv(p)
-    return None
+    paths = []
+    for b in bases:
+        base = os.path.join(art_dir, b)
+        paths += [base + ".csv", columnar_meta_path(base)]
+    return paths
+
+
+# Parsed/serialized artifact responses, invalidated by file mtime/size
+ARTIFACTS = ArtifactCache()
 
 
 def _save_csv(base_no_ext: str, df: pd.DataFrame) -> None:
     """
-    Save df to base_no_ext.csv only.
+    Save df to base_no_ext.csv (atomically: readers see the old or the new
+    file, never a partial one), refreshing its columnar copy if it has one.
     """
-    df.to_csv(base_no_ext + ".csv", index=False)
+    write_csv_atomic(base_no_ext + ".csv", df)
+    if os.path.exists(columnar_meta_path(base_no_ext)):
+        write_columnar(base_no_ext, df)
 
 
 # -----------------------------------------------------------------------------
@@ -106,95 +478,166 @@ def _find_label_proba_cols(df: pd.DataFrame) -> Tuple[str, str]:
     return cols[label_idx], cols[proba_idx]
 
 
-def _compute_and_save_curves_and_importances() -> Dict[str, object]:
+# Default grid of threshold_sweep.csv when the folder has none yet
+_SWEEP_THRESHOLDS = np.round(np.arange(0.05, 1.0, 0.05), 2)
+# One curve rebuild at a time (startup thread vs /api/rebuild-curves)
+_CURVES_LOCK = threading.Lock()
+
+
+def _model_importances(model) -> List[Dict[str, float]]:
+    """
+    [{"feature", "importance"}] from an sklearn-style model or a raw
+    LightGBM Booster (split counts); [] when the model has neither.
+    """
+    try:
+        if hasattr(model, "feature_importances_"):
+            imps = model.feature_importances_
+        elif hasattr(model, "feature_importance"):
+            imps = model.feature_importance(importance_type="split")
+        else:
+            return []
+        feats = FEATURE_ORDER if len(FEATURE_ORDER) == len(imps) else [f"f{i}" for i in range(len(imps))]
+        return [{"feature": f, "importance": float(v)} for f, v in zip(feats, imps)]
+    except Exception:
+        return []
+
+
+def _compute_and_save_curves_and_importances(
+    art_dir: str = ARTIFACT_DIR, model=None, full: bool = False
+) -> Dict[str, object]:
     """
-    Computes ROC/PR curves from test_scored.csv and top feature importances
-    from MODEL, then saves them as CSVs with these base names:
+    Computes ROC/PR curves, AP and the threshold sweep from test_scored.csv
+    (one sort, shared cumulative counts: see curves.py) and top feature
+    importances from the model, then saves them with these base names:
 
         - roc_curve.csv
         - pr_curve.csv
+        - threshold_sweep.csv (at its existing thresholds, if any)
         - feature_importance.csv
 
-    Returns a small dict with arrays for immediate use.
+    Rows appended to test_scored.csv since the last build are merged into
+    the saved counts instead of re-reading the file; full=True recounts.
+    Every file is replaced atomically. Returns a small dict with arrays for
+    immediate use and "build": {mode, rows, added}.
     """
-    # 1) Load scored test set
-    scored = _read_table_csv(os.path.join(ARTIFACT_DIR, "test_scored"))
-    label_col, proba_col = _find_label_proba_cols(scored)
-
-    y_true = (
-        pd.to_numeric(scored[label_col], errors="coerce")
-        .fillna(0)
-        .astype(int)
-        .to_numpy()
-    )
-    y_score = pd.to_numeric(scored[proba_col], errors="coerce").fillna(0.0).to_numpy()
-
-    # 2) ROC
-    fpr, tpr, _ = roc_curve(y_true, y_score)
-    roc_auc = float(auc(fpr, tpr))
-    roc_df = pd.DataFrame({"fpr": fpr, "tpr": tpr})
-    _save_csv(os.path.join(ARTIFACT_DIR, "roc_curve"), roc_df)
+    with _CURVES_LOCK:
+        counts, state, build = update_counts(art_dir, _find_label_proba_cols, full)
+
+        # 1) ROC
+        fpr, tpr, _ = counts.roc()
+        roc_auc = counts.roc_auc()
+        _save_csv(os.path.join(art_dir, "roc_curve"), pd.DataFrame({"fpr": fpr, "tpr": tpr}))
+
+        # 2) PR
+        precision, recall, _ = counts.pr()
+        ap_val = counts.average_precision()
+        pr_df = pd.DataFrame(
+            {
+                "recall": recall,
+                "precision": precision,
+                "ap": [ap_val] + [np.nan] * (len(recall) - 1),
+            }
+        )
+        _save_csv(os.path.join(art_dir, "pr_curve"), pr_df)
 
-    # 3) PR
-    precision, recall, _ = precision_recall_curve(y_true, y_score)
-    ap_val = float(average_precision_score(y_true, y_score))
-    pr_df = pd.DataFrame(
-        {
-            "recall": recall,
-            "precision": precision,
-            "ap": [ap_val] + [np.nan] * (len(recall) - 1),
-        }
-    )
-    _save_csv(os.path.join(ARTIFACT_DIR, "pr_curve"), pr_df)
+        # 3) Threshold sweep
+        sweep_base = os.path.join(art_dir, "threshold_sweep")
+        old = _read_csv_if_exists(sweep_base)
+        grid = _SWEEP_THRESHOLDS
+        if old is not None and "threshold" in old.columns:
+            grid = pd.to_numeric(old["threshold"], errors="coerce").dropna().to_numpy()
+        _save_csv(sweep_base, counts.sweep(grid))
 
-    # 4) Feature importances
-    fi_records: List[Dict[str, float]] = []
-    try:
-        if hasattr(MODEL, "feature_importances_"):
-            imps = MODEL.feature_importances_
-            feats = (
-                FEATURE_ORDER
-                if len(FEATURE_ORDER) == len(imps)
-                else [f"f{i}" for i in range(len(imps))]
-            )
-            fi_records = [
-                {"feature": f, "importance": float(v)} for f, v in zip(feats, imps)
-            ]
-    except Exception:
-        fi_records = []
+        # 4) Feature importances
+        fi_records = _model_importances(MODEL if model is None else model)
+        if fi_records:
+            fi_df = pd.DataFrame(fi_records).sort_values("importance", ascending=False)
+            _save_csv(os.path.join(art_dir, "feature_importance"), fi_df)
 
-    if fi_records:
-        fi_df = pd.DataFrame(fi_records).sort_values("importance", ascending=False)
-        _save_csv(os.path.join(ARTIFACT_DIR, "feature_importance"), fi_df)
+        save_state(art_dir, counts, state)  # last: a failed write above is retried in full
 
     return {
         "roc": {"fpr": fpr.tolist(), "tpr": tpr.tolist(), "auc": roc_auc},
         "pr": {"recall": recall.tolist(), "precision": precision.tolist(), "ap": ap_val},
-        "feature_importance": fi_records[:15],
+        "feature_importance": sorted(fi_records, key=lambda r: -r["importance"])[:15],
+        "build": build,
     }
 
 
 def _ensure_curve_artifacts_on_startup() -> None:
     """
-    Create curve/importance CSV files if any are missing. Swallows errors.
+    Create curve/importance CSV files if any are missing, or bring them up
+    to date with rows appended to test_scored.csv. Swallows errors.
     """
     needed = ["roc_curve", "pr_curve", "feature_importance"]
     missing = [
         base
         for base in needed
-        if _read_csv_if_exists(os.path.join(ARTIFACT_DIR, base)) is None
+        if not any(os.path.exists(p) for p in _artifact_paths(ARTIFACT_DIR, [base]))
     ]
-    if missing:
+    scored = os.path.exists(os.path.join(ARTIFACT_DIR, "test_scored.csv"))
+    if missing or (scored and is_stale(ARTIFACT_DIR)):
         try:
-            _compute_and_save_curves_and_importances()
+            with STARTUP.phase("curves"):
+                _compute_and_save_curves_and_importances()
         except Exception as e:
             print("[WARN] Could not build curve artifacts at startup:", e)
 
 
-try:
-    _ensure_curve_artifacts_on_startup()
-except Exception as _e:
-    print("[WARN] Startup curves check failed:", _e)
+def warmup(rows: int = WARMUP_ROWS) -> None:
+    """
+    Score dummy median rows through the single-row and batch paths (and start
+    the shard workers) so the first real request does not pay for lazy
+    loads, first-call allocations or process spawns.
+    """
+    if rows <= 0:
+        return
+    entry = DEFAULT_MODEL
+    with STARTUP.phase("warmup"):
+        _, X, _ = fill_and_order_features({}, entry.bundle)
+        _score_matrix(X, entry)
+        df = pd.DataFrame(np.tile(entry.bundle.median_vec, (rows, 1)), columns=FEATURE_ORDER)
+        _score_frame(df, entry.threshold, entry, observe=False).to_dict(orient="records")
+        try:  # first observation for the explanation cost model
+            _explain_matrix(np.tile(entry.bundle.median_vec, (min(rows, 64), 1)), entry, 1)
+        except Exception as e:
+            print("[WARN] Explanations unavailable for the default model:", e)
+    if SHARDER is not None:
+        with STARTUP.phase("shard-workers"):
+            SHARDER.warm()
+
+
+def shutdown() -> None:
+    """
+    App shutdown hook: persist the live top risks, stop the worker pools.
+    """
+    try:
+        TOP_RISKS.save_all()
+    except Exception as e:
+        print("[WARN] Could not persist top risks:", e)
+    if SHARDER is not None:
+        SHARDER.shutdown()
+    CPU.shutdown()
+
+
+def startup() -> None:
+    """
+    App startup hook: curve artifacts per STARTUP_CURVES, then warmup().
+    """
+    try:
+        if STARTUP_CURVES == "sync":
+            _ensure_curve_artifacts_on_startup()
+        elif STARTUP_CURVES == "background":
+            threading.Thread(
+                target=_ensure_curve_artifacts_on_startup, name="curve-artifacts", daemon=True
+            ).start()
+    except Exception as _e:
+        print("[WARN] Startup curves check failed:", _e)
+
+    try:
+        warmup()
+    except Exception as e:
+        print("[WARN] Warmup failed:", e)
 
 
 # -----------------------------------------------------------------------------
@@ -209,33 +652,174 @@ class PredictBody(BaseModel):
 # -----------------------------------------------------------------------------
 # /api/predict – single row
 # -----------------------------------------------------------------------------
-@router.post("/predict")
-async def predict(body: PredictBody):
+def _batcher_for(entry: LoadedModel) -> Optional[MicroBatcher]:
     """
-    Score a single transaction (JSON body).
+    The model's micro-batcher when MICROBATCH_ENABLED, created on first use.
+    Each batch is scored on the CPU executor and is subject to admission.
     """
-    try:
-        filled, X, _ = fill_and_order_features(body.input)
-        Xm = to_model_space(X)
+    if not MICROBATCH_ENABLED:
+        return None
+    if entry.batcher is None:
+        entry.batcher = MicroBatcher(
+            lambda X: _offload(_score_matrix, X, entry),
+            MICROBATCH_MAX_ROWS,
+            MICROBATCH_MAX_WAIT_MS,
+        )
+    return entry.batcher
+
+
+def _predict_row(
+    raw: np.ndarray,
+    prob: Optional[float],
+    thresh: float,
+    fills: np.ndarray,
+    entry: LoadedModel,
+    drift: Optional[DriftMonitor],
+    k: int,
+) -> Tuple[float, Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    CPU part of /api/predict for one filled (1, 30) row, left unchanged:
+    the score unless prob is already known, the drift update and, with k,
+    the top-k reasons. Returns (prob, reason indices, contributions).
+    """
+    if prob is None:
+        prob = float(_score_matrix(raw.copy(), entry)[0])  # scoring scales in place
+    if drift is not None:
+        drift.observe_row(raw[0], prob, thresh, fills)
+    idx = vals = None
+    if k:
+        idx, vals = _explain_matrix(raw, entry, k)
+    return prob, idx, vals
 
-        # Robust probability extraction
-        if hasattr(MODEL, "predict_proba"):
-            proba = MODEL.predict_proba(Xm)
-            prob = float(proba[0] if proba.ndim == 1 else proba[0, -1])
-        elif hasattr(MODEL, "decision_function"):
-            from scipy.special import expit
 
-            prob = float(expit(MODEL.decision_function(Xm))[0])
-        else:
-            pred = MODEL.predict(Xm)
-            prob = float(pred[0]) if np.ndim(pred) else float(pred)
+async def _tracker_for(model: Optional[str]) -> TopK:
+    """
+    The model's live top-risks tracker; the first call seeds it from
+    top_risks.csv on the CPU executor.
+    """
+    art_dir = _artifact_dir_for(model)
+    tracker = TOP_RISKS.peek(art_dir)
+    if tracker is None:
+        tracker = await _offload(TOP_RISKS.get, art_dir, admit=False)
+    return tracker
+
+
+@router.post("/predict")
+async def predict(
+    body: PredictBody,
+    model: Optional[str] = Query(None),
+    explain: Optional[str] = Query(None),
+    top_k: int = Query(EXPLAIN_TOP_K, ge=1, le=len(FEATURE_ORDER)),
+):
+    """
+    Score a single transaction (JSON body) with the given model.
+
+    With ?explain=top_k the response also lists the top_k features pushing
+    the score up ("reasons": feature, log-odds contribution, filled value).
+
+    Scoring, the drift update and explanations run on the CPU executor, so
+    a full queue is a 503 as for /api/predict-csv; a cached score with no
+    drift monitor and no explanation is answered on the event loop.
+    """
+    k = _explain_k(explain, top_k)
+    entry = await _get_model(model)
+    drift = _drift_for(entry)
+    fills = np.zeros(len(FEATURE_ORDER), dtype=np.int64)
+    thresh = body.threshold if body.threshold is not None else entry.threshold
+    try:
+        with TELEMETRY.stage("predict.fill"):
+            filled, raw, _ = fill_and_order_features(body.input, entry.bundle, fills)
+        cache_key = None
+        prob = None
+        if PREDICTION_CACHE.enabled:
+            cache_key = PREDICTION_CACHE.key(entry.key, raw[0])
+            prob = PREDICTION_CACHE.get(cache_key)
+        scored = prob is None
+        batcher = _batcher_for(entry) if scored else None
+        if batcher is not None:
+            prob = await batcher.submit(raw)
+        idx = vals = None
+        if prob is None or drift is not None or k:
+            # admission once per request: the batch was admitted already
+            prob, idx, vals = await _offload(
+                _predict_row, raw, prob, thresh, fills, entry, drift, k, admit=batcher is None
+            )
+        if scored and cache_key is not None:
+            PREDICTION_CACHE.put(cache_key, prob)
 
-        thresh = body.threshold if body.threshold is not None else DEFAULT_THRESHOLD
         decision = int(prob >= thresh)
+        payload = {"probability": prob, "decision": decision, "filled": filled}
+        if k:
+            payload["reasons"] = reason_records(idx, vals, FEATURE_ORDER, raw)[0]
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Inference error: {e}")
 
-    return {"probability": prob, "decision": decision, "filled": filled}
+    tracker = await _tracker_for(model)
+    if prob > tracker.floor():
+        risk = {
+            "Time": filled["Time"],
+            "Amount": filled["Amount"],
+            "fraud_probability": prob,
+            "model_decision": decision,
+        }
+        tracker.offer(np.array([prob]), lambda i: risk, lambda idx: _risk_keys(raw))
+
+    with TELEMETRY.stage("predict.serialize"):
+        content = dump_json(payload)
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/predict/batching")
+def batching_stats(model: Optional[str] = Query(None)):
+    """
+    Micro-batching statistics for /api/predict (batch sizes, queue wait).
+    """
+    entry = REGISTRY.peek(_model_dir_for(model))
+    if not MICROBATCH_ENABLED:
+        return {"enabled": False}
+    if entry is None or entry.batcher is None:
+        return {"enabled": True, "batches": 0, "rows": 0}
+    return {"enabled": True, **entry.batcher.stats()}
+
+
+@router.get("/executor")
+def executor_stats():
+    """
+    CPU executor load: workers busy, tasks queued, requests rejected with 503.
+    """
+    return CPU.stats()
+
+
+@router.get("/startup")
+def startup_report():
+    """
+    Per-phase startup timings (imports, artifact loads, warmup, curves).
+    """
+    return STARTUP.report()
+
+
+@router.get("/predict/cache")
+def prediction_cache_stats(clear: int = 0):
+    """
+    Hit ratio of the /api/predict result cache and how many batch rows were
+    collapsed as duplicates (?clear=1 empties the cache).
+    """
+    cleared = PREDICTION_CACHE.clear() if clear else 0
+    return {
+        **PREDICTION_CACHE.stats(),
+        "cleared": cleared,
+        "dedup": DEDUP.stats() if DEDUP is not None else {"enabled": False},
+    }
+
+
+@router.get("/models")
+def loaded_models():
+    """
+    Models currently held by the registry, their load size and eviction stats.
+    """
+    return REGISTRY.stats()
 
 
 # -----------------------------------------------------------------------------
@@ -246,75 +830,628 @@ async def predict_csv(
     user_id: Optional[str] = Form("guest"),
     threshold: Optional[float] = Form(None),
     file: UploadFile = File(...),
+    model: Optional[str] = Query(None),
+    models: List[str] = Query([]),
+    layout: str = Query("records"),
+    fields: str = Query("all"),
+    explain: Optional[str] = Query(None),
+    top_k: int = Query(EXPLAIN_TOP_K, ge=1, le=len(FEATURE_ORDER)),
+    accept: Optional[str] = Header(None),
 ):
     """
     Batch scoring: accepts a **.csv** file with columns from FEATURE_ORDER
-    (order is flexible / case-insensitive).
-
-    Returns: original columns + fraud_probability + model_decision.
+    (order is flexible / case-insensitive), scored with the given model.
+
+    Returns: original columns + fraud_probability + model_decision, or only
+    the two prediction columns (in input row order) with ?fields=scores.
+    The Accept header picks JSON (default), text/csv or an Arrow IPC stream
+    (application/vnd.apache.arrow.stream); JSON comes as one object per row
+    (?layout=records) or one array per column (?layout=columnar).
+
+    ?explain=top_k adds reason_<i> / reason_<i>_contribution columns for the
+    riskiest rows within the EXPLAIN_MAX_ROWS / EXPLAIN_COST_MULTIPLE budget
+    (empty for the rest); X-Explained-Rows says how many got them.
+
+    ?models=default,CTGAN (or repeated ?models=) scores the upload with every
+    listed model in one pass (see _score_models_frame): the prediction columns
+    become fraud_probability_<model> / model_decision_<model> plus a
+    disagreement flag, and a "comparison" summary (alerts per model, pairwise
+    disagreement counts) is added to JSON bodies and the X-Model-Comparison
+    header.
     """
+    if layout not in LAYOUTS:
+        raise HTTPException(status_code=400, detail=f"Unsupported layout '{layout}' (use records or columnar).")
+    if fields not in ("all", "scores"):
+        raise HTTPException(status_code=400, detail=f"Unsupported fields '{fields}' (use all or scores).")
+    k = _explain_k(explain, top_k)
+    names = _model_names(models)
+    if names and model is not None:
+        raise HTTPException(status_code=400, detail="Use either ?model= or ?models=, not both.")
+    if names and k:
+        raise HTTPException(status_code=400, detail="?explain is only available with a single model.")
+    fmt = negotiate(accept)
+    started = time.perf_counter()
+
     # Read uploaded file as bytes once
-    content = await file.read()
-    buf = BytesIO(content)
+    with TELEMETRY.stage("csv.read"):
+        content = await file.read()
 
-    # CSV only, but tolerate comma or semicolon separators
+    # Delimiter / header / compression sniffed from the head; only feature
+    # columns are parsed as numbers (and only they are parsed for scores)
     try:
-        try:
-            df = pd.read_csv(buf)
-        except Exception:
-            buf.seek(0)
-            df = pd.read_csv(buf, sep=";")
+        df = await _offload(_parse_upload, content, fields == "all")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Inference error (CSV): {e}")
 
     if df.empty:
         raise HTTPException(status_code=400, detail="Uploaded CSV has no rows.")
 
-    # Normalize case-insensitive lookup
-    df_cols_lower = {str(c).lower(): c for c in df.columns}
+    if names:
+        entries = [await _get_model(_model_arg(n)) for n in names]
+        try:
+            comparison = await _offload(
+                _score_models_frame, df, names, entries, threshold, admit=False
+            )
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Inference error: {e}")
+        thresh = comparison["models"][0]["threshold"]
+        response = await _offload(
+            _finish_csv, df, None, entries, thresh, fields, fmt, layout, comparison, admit=False
+        )
+        response.headers["X-Model-Comparison"] = json.dumps(
+            {k: v for k, v in comparison.items() if k != "shared"}, separators=(",", ":")
+        )
+        return response
+
+    entry = await _get_model(model)
+    thresh = float(entry.threshold if threshold is None else threshold)
 
-    out_rows: List[Dict[str, object]] = []
-    thresh = float(DEFAULT_THRESHOLD if threshold is None else threshold)
+    # Output rows = original columns + predictions
+    try:
+        df = await _score_frame_sharded(df, thresh, entry)
+        explained = None
+        if k:
+            spent = time.perf_counter() - started
+            explained = await _offload(_explain_frame, df, entry, k, spent, admit=False)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Inference error: {e}")
+    response = await _offload(
+        _finish_csv, df, model, [entry], thresh, fields, fmt, layout, admit=False
+    )
+    if explained is not None:
+        response.headers["X-Explained-Rows"] = str(explained)
+    return response
+
+
+def _parse_upload(content: bytes, passthrough: bool) -> pd.DataFrame:
+    with TELEMETRY.stage("csv.parse"):
+        return read_upload(BytesIO(content), passthrough=passthrough)
+
+
+def _finish_csv(
+    df: pd.DataFrame,
+    model: Optional[str],
+    entries: List[LoadedModel],
+    thresh: float,
+    fields: str,
+    fmt: str,
+    layout: str,
+    comparison: Optional[Dict[str, object]] = None,
+) -> Response:
+    if comparison is None:
+        _track_risks(model, df, entries[0].bundle)
+        keep = ["fraud_probability", "model_decision"]
+    else:
+        keep = []
+        for m, entry in zip(comparison["models"], entries):
+            cols = (f"fraud_probability_{m['model']}", f"model_decision_{m['model']}")
+            _track_risks(_model_arg(m["model"]), df, entry.bundle, *cols)
+            keep += cols
+        keep.append("disagreement")
+    if fields == "scores":
+        reasons = [c for c in df.columns if str(c).startswith("reason_")]
+        df = df[[*keep, *reasons]]
+    extra = {"comparison": comparison} if comparison is not None else None
+    with TELEMETRY.stage("csv.serialize"):
+        return frame_response(df, thresh, fmt, layout, STREAM_CHUNK_ROWS, extra)
 
-    for _, row in df.iterrows():
-        row_dict: Dict[str, float] = {}
-        for feat in FEATURE_ORDER:
-            src_col = df_cols_lower.get(feat.lower())
-            val = row[src_col] if src_col in df.columns else None
-            row_dict[feat] = val
 
-        try:
-            filled, X, _ = fill_and_order_features(row_dict)
-            Xm = to_model_space(X)
+# -----------------------------------------------------------------------------
+# Multi-model (shadow / A-B) scoring
+# -----------------------------------------------------------------------------
+def _model_names(models: List[str]) -> List[str]:
+    """
+    ?models= values (repeated and/or comma-separated), de-duplicated in order.
+    """
+    names: List[str] = []
+    for value in models:
+        for name in value.split(","):
+            name = name.strip()
+            if name and name not in names:
+                names.append(name)
+    if len(names) > MODEL_CACHE_MAX_MODELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MODEL_CACHE_MAX_MODELS} models per request (MODEL_CACHE_MAX_MODELS).",
+        )
+    return names
 
-            if hasattr(MODEL, "predict_proba"):
-                proba = MODEL.predict_proba(Xm)
-                prob = float(proba[0] if proba.ndim == 1 else proba[0, -1])
-            elif hasattr(MODEL, "decision_function"):
-                from scipy.special import expit
 
-                prob = float(expit(MODEL.decision_function(Xm))[0])
+def _model_arg(name: Optional[str]) -> Optional[str]:
+    # "default" in ?models= is the model served without ?model=
+    return None if name in (None, "default") else name
+
+
+def _scaler_signature(bundle) -> Optional[Tuple[bytes, bytes]]:
+    if bundle.scale_offset is None:
+        return None
+    return bundle.scale_offset.tobytes(), bundle.scale_div.tobytes()
+
+
+def _score_models_frame(
+    df: pd.DataFrame, names: List[str], entries: List[LoadedModel], threshold: Optional[float]
+) -> Dict[str, object]:
+    """
+    Score df with every model, sharing work between them: models with the
+    same medians share one fill (and one duplicate-row collapse), models
+    with the same affine scaler share one scaled matrix, and names resolving
+    to the same model folder share one model call. Adds per-model
+    prediction columns and "disagreement" (decisions differ) to df and
+    returns the comparison summary.
+    """
+    # (medians, full matrix, fill counts, unique rows, inverse) per distinct fill
+    fills: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]] = []
+    scaled: Dict[Tuple[int, object], np.ndarray] = {}
+    probs_by_key: Dict[str, np.ndarray] = {}
+    summary: List[Dict[str, object]] = []
+    decisions: List[np.ndarray] = []
+
+    for name, entry in zip(names, entries):
+        bundle = entry.bundle
+        thresh = float(entry.threshold if threshold is None else threshold)
+        slot = next(
+            (i for i, f in enumerate(fills) if np.array_equal(f[0], bundle.median_vec)), None
+        )
+        if slot is None:
+            counts = np.zeros(len(FEATURE_ORDER), dtype=np.int64)
+            with TELEMETRY.stage("frame.fill"):
+                X = fill_and_order_frame(df, bundle, fills=counts)
+            first, inverse = (None, None)
+            if DEDUP is not None and len(X) > 1:
+                first, inverse = DEDUP.unique(X)
+            fills.append((bundle.median_vec, X, counts, X if first is None else X[first], inverse))
+            slot = len(fills) - 1
+
+        probs = probs_by_key.get(entry.key)
+        if probs is None:
+            _, X_full, counts, X, inverse = fills[slot]
+            drift = _drift_for(entry)
+            if drift is not None:
+                with TELEMETRY.stage("drift.observe"):
+                    drift.observe_features(X_full, counts)
+            sig = _scaler_signature(bundle)
+            key = (slot, sig if sig is not None else entry.key)
+            Xm = scaled.get(key)
+            if Xm is None:
+                with TELEMETRY.stage("model.scale"):
+                    Xm = scaled[key] = to_model_space(X, bundle=bundle)
+            probs = entry.score_scaled(Xm)
+            probs = probs_by_key[entry.key] = probs if inverse is None else probs[inverse]
+            if drift is not None:
+                drift.observe_scores(probs, thresh)
+
+        decision = (probs >= thresh).astype(int)
+        df[f"fraud_probability_{name}"] = probs
+        df[f"model_decision_{name}"] = decision
+        decisions.append(decision)
+        summary.append({"model": name, "threshold": thresh, "alerts": int(decision.sum())})
+
+    D = np.column_stack(decisions)
+    disagree = (D != D[:, :1]).any(axis=1)
+    df["disagreement"] = disagree.astype(int)
+
+    pairs = []
+    for a in range(len(names)):
+        for b in range(a + 1, len(names)):
+            pa, pb = df[f"fraud_probability_{names[a]}"], df[f"fraud_probability_{names[b]}"]
+            pairs.append(
+                {
+                    "a": names[a],
+                    "b": names[b],
+                    "disagreements": int((D[:, a] != D[:, b]).sum()),
+                    "a_only": int(((D[:, a] == 1) & (D[:, b] == 0)).sum()),
+                    "b_only": int(((D[:, a] == 0) & (D[:, b] == 1)).sum()),
+                    "mean_abs_diff": float(np.abs(pa.to_numpy() - pb.to_numpy()).mean()),
+                }
+            )
+    return {
+        "rows": len(df),
+        "models": summary,
+        "disagreements": int(disagree.sum()),
+        "pairs": pairs,
+        "shared": {"fills": len(fills), "scalings": len(scaled), "model_calls": len(probs_by_key)},
+    }
+
+
+# -----------------------------------------------------------------------------
+# /api/predict-csv/stream – chunked batch scoring with bounded memory
+# -----------------------------------------------------------------------------
+_STREAM_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _iter_scored_chunks(
+    first: pd.DataFrame,
+    rest: Iterator[pd.DataFrame],
+    thresh: float,
+    fmt: str,
+    entry: LoadedModel,
+    model: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Score and serialize one chunk at a time so only a single chunk is alive.
+    """
+    chunk: Optional[pd.DataFrame] = first
+    header = True
+    while chunk is not None:
+        scored = _score_frame(chunk, thresh, entry)
+        _track_risks(model, scored, entry.bundle)
+        with TELEMETRY.stage("stream.serialize"):
+            if fmt == "ndjson":
+                text = scored.to_json(orient="records", lines=True, double_precision=15)
+                text = text if text.endswith("\n") else text + "\n"
             else:
-                pred = MODEL.predict(Xm)
-                prob = float(pred[0]) if np.ndim(pred) else float(pred)
+                text = scored.to_csv(index=False, header=header)
+        yield text
+        header = False
+        with TELEMETRY.stage("stream.parse"):
+            chunk = next(rest, None)
 
-            decision = int(prob >= thresh)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Inference error: {e}")
 
-        # Compose output row = original columns + predictions
-        result_row = {c: row.get(c, None) for c in df.columns}
-        result_row["fraud_probability"] = prob
-        result_row["model_decision"] = decision
-        out_rows.append(result_row)
+def _open_stream(fh) -> Tuple[Iterator[pd.DataFrame], Optional[pd.DataFrame]]:
+    reader = iter_upload(fh, STREAM_CHUNK_ROWS)
+    with TELEMETRY.stage("stream.parse"):
+        return reader, next(reader, None)
 
-    out_cols = list(df.columns)
-    if "fraud_probability" not in out_cols:
-        out_cols.append("fraud_probability")
-    if "model_decision" not in out_cols:
-        out_cols.append("model_decision")
 
-    return {"columns": out_cols, "rows": out_rows, "threshold": thresh}
+@router.post("/predict-csv/stream")
+async def predict_csv_stream(
+    user_id: Optional[str] = Form("guest"),
+    threshold: Optional[float] = Form(None),
+    file: UploadFile = File(...),
+    format: str = Query("csv"),
+    model: Optional[str] = Query(None),
+):
+    """
+    Streaming batch scoring for large **.csv** uploads.
+
+    The upload is parsed and scored STREAM_CHUNK_ROWS rows at a time and the
+    scored rows are streamed back as CSV (default) or NDJSON (?format=ndjson),
+    so peak memory is bounded by the chunk size rather than the file size.
+    Columns match /api/predict-csv: original columns + fraud_probability +
+    model_decision.
+    """
+    fmt = format.lower()
+    if fmt not in _STREAM_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported format '{format}' (use csv or ndjson).",
+        )
+
+    entry = await _get_model(model)
+    thresh = float(entry.threshold if threshold is None else threshold)
+
+    # Parse and score the first chunk eagerly so bad uploads still get a 400
+    try:
+        reader, first = await _offload(_open_stream, file.file)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Inference error (CSV): {e}")
+
+    if first is None or first.empty:
+        raise HTTPException(status_code=400, detail="Uploaded CSV has no rows.")
+
+    try:
+        body = _iter_scored_chunks(first, reader, thresh, fmt, entry, model)
+        head = await _offload(next, body, admit=False)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Inference error: {e}")
+
+    async def _stream() -> AsyncIterator[str]:
+        # Later chunks also run on the CPU executor, one at a time
+        yield head
+        while (text := await CPU.run(next, body, None, admit=False)) is not None:
+            yield text
+
+    return StreamingResponse(_stream(), media_type=_STREAM_MEDIA_TYPES[fmt])
+
+
+# -----------------------------------------------------------------------------
+# /api/stream (WebSocket) and /api/predict/ndjson – persistent scoring channel
+# -----------------------------------------------------------------------------
+_CHANNELS = TELEMETRY.gauge("channel_connections")
+_CHANNEL_ROWS = TELEMETRY.counter("channel_rows_total")
+_CHANNEL_BATCHES = TELEMETRY.counter("channel_batches_total")
+_TIME, _AMOUNT = FEATURE_ORDER.index("Time"), FEATURE_ORDER.index("Amount")
+
+
+def _score_items(
+    items: List[Item], entry: LoadedModel, thresh: float, tracker: TopRiskTracker
+) -> List[Dict[str, object]]:
+    """
+    Score a batch of channel transactions as one matrix (fill, drift, model,
+    top risks) and return their {"id"?, "probability", "decision"} in order.
+    """
+    X = np.empty((len(items), len(FEATURE_ORDER)), dtype=float)
+    fills = np.zeros(len(FEATURE_ORDER), dtype=np.int64)
+    with TELEMETRY.stage("channel.fill"):
+        for row, (_, raw) in zip(X, items):
+            fill_features_into(raw, row, entry.bundle, fills)
+    raw = X.copy()  # scoring scales X in place
+    drift = _drift_for(entry)
+    if drift is not None:
+        drift.observe_features(X, fills)
+    probs = _score_matrix(X, entry)
+    decisions = (probs >= thresh).astype(int)
+    if drift is not None:
+        drift.observe_scores(probs, thresh)
+    tracker.offer(
+        probs,
+        lambda i: {
+            "Time": float(raw[i, _TIME]),
+            "Amount": float(raw[i, _AMOUNT]),
+            "fraud_probability": float(probs[i]),
+            "model_decision": int(decisions[i]),
+        },
+        lambda idx: _risk_keys(raw[idx]),
+    )
+    _CHANNEL_ROWS.inc(len(items))
+    _CHANNEL_BATCHES.inc()
+
+    out = []
+    for (item_id, _), p, d in zip(items, probs.tolist(), decisions.tolist()):
+        rec = {"probability": p, "decision": d}
+        out.append(rec if item_id is None else {"id": item_id, **rec})
+    return out
+
+
+async def _channel_reader(ws: WebSocket, credits: CreditWindow) -> Optional[str]:
+    """
+    Feed received frames into the credit window until the client leaves
+    (None) or breaks the protocol (the error message).
+    """
+    try:
+        while True:
+            msg = await ws.receive()
+            if msg["type"] == "websocket.disconnect":
+                credits.close(discard=True)
+                return None
+            data = msg.get("bytes") or (msg.get("text") or "").encode()
+            credits.accept(parse_frame(data))
+    except ProtocolError as e:
+        credits.close()
+        return str(e)
+    except Exception:
+        credits.close(discard=True)
+        return None
+
+
+async def _send_json(ws: WebSocket, payload: Dict[str, object]) -> None:
+    await ws.send_text(encode_json(payload).decode())
+
+
+@router.websocket("/stream")
+async def score_stream(
+    ws: WebSocket,
+    model: Optional[str] = Query(None),
+    threshold: Optional[float] = Query(None),
+):
+    """
+    Long-lived scoring channel: transactions in, results back in order,
+    scored in small batches under a CHANNEL_WINDOW credit (see channel.py).
+    """
+    await ws.accept()
+    try:
+        entry = await _get_model(model)
+    except HTTPException as e:
+        await _send_json(ws, {"type": "error", "detail": e.detail})
+        await ws.close(code=1011)
+        return
+    thresh = float(entry.threshold if threshold is None else threshold)
+    tracker = await _tracker_for(model)
+    credits = CreditWindow(CHANNEL_WINDOW, CHANNEL_MAX_BATCH, CHANNEL_MAX_WAIT_MS)
+    await _send_json(
+        ws,
+        {
+            "type": "hello",
+            "credit": credits.window,
+            "max_batch": credits.max_batch,
+            "threshold": thresh,
+            "model": os.path.basename(_artifact_dir_for(model)),
+        },
+    )
+
+    reader = asyncio.create_task(_channel_reader(ws, credits))
+    _CHANNELS.inc()
+    try:
+        while True:
+            batch = await credits.next_batch()
+            if batch is None:
+                break
+            # One batch per connection on the executor at a time; the credit
+            # already bounds the connection, so it is not subject to admission
+            results = await CPU.run(_score_items, batch, entry, thresh, tracker, admit=False)
+            credits.release(len(batch))
+            await _send_json(ws, {"type": "scores", "results": results, "credit": len(batch)})
+        error = await reader
+        if error is not None:
+            await _send_json(ws, {"type": "error", "detail": error})
+            await ws.close(code=1008)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        try:
+            await _send_json(ws, {"type": "error", "detail": f"Inference error: {e}"})
+            await ws.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        reader.cancel()
+        _CHANNELS.dec()
+
+
+def _score_lines(
+    lines: List[bytes], entry: LoadedModel, thresh: float, tracker: TopRiskTracker
+) -> bytes:
+    """
+    NDJSON result lines for NDJSON transaction lines (blank lines skipped;
+    a line that is not a transaction gets {"error": ...} in its place).
+    """
+    parsed: List[object] = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            parsed.append(parse_line(line))
+        except ProtocolError as e:
+            parsed.append({"error": str(e)})
+    items = [p for p in parsed if isinstance(p, tuple)]
+    scored = iter(_score_items(items, entry, thresh, tracker) if items else [])
+    return b"".join(
+        encode_json(next(scored) if isinstance(p, tuple) else p) + b"\n" for p in parsed
+    )
+
+
+async def _ndjson_results(
+    request: Request, entry: LoadedModel, thresh: float, tracker: TopRiskTracker
+) -> AsyncIterator[bytes]:
+    # The next body chunk is only read once the previous results were handed
+    # to the transport, so a slow reader slows the writer (TCP backpressure)
+    lines = LineSplitter(CHANNEL_MAX_LINE_BYTES)
+    async for chunk in request.stream():
+        done = lines.feed(chunk)
+        for start in range(0, len(done), CHANNEL_MAX_BATCH):
+            batch = done[start : start + CHANNEL_MAX_BATCH]
+            yield await CPU.run(_score_lines, batch, entry, thresh, tracker, admit=False)
+        if lines.error is not None:
+            yield encode_json({"error": lines.error}) + b"\n"
+            return
+    rest = lines.close()
+    if rest:
+        yield await CPU.run(_score_lines, rest, entry, thresh, tracker, admit=False)
+
+
+@router.post("/predict/ndjson")
+async def predict_ndjson(
+    request: Request,
+    model: Optional[str] = Query(None),
+    threshold: Optional[float] = Query(None),
+):
+    """
+    Score a stream of transactions sent as NDJSON (one JSON object per
+    line, as on the /api/stream channel) and stream back one result line
+    per transaction, in order. Lines are scored CHANNEL_MAX_BATCH at a time
+    as the body arrives.
+    """
+    entry = await _get_model(model)
+    thresh = float(entry.threshold if threshold is None else threshold)
+    tracker = await _tracker_for(model)
+    return DuplexStreamingResponse(
+        _ndjson_results(request, entry, thresh, tracker), media_type="application/x-ndjson"
+    )
+
+
+# -----------------------------------------------------------------------------
+# /api/jobs – background batch scoring with results spooled to disk
+# -----------------------------------------------------------------------------
+JOBS = JobManager(
+    JOB_SPOOL_DIR,
+    STREAM_CHUNK_ROWS,
+    max_concurrent=JOB_MAX_CONCURRENT,
+    max_queued=JOB_MAX_QUEUED,
+    ttl=JOB_TTL_SECONDS,
+)
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(
+    user_id: Optional[str] = Form("guest"),
+    threshold: Optional[float] = Form(None),
+    file: UploadFile = File(...),
+    model: Optional[str] = Query(None),
+):
+    """
+    Queue a **.csv** upload for background scoring and return its job id.
+
+    Poll GET /api/jobs/{job_id} for progress and download the scored CSV
+    (original columns + fraud_probability + model_decision) from
+    GET /api/jobs/{job_id}/result once status is "done".
+    """
+    entry = await _get_model(model)
+    thresh = float(entry.threshold if threshold is None else threshold)
+
+    try:
+        job = await _offload(
+            JOBS.submit,
+            file.file,
+            lambda chunk: _score_job_chunk(chunk, thresh, entry, model),
+            model=model,
+            threshold=thresh,
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Job queue full: {e}")
+
+    return job.to_dict(JOBS.ttl)
+
+
+def _score_job_chunk(
+    chunk: pd.DataFrame, thresh: float, entry: LoadedModel, model: Optional[str]
+) -> pd.DataFrame:
+    # Same per-chunk hooks as /api/predict-csv: drift (in _score_frame) and top risks
+    scored = _score_frame(chunk, thresh, entry)
+    _track_risks(model, scored, entry.bundle)
+    return scored
+
+
+def _job_or_404(job_id: str):
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job.")
+    return job
+
+
+@router.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    """
+    Status and progress of a job: rows scored so far and rows/second.
+    """
+    return _job_or_404(job_id).to_dict(JOBS.ttl)
+
+
+@router.get("/jobs/{job_id}/result")
+def job_result(job_id: str):
+    """
+    Download the scored CSV of a finished job.
+    """
+    job = _job_or_404(job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=400, detail=f"Inference error: {job.error}")
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}.")
+    return FileResponse(job.output_path, media_type="text/csv", filename=f"scored_{job_id}.csv")
+
+
+@router.delete("/jobs/{job_id}")
+def delete_job(job_id: str):
+    """
+    Delete a finished job and its result file before the TTL runs out.
+    """
+    job = _job_or_404(job_id)
+    if not JOBS.delete(job.id):
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}.")
+    return {"deleted": job_id}
 
 
 # -----------------------------------------------------------------------------
@@ -362,6 +1499,14 @@ def template_csv(example: int = 1):
 # -----------------------------------------------------------------------------
 # /api/metrics – model-aware dashboard metrics
 # -----------------------------------------------------------------------------
+_METRICS_SOURCES = [
+    "synthetic_quality_check",
+    "threshold_sweep",
+    "precision_recall_vs_threshold",
+    "test_scored",
+]
+
+
 @router.get("/metrics")
 async def metrics(model: Optional[str] = Query(None)):
     """
@@ -371,10 +1516,18 @@ async def metrics(model: Optional[str] = Query(None)):
       - threshold_sweep.csv         [optional – used for P/R vs τ]
       - test_scored.csv (subset)    [optional – histogram sample]
 
-    If any file is missing, returns an empty list for that section.
+    If any file is missing, returns an empty list for that section. The
+    serialized response is cached until one of those files changes.
     """
     ART_DIR = _artifact_dir_for(model)
+    key, paths = ("metrics", ART_DIR), _artifact_paths(ART_DIR, _METRICS_SOURCES)
+    body = ARTIFACTS.peek(key, paths)
+    if body is None:
+        body = await _offload(ARTIFACTS.get_json, key, paths, lambda: _build_metrics(ART_DIR))
+    return Response(content=body, media_type="application/json")
+
 
+def _build_metrics(ART_DIR: str) -> Dict[str, object]:
     # quality (optional)
     try:
         quality_df = _read_table_csv(os.path.join(ART_DIR, "synthetic_quality_check"))
@@ -410,34 +1563,255 @@ async def metrics(model: Optional[str] = Query(None)):
 
 
 # -----------------------------------------------------------------------------
-# /api/top-risks – top risky transactions (single model for now)
+# /api/operating-points – confusion counts at arbitrary thresholds
+# -----------------------------------------------------------------------------
+_MAX_THRESHOLDS = 10_000
+
+
+class OperatingPointsBody(BaseModel):
+    thresholds: List[float]
+
+
+def _build_score_index(ART_DIR: str) -> ScoreIndex:
+    scored = _read_table_csv(os.path.join(ART_DIR, "test_scored"))
+    label_col, proba_col = _find_label_proba_cols(scored)
+    y_true = pd.to_numeric(scored[label_col], errors="coerce").fillna(0).astype(int).to_numpy()
+    y_score = pd.to_numeric(scored[proba_col], errors="coerce").fillna(0.0).to_numpy()
+    return ScoreIndex(y_true, y_score)
+
+
+def _operating_points(model: Optional[str], thresholds: List[float]) -> Dict[str, object]:
+    if not thresholds:
+        raise HTTPException(status_code=400, detail="Give at least one threshold (or grid).")
+    if len(thresholds) > _MAX_THRESHOLDS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {_MAX_THRESHOLDS} thresholds per request."
+        )
+    t = np.asarray(thresholds, dtype=float)
+    if not np.isfinite(t).all():
+        raise HTTPException(status_code=400, detail="Thresholds must be finite numbers.")
+
+    ART_DIR = _artifact_dir_for(model)
+    path = os.path.join(ART_DIR, "test_scored")
+    try:
+        index = ARTIFACTS.get(
+            ("score-index", ART_DIR),
+            _artifact_paths(ART_DIR, ["test_scored"]),
+            lambda: _build_score_index(ART_DIR),
+        )
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=404, detail=f"No scored evaluation set ({path}.csv) for this model."
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    payload = {
+        "n": index.n,
+        "positives": index.positives,
+        "negatives": index.negatives,
+        "points": index.query(t),
+    }
+    # Plain ints/floats/None only, so skip jsonable_encoder's per-value walk
+    body = json.dumps(payload, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/operating-points")
+async def operating_points(
+    threshold: List[float] = Query([]),
+    grid: Optional[int] = Query(None, ge=2, le=_MAX_THRESHOLDS),
+    model: Optional[str] = Query(None),
+):
+    """
+    Precision, recall, FP/FN and alert volume at any threshold(s), from the
+    model's test_scored.csv (a row is flagged when its score >= threshold).
+
+    Pass ?threshold= once or repeated, and/or ?grid=N for N evenly spaced
+    thresholds over [0, 1]. The sorted-score index is built once per
+    test_scored.csv version, so each threshold costs one binary search.
+    """
+    thresholds = list(threshold)
+    if grid is not None:
+        thresholds += np.linspace(0.0, 1.0, grid).tolist()
+    return await _offload(_operating_points, model, thresholds)
+
+
+@router.post("/operating-points")
+async def operating_points_batch(body: OperatingPointsBody, model: Optional[str] = Query(None)):
+    """
+    Same as GET /api/operating-points for a JSON list of thresholds.
+    """
+    return await _offload(_operating_points, model, body.thresholds)
+
+
+# -----------------------------------------------------------------------------
+# /api/drift – live feature / score distributions vs the training reference
+# -----------------------------------------------------------------------------
+def _drift_report(entry: LoadedModel, reset: bool) -> Dict[str, object]:
+    monitor = _drift_for(entry)
+    if monitor is None:
+        return {"enabled": False}
+    report = monitor.report(
+        DRIFT_MIN_ROWS, DRIFT_MEAN_Z, DRIFT_STD_RATIO, DRIFT_FILL_RATE, DRIFT_PSI
+    )
+    if reset:
+        monitor.reset()
+    return {"enabled": True, **report}
+
+
+@router.get("/drift")
+async def drift(model: Optional[str] = Query(None), reset: int = 0):
+    """
+    Drift of the traffic scored by the given model since startup (or the last
+    ?reset=1): per-feature count, NaN and median-fill rates, mean/std and
+    quantiles next to the training scaler's mean/std, and the score histogram
+    (with PSI against test_scored.csv when the model has one). Features that
+    fail a DRIFT_* check are listed in drifted_features. No raw rows are kept.
+    """
+    entry = await _get_model(model)
+    return await _offload(_drift_report, entry, bool(reset))
+
+
+# -----------------------------------------------------------------------------
+# /api/top-risks – live top risky transactions per model
 # -----------------------------------------------------------------------------
+_RISK_COLS = ["Time", "Amount", "fraud_probability", "true_label", "model_decision"]
+
+
+def _seed_top_risks(ART_DIR: str) -> List[Tuple[Optional[bytes], Dict[str, object]]]:
+    """
+    Starting (identity, row) pairs for a model's tracker: its top_risks.csv,
+    else the default one.
+    """
+    path = os.path.join(ART_DIR, "top_risks")
+    if read_table(path) is None:
+        path = os.path.join(ARTIFACT_DIR, "top_risks")
+    return _build_top_risks(path)
+
+
+# Bounded per-model heaps, seeded from top_risks.csv and fed by scoring traffic
+TOP_RISKS = TopRiskTracker(TOPK_SIZE, "fraud_probability", _seed_top_risks, TOPK_PERSIST_DIR)
+
+
+def _py(v):
+    return v.item() if isinstance(v, np.generic) else v
+
+
+def _risk_keys(X: np.ndarray) -> List[bytes]:
+    """
+    Identities of filled feature rows in the top-risks trackers, so a
+    transaction scored again replaces its entry. Rounded to 9 decimals:
+    CSV and JSON parsers may disagree in the last digit of the same value.
+    """
+    return [row_key(x, decimals=9) for x in X]
+
+
+def _track_risks(
+    model: Optional[str],
+    scored: pd.DataFrame,
+    bundle,
+    prob_col: str = "fraud_probability",
+    decision_col: str = "model_decision",
+) -> None:
+    """
+    Offer freshly scored rows to the model's live top-risks tracker; the
+    prediction columns may be named per model (multi-model scoring). Only
+    rows entering the top k are filled again (with bundle's medians) to key
+    them.
+    """
+    cols_lower = {str(c).lower(): c for c in scored.columns}
+    cols_lower.update({"fraud_probability": prob_col, "model_decision": decision_col})
+    keep = [(k, cols_lower[k.lower()]) for k in _RISK_COLS if k.lower() in cols_lower]
+    TOP_RISKS.get(_artifact_dir_for(model)).offer(
+        scored[prob_col].to_numpy(),
+        lambda i: {k: _py(scored[c].iat[i]) for k, c in keep},
+        lambda idx: _risk_keys(fill_and_order_frame(scored.iloc[idx], bundle)),
+    )
+
+
 @router.get("/top-risks")
-async def top_risks(limit: int = 50):
+async def top_risks(limit: int = 50, model: Optional[str] = Query(None)):
     """
-    Top risky transactions sorted by fraud_probability.
+    Top risky transactions for the given model, sorted by fraud_probability.
 
-    Reads top_risks.csv from the default ARTIFACT_DIR.
+    Starts from the model's top_risks.csv (or the default one) and keeps the
+    TOPK_SIZE riskiest rows scored since by /api/predict and /api/predict-csv,
+    so reads never re-sort the file.
     """
-    try:
-        df = _read_table_csv(os.path.join(ARTIFACT_DIR, "top_risks"))
-    except FileNotFoundError as e:
-        raise HTTPException(404, str(e))
+    ART_DIR = _artifact_dir_for(model)
+    tracker = TOP_RISKS.peek(ART_DIR)
+    if tracker is None:  # first read seeds from top_risks.csv
+        tracker = await _offload(TOP_RISKS.get, ART_DIR)
+    return {"rows": tracker.top(limit)}
+
+
+def _build_top_risks(path_no_ext: str) -> List[Tuple[Optional[bytes], Dict[str, object]]]:
+    df = _read_table_csv(path_no_ext)
 
     # Prefer robust selection of columns and probability col
-    cols = ["Time", "Amount", "fraud_probability", "true_label", "model_decision"]
-    cols = [c for c in cols if c in df.columns]
+    cols = [c for c in _RISK_COLS if c in df.columns]
     prob_col = df.columns[df.columns.str.contains("fraud_probability")][0]
-    df = df.sort_values(prob_col, ascending=False).head(limit)
-    return {"rows": df[cols].to_dict(orient="records")}
+    df = df.sort_values(prob_col, ascending=False)
+    keys = _risk_keys(fill_and_order_frame(df, BUNDLE))
+    return list(zip(keys, df[cols].to_dict(orient="records")))
 
 
 # -----------------------------------------------------------------------------
 # /api/curves – ROC / PR curves + feature importance (model-aware)
 # -----------------------------------------------------------------------------
+_CURVES_SOURCES = [
+    "roc_curve",
+    "pr_curve",
+    "precision_vs_recall",
+    "feature_importance",
+    "test_scored",
+]
+
+
 @router.get("/curves")
-async def curves(model: Optional[str] = Query(None)):
+async def curves(
+    model: Optional[str] = Query(None),
+    max_points: Optional[int] = Query(None, ge=3),
+):
+    """
+    ROC / PR curves and top feature importances for the given model. The
+    serialized response is cached until one of the source CSVs changes.
+
+    With max_points, each curve is downsampled with LTTB (shape-preserving)
+    to at most that many points; auc / ap are still the full-curve values.
+    """
     ART_DIR = _artifact_dir_for(model)
+    paths = _artifact_paths(ART_DIR, _CURVES_SOURCES)
+
+    def build() -> Dict[str, object]:
+        full = ARTIFACTS.get(("curves-full", ART_DIR), paths, lambda: _build_curves(ART_DIR))
+        return _decimate_curves(full, max_points)
+
+    key = ("curves", ART_DIR, max_points)
+    body = ARTIFACTS.peek(key, paths)
+    if body is None:
+        body = await _offload(ARTIFACTS.get_json, key, paths, build)
+    return Response(content=body, media_type="application/json")
+
+
+def _decimate_curves(payload: Dict[str, object], max_points: Optional[int]) -> Dict[str, object]:
+    if max_points is None:
+        return payload
+    out = dict(payload)
+    if payload.get("roc"):
+        fpr, tpr = decimate_curve(payload["roc"]["fpr"], payload["roc"]["tpr"], max_points)
+        out["roc"] = {**payload["roc"], "fpr": fpr, "tpr": tpr}
+    if payload.get("pr"):
+        recall, precision = decimate_curve(
+            payload["pr"]["recall"], payload["pr"]["precision"], max_points
+        )
+        out["pr"] = {**payload["pr"], "recall": recall, "precision": precision}
+    return out
+
+
+def _build_curves(ART_DIR: str) -> Dict[str, object]:
+    from sklearn.metrics import auc
 
     # --- read ROC CSV
     roc_df = _read_csv_if_exists(os.path.join(ART_DIR, "roc_curve"))
@@ -505,37 +1879,25 @@ async def curves(model: Optional[str] = Query(None)):
         try:
             scored = _read_table_csv(os.path.join(ART_DIR, "test_scored"))
             label_col, proba_col = _find_label_proba_cols(scored)
-            y_true = (
-                pd.to_numeric(scored[label_col], errors="coerce")
-                .fillna(0)
-                .astype(int)
-                .to_numpy()
-            )
-            y_score = (
-                pd.to_numeric(scored[proba_col], errors="coerce")
-                .fillna(0.0)
-                .to_numpy()
+            counts = CurveCounts.from_labels(
+                pd.to_numeric(scored[label_col], errors="coerce").fillna(0).astype(int).to_numpy(),
+                pd.to_numeric(scored[proba_col], errors="coerce").fillna(0.0).to_numpy(),
             )
 
             if roc is None:
-                fpr, tpr, _ = roc_curve(y_true, y_score)
-                roc = {
-                    "fpr": fpr.tolist(),
-                    "tpr": tpr.tolist(),
-                    "auc": float(auc(fpr, tpr)),
-                }
+                fpr, tpr, _ = counts.roc()
+                roc = {"fpr": fpr.tolist(), "tpr": tpr.tolist(), "auc": counts.roc_auc()}
             if pr is None:
-                p_arr, r_arr, _ = precision_recall_curve(y_true, y_score)
-                ap_val = float(average_precision_score(y_true, y_score))
+                p_arr, r_arr, _ = counts.pr()
                 pr = {
                     "recall": r_arr.tolist(),
                     "precision": p_arr.tolist(),
-                    "ap": ap_val,
+                    "ap": counts.average_precision(),
                 }
         except Exception:
             pass
 
-    # ---- Feature importance (file first, then model attr) ----
+    # ---- Feature importance (file first, then the model) ----
     if fi_df is not None:
         try:
             cols = {c.lower(): c for c in fi_df.columns}
@@ -554,22 +1916,50 @@ async def curves(model: Optional[str] = Query(None)):
             feat = None
 
     if not feat:
-        try:
-            if hasattr(MODEL, "feature_importances_"):
-                imps = MODEL.feature_importances_
-                feats = (
-                    FEATURE_ORDER
-                    if len(FEATURE_ORDER) == len(imps)
-                    else [f"f{i}" for i in range(len(imps))]
-                )
-                feat = [
-                    {"feature": f, "importance": float(v)}
-                    for f, v in zip(feats, imps)
-                ]
-                feat = sorted(
-                    feat, key=lambda x: x["importance"], reverse=True
-                )[:15]
-        except Exception:
-            feat = []
+        feat = sorted(_model_importances(MODEL), key=lambda x: x["importance"], reverse=True)[:15]
 
     return {"roc": roc, "pr": pr, "feature_importance": feat or []}
+
+
+# -----------------------------------------------------------------------------
+# /api/rebuild-curves – regenerate curve artifacts from test_scored.csv
+# -----------------------------------------------------------------------------
+@router.post("/rebuild-curves")
+async def rebuild_curves(model: Optional[str] = Query(None), full: int = 0):
+    """
+    Regenerate roc_curve / pr_curve / threshold_sweep / feature_importance
+    for the model from its test_scored.csv. Rows appended since the last
+    build are merged in incrementally; ?full=1 recounts the whole file.
+    """
+    art_dir = _artifact_dir_for(model)
+    if not os.path.exists(os.path.join(art_dir, "test_scored.csv")) and read_table(
+        os.path.join(art_dir, "test_scored")
+    ) is None:
+        raise HTTPException(status_code=404, detail="No test_scored.csv for this model.")
+    entry = await _get_model(model)
+    try:
+        out = await _offload(
+            _compute_and_save_curves_and_importances, art_dir, entry.model, bool(full)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "ok": True,
+        "model_dir": os.path.basename(art_dir),
+        **out["build"],
+        "auc": out["roc"]["auc"],
+        "ap": out["pr"]["ap"],
+    }
+
+
+# -----------------------------------------------------------------------------
+# /api/refresh-artifacts – drop cached artifact responses
+# -----------------------------------------------------------------------------
+@router.post("/refresh-artifacts")
+def refresh_artifacts(force: int = 0):
+    """
+    Evict cached artifact responses whose files changed (stale entries are
+    also rebuilt lazily on the next request), or every entry with ?force=1.
+    """
+    dropped = ARTIFACTS.refresh(force=bool(force))
+    return {"ok": True, "dropped": dropped, **ARTIFACTS.stats()}
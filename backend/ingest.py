@@ -0,0 +1,177 @@
+"""
+CSV upload ingestion for the scoring endpoints.
+
+The first HEAD_BYTES of the (decompressed) upload decide how it is parsed:
+
+  - delimiter: the candidate (, ; tab |) splitting the header line into the
+    most fields
+  - header: the first line is a header unless every field on it is a
+    number (or empty); a headerless upload's columns are taken to be
+    FEATURE_ORDER followed by extra_<i>. Features missing from a header are
+    median-filled later, like any other missing column
+  - dtypes: feature columns are read as float64 and every other column
+    (bar the label) as a raw string, so no per-column type inference runs;
+    with passthrough=False the other columns are not parsed at all
+
+gzip and zstd uploads are recognised by their magic bytes (zstd needs the
+optional zstandard package). Whole-file reads use pandas' multithreaded
+pyarrow engine when pyarrow is installed, else the C engine. Both packages
+are listed in requirements-optional.txt.
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .transforms import FEATURE_ORDER
+
+HEAD_BYTES = 64 * 1024
+_DELIMITERS = (",", ";", "\t", "|")
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_FEATURES_LOWER = {k.lower() for k in FEATURE_ORDER}
+# Label columns keep inferred dtypes (ints in /api/top-risks rows) and are
+# parsed even when passthrough columns are dropped
+_LABELS_LOWER = {"true_label", "class"}
+
+try:  # optional multithreaded parser
+    import pyarrow  # noqa: F401
+
+    _ENGINE = "pyarrow"
+except ImportError:  # pragma: no cover - depends on the environment
+    _ENGINE = "c"
+
+
+class _Prefixed(io.RawIOBase):
+    """
+    Read-only stream that replays already-consumed bytes before the rest.
+    """
+
+    def __init__(self, head: bytes, rest: BinaryIO):
+        self._head = memoryview(head)
+        self._rest = rest
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self._head:
+            n = min(len(b), len(self._head))
+            b[:n] = self._head[:n]
+            self._head = self._head[n:]
+            return n
+        data = self._rest.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+
+def open_upload(fh: BinaryIO) -> Tuple[BinaryIO, bytes]:
+    """
+    Wrap an upload so it reads as plain CSV bytes; also returns its first
+    HEAD_BYTES (decompressed) for sniffing, without consuming them.
+    """
+    magic = fh.read(4)
+    stream: BinaryIO = io.BufferedReader(_Prefixed(magic, fh))
+    if magic.startswith(_GZIP_MAGIC):
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+    elif magic.startswith(_ZSTD_MAGIC):
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("zstd-compressed upload, but the zstandard package is not installed")
+        stream = zstandard.ZstdDecompressor().stream_reader(stream)
+    parts, size = [], 0
+    while size < HEAD_BYTES:  # a single read may return less than asked
+        part = stream.read(HEAD_BYTES - size)
+        if not part:
+            break
+        parts.append(part)
+        size += len(part)
+    head = b"".join(parts)
+    return io.BufferedReader(_Prefixed(head, stream)), head
+
+
+def _first_line(head: bytes) -> str:
+    text = head.decode("utf-8", errors="ignore").lstrip("\ufeff")
+    return text.splitlines()[0] if text else ""
+
+
+def sniff(head: bytes) -> Tuple[str, List[str], bool]:
+    """
+    (delimiter, first-line fields, has_header) from the first bytes of a CSV.
+    """
+    first = _first_line(head)
+    sep = max(_DELIMITERS, key=lambda d: len(first.split(d)))
+    fields = next(csv.reader([first], delimiter=sep), [])
+    return sep, fields, not all(_is_number(f) for f in fields)
+
+
+def _is_number(field: str) -> bool:
+    field = field.strip()
+    if not field:
+        return True  # a missing value in a data row
+    try:
+        float(field)
+        return True
+    except ValueError:
+        return False
+
+
+def read_options(head: bytes, passthrough: bool = True) -> Dict[str, object]:
+    """
+    pd.read_csv keyword arguments for an upload starting with head.
+    """
+    sep, fields, has_header = sniff(head)
+    if has_header:
+        columns = fields
+        opts: Dict[str, object] = {"sep": sep, "header": 0}
+    else:
+        extra = [f"extra_{i}" for i in range(len(fields) - len(FEATURE_ORDER))]
+        columns = FEATURE_ORDER[: len(fields)] + extra
+        opts = {"sep": sep, "header": None, "names": columns}
+
+    features = [c for c in columns if c.strip().lower() in _FEATURES_LOWER]
+    labels = [c for c in columns if c.strip().lower() in _LABELS_LOWER]
+    dtype = {c: np.float64 for c in features}
+    if passthrough:
+        dtype.update({c: str for c in columns if c not in dtype and c not in labels})
+    elif features or labels:
+        opts["usecols"] = features + labels
+    opts["dtype"] = dtype
+    return opts
+
+
+def read_upload(fh: BinaryIO, passthrough: bool = True) -> pd.DataFrame:
+    """
+    Parse a whole (optionally compressed) CSV upload.
+
+    If a feature column holds text that is not a number, it is re-read with
+    inferred dtypes so fill_and_order_frame can give those cells the median.
+    """
+    stream, head = open_upload(fh)
+    data = stream.read()
+    opts = read_options(head, passthrough)
+    try:
+        return pd.read_csv(io.BytesIO(data), engine=_ENGINE, **opts)
+    except ValueError:
+        dtype = {c: t for c, t in opts["dtype"].items() if t is str}
+        return pd.read_csv(io.BytesIO(data), **{**opts, "dtype": dtype})
+
+
+def iter_upload(fh: BinaryIO, chunk_rows: int, passthrough: bool = True) -> Iterator[pd.DataFrame]:
+    """
+    Parse a (optionally compressed) CSV upload chunk_rows rows at a time.
+
+    Feature dtypes are inferred per chunk here: a forced float64 parse that
+    fails halfway through a stream could not be retried.
+    """
+    stream, head = open_upload(fh)
+    opts = read_options(head, passthrough)
+    opts["dtype"] = {c: t for c, t in opts["dtype"].items() if t is str}
+    return iter(pd.read_csv(stream, chunksize=chunk_rows, **opts))
+
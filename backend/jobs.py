@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .ingest import iter_upload
+
+ScoreChunk = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+class QueueFullError(RuntimeError):
+    """Raised by JobManager.submit when max_queued jobs are already waiting."""
+
+
+class Job:
+    """
+    One batch scoring job and its progress.
+    """
+
+    def __init__(self, job_id: str, input_path: str, output_path: str, meta: Dict[str, object]):
+        self.id = job_id
+        self.input_path = input_path
+        self.output_path = output_path
+        self.meta = meta
+        self.status = "queued"
+        self.rows_scored = 0
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self, ttl: float) -> Dict[str, object]:
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "rows_scored": self.rows_scored,
+            "elapsed_s": round(elapsed, 3),
+            "rows_per_sec": round(self.rows_scored / elapsed, 1) if elapsed > 0 else 0.0,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "expires_at": self.finished_at + ttl if self.finished_at else None,
+            "error": self.error,
+            **self.meta,
+        }
+
+
+class JobManager:
+    """
+    Background batch scoring with results spilled to a local spool directory.
+
+    submit() copies the upload into the spool and queues it; at most
+    max_concurrent jobs run at a time (in worker threads, so the event loop
+    stays free) and at most max_queued wait behind them. A job reads its input
+    chunk_rows rows at a time, scores each chunk and appends it to
+    "<id>.csv.part", renamed to "<id>.csv" when complete. Finished jobs and
+    their files are dropped ttl seconds after they finish.
+    """
+
+    def __init__(
+        self,
+        spool_dir: str,
+        chunk_rows: int,
+        max_concurrent: int = 1,
+        max_queued: int = 16,
+        ttl: float = 3600.0,
+    ):
+        self.spool_dir = spool_dir
+        self.chunk_rows = chunk_rows
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrent), thread_name_prefix="score-job"
+        )
+
+    def submit(
+        self, upload: BinaryIO, score_chunk: ScoreChunk, **meta
+    ) -> Job:
+        """
+        Spool the upload and queue it for scoring. Blocking (disk copy).
+        """
+        self.expire()
+        with self._lock:
+            queued = sum(1 for j in self._jobs.values() if j.status == "queued")
+            if queued >= self.max_queued:
+                raise QueueFullError(f"{queued} jobs already queued")
+
+        os.makedirs(self.spool_dir, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        input_path = os.path.join(self.spool_dir, f"{job_id}.input.csv")
+        with open(input_path, "wb") as out:
+            shutil.copyfileobj(upload, out, 1024 * 1024)
+
+        job = Job(job_id, input_path, os.path.join(self.spool_dir, f"{job_id}.csv"), meta)
+        with self._lock:
+            self._jobs[job_id] = job
+        self._executor.submit(self._run, job, score_chunk)
+        return job
+
+    def _run(self, job: Job, score_chunk: ScoreChunk) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        part = job.output_path + ".part"
+        try:
+            with open(job.input_path, "rb") as src, open(part, "w", newline="") as out:
+                header = True
+                for chunk in iter_upload(src, self.chunk_rows):
+                    score_chunk(chunk).to_csv(out, index=False, header=header)
+                    header = False
+                    job.rows_scored += len(chunk)
+            if job.rows_scored == 0:
+                raise ValueError("Uploaded CSV has no rows.")
+            os.replace(part, job.output_path)
+            job.status = "done"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            _remove(part)
+        finally:
+            job.finished_at = time.time()
+            _remove(job.input_path)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self.expire()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def delete(self, job_id: str) -> bool:
+        """
+        Forget a finished job and delete its result; running jobs are kept.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished_at is None:
+                return False
+            del self._jobs[job_id]
+        _remove(job.output_path)
+        return True
+
+    def expire(self) -> List[str]:
+        """
+        Drop jobs that finished more than ttl seconds ago, with their files.
+        """
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [
+                j for j in self._jobs.values() if j.finished_at is not None and j.finished_at < cutoff
+            ]
+            for j in expired:
+                del self._jobs[j.id]
+        for j in expired:
+            _remove(j.output_path)
+        return [j.id for j in expired]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for j in self._jobs.values():
+                counts[j.status] = counts.get(j.status, 0) + 1
+        return counts
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
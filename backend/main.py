@@ -1,9 +1,32 @@
 # backend/main.py
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from .config import ALLOWED_ORIGINS
-from .inference import router as inference_router
-app = FastAPI(title="FraudSynth API", version="1.0")
+from fastapi.responses import PlainTextResponse, Response
+from .artifact_cache import dump_json
+from .startup import STARTUP
+from .config import ALLOWED_ORIGINS, PROFILE_INTERVAL_MS, PROFILING_ENABLED
+from .telemetry import TELEMETRY, TelemetryMiddleware
+
+with STARTUP.phase("import inference"):
+    from .inference import (
+        router as inference_router,
+        shutdown as inference_shutdown,
+        startup as inference_startup,
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    inference_startup()
+    STARTUP.mark_ready()
+    print("Startup:", STARTUP.summary())
+    yield
+    inference_shutdown()
+
+
+app = FastAPI(title="FraudSynth API", version="1.0", lifespan=lifespan)
 print("CORS allowed origins:", ALLOWED_ORIGINS)
 
 # Allow frontend (React) to call backend
@@ -16,10 +39,38 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so request timings include CORS handling
+app.add_middleware(
+    TelemetryMiddleware, profiling=PROFILING_ENABLED, interval_ms=PROFILE_INTERVAL_MS
+)
 # app.include_router(auth_router)
 app.include_router(inference_router)
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics(format: str = "prometheus"):
+    """
+    Stage/request latency histograms and counters in Prometheus text format
+    (?format=json for counters plus p50/p95/p99 per histogram).
+    """
+    if format == "json":
+        return Response(content=dump_json(TELEMETRY.snapshot()), media_type="application/json")
+    return PlainTextResponse(
+        TELEMETRY.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/metrics/profile/{profile_id}", response_class=PlainTextResponse)
+def sampled_profile(profile_id: str):
+    """
+    Folded stacks sampled for a request sent with "X-Profile: 1".
+    """
+    folded = TELEMETRY.get_profile(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Unknown profile id.")
+    return folded
+
+
 @app.get("/debug/origins")
 def debug_origins():
     return {"allow_origins": ALLOWED_ORIGINS}
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+import numpy as np
+
+
+class ScoreIndex:
+    """
+    Distinct scores of a labelled evaluation set sorted once, with cumulative
+    row and positive counts, so the confusion matrix at any threshold is one
+    binary search. This is the one implementation of threshold metrics: the
+    threshold_sweep.csv artifact (curves.CurveCounts.sweep) is built on it.
+
+    A row is flagged when score >= threshold (same rule as model_decision).
+    With the scores ascending, searchsorted(threshold) = i distinct scores
+    fall below it, rows_below[i] rows and pos_below[i] positives with them,
+    and everything else in the confusion matrix follows from the totals.
+    """
+
+    def __init__(self, y_true: np.ndarray, y_score: np.ndarray):
+        y_true = np.asarray(y_true).astype(bool)
+        scores, inverse = np.unique(np.asarray(y_score, dtype=float), return_inverse=True)
+        rows = np.bincount(inverse, minlength=len(scores))
+        pos = np.bincount(inverse, weights=y_true, minlength=len(scores)).astype(np.int64)
+        self._index(scores, pos, rows - pos)
+
+    @classmethod
+    def from_counts(cls, scores: np.ndarray, pos: np.ndarray, neg: np.ndarray) -> "ScoreIndex":
+        """
+        Index over ascending distinct scores with their positive / negative counts.
+        """
+        index = cls.__new__(cls)
+        index._index(np.asarray(scores, dtype=float), np.asarray(pos), np.asarray(neg))
+        return index
+
+    def _index(self, scores: np.ndarray, pos: np.ndarray, neg: np.ndarray) -> None:
+        self.scores = scores
+        self.pos_below = np.concatenate(([0], np.cumsum(pos, dtype=np.int64)))
+        self.rows_below = np.concatenate(([0], np.cumsum(pos + neg, dtype=np.int64)))
+        self.n = int(self.rows_below[-1])
+        self.positives = int(self.pos_below[-1])
+        self.negatives = self.n - self.positives
+
+    def counts(self, thresholds: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Confusion counts and rates for each threshold, one array per column.
+        """
+        t = np.asarray(thresholds, dtype=float).reshape(-1)
+        below = np.searchsorted(self.scores, t, side="left")
+        alerts = self.n - self.rows_below[below]
+        tp = self.positives - self.pos_below[below]
+        fp = alerts - tp
+        fn = self.positives - tp
+        tn = self.negatives - fp
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            precision = np.where(alerts > 0, tp / alerts, np.nan)
+            recall = np.where(self.positives > 0, tp / max(self.positives, 1), np.nan)
+            fpr = np.where(self.negatives > 0, fp / max(self.negatives, 1), np.nan)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+            alert_rate = alerts / self.n if self.n else np.full(len(t), np.nan)
+
+        return {
+            "threshold": t,
+            "alerts": alerts,
+            "alert_rate": alert_rate,
+            "tp": tp,
+            "fp": fp,
+            "fn": fn,
+            "tn": tn,
+            "precision": precision,
+            "recall": recall,
+            "fpr": fpr,
+            "f1": f1,
+        }
+
+    def query(self, thresholds: np.ndarray) -> List[Dict[str, object]]:
+        """
+        counts() as one JSON-ready dict per threshold.
+        """
+        cols = self.counts(thresholds)
+        # NaN (undefined rate) -> None so the payload stays valid JSON
+        lists = [
+            [None if x != x else x for x in v.tolist()] if v.dtype.kind == "f" else v.tolist()
+            for v in cols.values()
+        ]
+        keys = list(cols)
+        return [dict(zip(keys, row)) for row in zip(*lists)]
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .telemetry import TELEMETRY
+
+
+def row_key(row: np.ndarray, prefix: str = "", decimals: Optional[int] = None) -> bytes:
+    """
+    128-bit BLAKE2b digest of prefix and a filled feature row (float64
+    bytes, optionally rounded to decimals first).
+    """
+    row = np.asarray(row, dtype=np.float64).reshape(-1)
+    if decimals is not None:
+        row = np.round(row, decimals)
+    row = row + 0.0  # -0.0 and 0.0 hash alike
+    h = hashlib.blake2b(prefix.encode(), digest_size=16)
+    h.update(row.tobytes())
+    return h.digest()
+
+
+class PredictionCache:
+    """
+    LRU + TTL cache of probabilities keyed by model and filled feature vector.
+
+    The key is a 128-bit BLAKE2b digest of the model key and the row's
+    float64 bytes (raw units, FEATURE_ORDER, after median filling), so retries
+    and replays of the same transaction skip the scaler and the model. With
+    decimals set, the row is rounded first, so near-identical inputs share an
+    entry (their probabilities may then differ slightly from an exact score).
+    """
+
+    def __init__(self, max_entries: int, ttl_s: float, decimals: Optional[int] = None):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_s = ttl_s
+        self.decimals = decimals
+        self._entries: "OrderedDict[bytes, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._hits = TELEMETRY.counter("prediction_cache_total", result="hit")
+        self._misses = TELEMETRY.counter("prediction_cache_total", result="miss")
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def key(self, model_key: str, row: np.ndarray) -> bytes:
+        return row_key(row, model_key, self.decimals)
+
+    def get(self, key: bytes) -> Optional[float]:
+        now = time.monotonic()
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None and hit[1] < now:
+                del self._entries[key]
+                self.expired += 1
+                hit = None
+            if hit is None:
+                self.misses += 1
+                self._misses.inc()
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        self._hits.inc()
+        return hit[0]
+
+    def put(self, key: bytes, prob: float) -> None:
+        with self._lock:
+            self._entries[key] = (prob, time.monotonic() + self.ttl_s)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> int:
+        with self._lock:
+            n = len(self._entries)
+            self._entries.clear()
+            return n
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl_s,
+            "decimals": self.decimals,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+
+class RowDeduplicator:
+    """
+    Collapse identical rows of a feature matrix before scoring.
+
+    A cheap probe on the first and last columns (Time and Amount) rules out
+    duplicates for most batches; otherwise rows are hashed to 64 bits with
+    pandas' vectorized hasher and factorized. The grouping is then checked
+    for exact equality (NaN == NaN), so a hash collision just disables
+    de-duplication for that batch.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.unique_rows = 0
+        self._lock = threading.Lock()
+        self._saved = TELEMETRY.counter("dedup_rows_saved_total")
+
+    def _count(self, rows: int, unique_rows: int) -> None:
+        with self._lock:
+            self.rows += rows
+            self.unique_rows += unique_rows
+
+    def unique(self, X: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        (first_index_of_each_unique_row, inverse) or (None, None) when every
+        row is distinct.
+        """
+        # Equal rows have equal probes, so a probe without repeats proves there
+        # is nothing to collapse
+        X = np.asarray(X, dtype=np.float64)
+        probe = X[:, 0].view(np.uint64) * np.uint64(0x9E3779B97F4A7C15) ^ X[:, -1].view(np.uint64)
+        probe.sort()
+        if not (probe[1:] == probe[:-1]).any():
+            self._count(len(X), len(X))
+            return None, None
+        h = pd.util.hash_pandas_object(pd.DataFrame(X, copy=False), index=False).to_numpy()
+        codes, uniq = pd.factorize(h)
+        if len(uniq) == len(X):
+            self._count(len(X), len(X))
+            return None, None
+        first = np.empty(len(uniq), dtype=np.int64)
+        first[codes] = np.arange(len(X))  # any member of the group represents it
+        rebuilt = X[first][codes]
+        same = (X == rebuilt) | (np.isnan(X) & np.isnan(rebuilt))
+        if not same.all():
+            self._count(len(X), len(X))
+            return None, None
+        self._count(len(X), len(uniq))
+        self._saved.inc(len(X) - len(uniq))
+        return first, codes
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "rows": self.rows,
+            "unique_rows": self.unique_rows,
+            "dedup_ratio": 1 - self.unique_rows / self.rows if self.rows else None,
+        }
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import joblib
+import numpy as np
+
+from .config import FLAT_ENGINE_MAX_ROWS, TREE_ENGINE
+from .telemetry import TELEMETRY
+from .transforms import ArtifactBundle, to_model_space
+from .tree_engine import FlatTreeEnsemble
+
+MODEL_FILE = "fraud_detector_lgb.pkl"  # (typo preserved in asset)
+
+_ROWS_SCORED = TELEMETRY.counter("rows_scored_total")
+
+
+def _rss_bytes() -> Optional[int]:
+    """
+    Current resident set size of this process (Linux /proc), else None.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class LoadedModel:
+    """
+    Everything needed to score with one model: the booster, its scaler and
+    medians (ArtifactBundle), the optional compiled flat engine and the
+    operating threshold.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        model,
+        bundle: ArtifactBundle,
+        threshold: float,
+        flat_model: Optional[FlatTreeEnsemble] = None,
+    ):
+        self.key = key
+        self.model = model
+        self.bundle = bundle
+        self.threshold = threshold
+        self.flat_model = flat_model
+        self.size_bytes = 0
+        self.batcher = None  # MicroBatcher, created on first use by inference
+        self.drift = None  # DriftMonitor, likewise
+
+    def predict_proba(self, Xm: np.ndarray) -> np.ndarray:
+        """
+        Robust probability extraction for every row of a model-space matrix.
+
+        The model may be an sklearn-style estimator or a raw LightGBM Booster,
+        so try predict_proba, then decision_function, then plain predict. With
+        TREE_ENGINE=flat, small batches go to the compiled flat-array engine.
+        """
+        model = self.model
+        if self.flat_model is not None and Xm.shape[0] <= FLAT_ENGINE_MAX_ROWS:
+            return self.flat_model.predict(Xm)
+        if hasattr(model, "predict_proba"):
+            proba = np.asarray(model.predict_proba(Xm), dtype=float)
+            return proba if proba.ndim == 1 else proba[:, -1]
+        if hasattr(model, "decision_function"):
+            from scipy.special import expit
+
+            return np.asarray(expit(model.decision_function(Xm)), dtype=float).reshape(-1)
+        return np.asarray(model.predict(Xm), dtype=float).reshape(-1)
+
+    def score(self, X: np.ndarray) -> np.ndarray:
+        """
+        Probabilities for an (n_rows, 30) matrix in FEATURE_ORDER (raw units).
+        X is scaled in place.
+        """
+        with TELEMETRY.stage("model.scale"):
+            Xm = to_model_space(X, out=X, bundle=self.bundle)
+        return self.score_scaled(Xm)
+
+    def score_scaled(self, Xm: np.ndarray) -> np.ndarray:
+        """
+        Probabilities for a matrix already in this model's space (e.g. one
+        scaled once for several models sharing a scaler).
+        """
+        with TELEMETRY.stage("model.predict"):
+            proba = self.predict_proba(Xm)
+        _ROWS_SCORED.inc(len(proba))
+        return proba
+
+    def contributions(self, X: np.ndarray) -> np.ndarray:
+        """
+        Per-row TreeSHAP contributions (n_rows, 31), log-odds, bias last, for
+        a raw-unit matrix in FEATURE_ORDER; one LightGBM call for the batch.
+        X is scaled in place.
+        """
+        if not hasattr(self.model, "predict"):
+            raise ValueError("model has no LightGBM predictor for contributions")
+        Xm = to_model_space(X, out=X, bundle=self.bundle)
+        with TELEMETRY.stage("model.explain"):
+            return np.asarray(self.model.predict(Xm, pred_contrib=True), dtype=float)
+
+
+def load_model(
+    art_dir: str, default_threshold: float, bundle: Optional[ArtifactBundle] = None
+) -> LoadedModel:
+    """
+    Load the booster, scaler/medians and threshold from one artifact folder.
+    """
+    model = joblib.load(os.path.join(art_dir, MODEL_FILE))
+    bundle = bundle or ArtifactBundle(art_dir)
+
+    flat_model = None
+    if TREE_ENGINE == "flat":
+        try:
+            flat_model = FlatTreeEnsemble.from_booster(model)
+        except Exception as e:
+            print("[WARN] Flat tree engine unavailable, using LightGBM predictor:", e)
+
+    threshold = float(bundle.metadata.get("operating_threshold", default_threshold))
+    return LoadedModel(art_dir, model, bundle, threshold, flat_model)
+
+
+class ModelRegistry:
+    """
+    Lazily loaded, LRU-evicted set of models keyed by artifact folder.
+
+    Models load on first use; concurrent first requests for the same model
+    wait on a single load. After each load the least recently used models are
+    evicted while more than max_models are held or process RSS exceeds
+    rss_budget_mb (0 = no budget), counting each model's measured load size.
+    The default model is pinned because the module-level globals hold it.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], LoadedModel],
+        default: LoadedModel,
+        max_models: int = 4,
+        rss_budget_mb: float = 0,
+    ):
+        self._loader = loader
+        self.default_key = default.key
+        self.max_models = max(1, int(max_models))
+        self.rss_budget = int(rss_budget_mb * 1024 * 1024)
+        self._entries: "OrderedDict[str, LoadedModel]" = OrderedDict([(default.key, default)])
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def peek(self, key: str) -> Optional[LoadedModel]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def get(self, key: str) -> LoadedModel:
+        """
+        Return the model for key, loading it (once) if needed. Blocking.
+        """
+        entry = self.peek(key)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self.peek(key)  # loaded while we waited
+            if entry is not None:
+                return entry
+            try:
+                before = _rss_bytes()
+                entry = self._loader(key)
+                after = _rss_bytes()
+                if before is not None and after is not None:
+                    entry.size_bytes = max(0, after - before)
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(key, None)
+                raise
+            with self._lock:
+                # Publish before dropping the key lock: a caller arriving
+                # in between would otherwise find neither and load again
+                self._entries[key] = entry
+                self._loading.pop(key, None)
+                self.loads += 1
+                self._evict(keep=key)
+        return entry
+
+    async def aget(self, key: str) -> LoadedModel:
+        """
+        Like get(), but loads in a worker thread so the event loop keeps serving.
+        """
+        entry = self.peek(key)
+        if entry is not None:
+            return entry
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, key)
+
+    def _evict(self, keep: str) -> None:
+        rss = _rss_bytes() if self.rss_budget else None
+        victims: List[str] = []
+        for key, entry in self._entries.items():
+            over_count = len(self._entries) - len(victims) > self.max_models
+            over_rss = rss is not None and rss > self.rss_budget
+            if not (over_count or over_rss):
+                break
+            if key in (keep, self.default_key):
+                continue
+            victims.append(key)
+            if rss is not None:
+                rss -= entry.size_bytes
+        for key in victims:
+            self._entries.pop(key, None)
+            self.evictions += 1
+        if victims:
+            gc.collect()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            models = [
+                {
+                    "key": key,
+                    "threshold": entry.threshold,
+                    "size_mb": round(entry.size_bytes / (1024 * 1024), 2),
+                    "default": key == self.default_key,
+                }
+                for key, entry in self._entries.items()
+            ]
+        rss = _rss_bytes()
+        return {
+            "models": models,
+            "max_models": self.max_models,
+            "rss_budget_mb": self.rss_budget / (1024 * 1024),
+            "rss_mb": round(rss / (1024 * 1024), 1) if rss is not None else None,
+            "loads": self.loads,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .transforms import FEATURE_ORDER
+
+_N_FEATURES = len(FEATURE_ORDER)
+
+# Per-worker-process models, keyed by artifact folder
+_WORKER_MODELS: Dict[str, object] = {}
+
+
+def _worker_model(art_dir: str):
+    entry = _WORKER_MODELS.get(art_dir)
+    if entry is None:
+        from .registry import load_model
+
+        # The operating threshold is applied by the parent, not here
+        entry = _WORKER_MODELS[art_dir] = load_model(art_dir, 0.5)
+    return entry
+
+
+def _init_worker(art_dir: str) -> None:
+    # One scoring thread per process; the pool provides the parallelism
+    os.environ["OMP_NUM_THREADS"] = "1"
+    _worker_model(art_dir)
+
+
+def _warm(art_dir: str) -> int:
+    _worker_model(art_dir)
+    return os.getpid()
+
+
+def _score_shard(art_dir: str, x_name: str, p_name: str, n_rows: int, lo: int, hi: int) -> int:
+    """
+    Score rows [lo, hi) of the shared input matrix into the shared output.
+    """
+    x_shm, p_shm = SharedMemory(name=x_name), SharedMemory(name=p_name)
+    try:
+        X = np.ndarray((n_rows, _N_FEATURES), dtype=np.float64, buffer=x_shm.buf)
+        P = np.ndarray((n_rows,), dtype=np.float64, buffer=p_shm.buf)
+        # Rows are owned by this shard, so scaling them in place is safe
+        P[lo:hi] = _worker_model(art_dir).score(X[lo:hi])
+        del X, P
+    finally:
+        x_shm.close()
+        p_shm.close()
+    return hi - lo
+
+
+class ShardedScorer:
+    """
+    Pre-warmed process pool that scores large matrices in row shards.
+
+    Workers are spawned once at startup and load the default model in their
+    initializer (other models load on a worker's first shard for them). The
+    caller writes the filled feature matrix into a shared-memory block via
+    alloc(); each shard scores its row range in a worker and writes the
+    probabilities into a shared output block, so neither the features nor the
+    scores are pickled, and results land in the original row order.
+    """
+
+    def __init__(self, workers: int, default_dir: str):
+        self.workers = workers
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp.get_context("spawn"),  # no fork after OpenMP/LightGBM init
+            initializer=_init_worker,
+            initargs=(default_dir,),
+        )
+        self._default_dir = default_dir
+
+    def warm(self) -> List[int]:
+        """
+        Start every worker process now instead of on the first big upload.
+        """
+        futures = [self._pool.submit(_warm, self._default_dir) for _ in range(self.workers)]
+        return [f.result() for f in futures]
+
+    @staticmethod
+    def alloc(n_rows: int) -> Tuple[SharedMemory, np.ndarray]:
+        """
+        Shared (n_rows, 30) float64 block for the caller to fill in place.
+        """
+        shm = SharedMemory(create=True, size=max(1, n_rows * _N_FEATURES * 8))
+        return shm, np.ndarray((n_rows, _N_FEATURES), dtype=np.float64, buffer=shm.buf)
+
+    async def score(self, art_dir: str, x_shm: SharedMemory, n_rows: int) -> np.ndarray:
+        """
+        Score the n_rows matrix held in x_shm across the pool; returns probabilities.
+        """
+        p_shm = SharedMemory(create=True, size=max(1, n_rows * 8))
+        try:
+            step = math.ceil(n_rows / self.workers)
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                *[
+                    loop.run_in_executor(
+                        self._pool,
+                        _score_shard,
+                        art_dir,
+                        x_shm.name,
+                        p_shm.name,
+                        n_rows,
+                        lo,
+                        min(lo + step, n_rows),
+                    )
+                    for lo in range(0, n_rows, step)
+                ]
+            )
+            return np.ndarray((n_rows,), dtype=np.float64, buffer=p_shm.buf).copy()
+        finally:
+            p_shm.close()
+            p_shm.unlink()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
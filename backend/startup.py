@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+class StartupTimer:
+    """
+    Wall-clock timings of the named startup phases (imports, artifact loads,
+    warmup, background jobs), reported by GET /api/startup.
+
+    Phases may run on other threads (e.g. curve regeneration); each one is
+    recorded when it finishes, with its offset from process start.
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.ready_s: Optional[float] = None
+        self._phases: List[Dict[str, object]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self._phases.append(
+                    {
+                        "phase": name,
+                        "ms": round((end - start) * 1000, 2),
+                        "started_at_ms": round((start - self.t0) * 1000, 2),
+                        "thread": threading.current_thread().name,
+                        "error": error,
+                    }
+                )
+
+    def mark_ready(self) -> None:
+        self.ready_s = time.perf_counter() - self.t0
+
+    def report(self) -> Dict[str, object]:
+        with self._lock:
+            phases = list(self._phases)
+        return {
+            "ready": self.ready_s is not None,
+            "ready_ms": round(self.ready_s * 1000, 2) if self.ready_s is not None else None,
+            "phases": phases,
+        }
+
+    def summary(self) -> str:
+        rep = self.report()
+        parts = [f"{p['phase']}={p['ms']:.0f}ms" for p in rep["phases"]]
+        return f"ready in {rep['ready_ms']:.0f}ms ({', '.join(parts)})" if rep["ready"] else ", ".join(parts)
+
+
+# Created on first backend import, so offsets are close to process start
+STARTUP = StartupTimer()
@@ -0,0 +1,363 @@
+"""
+Low-overhead latency histograms and counters, exported as Prometheus text.
+
+Hot-path code wraps each stage in ``with TELEMETRY.stage("model.predict"):``
+(two perf_counter calls, a bisect and an uncontended lock) and bumps counters
+obtained once from ``TELEMETRY.counter(name, **labels)``. TelemetryMiddleware times whole requests by route and,
+when profiling is enabled, samples the stacks of a request sent with an
+``X-Profile: 1`` header.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Upper bounds (seconds) shared by every latency histogram
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+class Counter:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1) -> None:
+        with self._lock:
+            self.value += value
+
+
+class Gauge:
+    """
+    Current level of something (queue depth, tasks in flight).
+    """
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, value: float = 1) -> None:
+        with self._lock:
+            self.value += value
+
+    def dec(self, value: float = 1) -> None:
+        self.inc(-value)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram; quantiles are interpolated within a bucket.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def state(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c and seen + c >= rank:
+                lo = self.buckets[i - 1] if i > 0 else 0.0
+                hi = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lo + (hi - lo) * (rank - seen) / c
+            seen += c
+        return self.buckets[-1]
+
+
+class _StageTimer:
+    __slots__ = ("_hist", "_errors", "_t0")
+
+    def __init__(self, hist: Histogram, errors: Counter):
+        self._hist = hist
+        self._errors = errors
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._hist.observe(time.perf_counter() - self._t0)
+        if exc_type is not None:
+            self._errors.inc()
+        return False
+
+
+class Telemetry:
+    """
+    Process-wide registry of counters, gauges and histograms keyed by
+    (name, labels).
+    """
+
+    def __init__(self, prefix: str = "fraudsynth", max_profiles: int = 20):
+        self.prefix = prefix
+        self.max_profiles = max_profiles
+        self._counters: Dict[Tuple[str, Labels], Counter] = {}
+        self._gauges: Dict[Tuple[str, Labels], Gauge] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._stages: Dict[str, Tuple[Histogram, Counter]] = {}
+        self._profiles: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, **labels: str) -> Counter:
+        key = (name, tuple(sorted(labels.items())))
+        c = self._counters.get(key)
+        if c is None:
+            with self._lock:
+                c = self._counters.setdefault(key, Counter())
+        return c
+
+    def gauge(self, name: str, **labels: str) -> Gauge:
+        key = (name, tuple(sorted(labels.items())))
+        g = self._gauges.get(key)
+        if g is None:
+            with self._lock:
+                g = self._gauges.setdefault(key, Gauge())
+        return g
+
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        key = (name, tuple(sorted(labels.items())))
+        h = self._histograms.get(key)
+        if h is None:
+            with self._lock:
+                h = self._histograms.setdefault(key, Histogram())
+        return h
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        self.counter(name, **labels).inc(value)
+
+    def stage(self, name: str) -> _StageTimer:
+        """
+        Context manager timing one stage into stage_seconds{stage=name};
+        an exception escaping it also counts errors_total{stage=name}.
+        """
+        pair = self._stages.get(name)
+        if pair is None:
+            pair = self._stages[name] = (
+                self.histogram("stage_seconds", stage=name),
+                self.counter("errors_total", stage=name),
+            )
+        return _StageTimer(*pair)
+
+    def add_profile(self, profile_id: str, folded: str) -> None:
+        with self._lock:
+            self._profiles[profile_id] = folded
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get_profile(self, profile_id: str) -> Optional[str]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Counters, gauges and p50/p95/p99 of every histogram, as JSON-friendly
+        dicts.
+        """
+        with self._lock:
+            counter_items = list(self._counters.items())
+            gauge_items = list(self._gauges.items())
+            hist_items = list(self._histograms.items())
+        counters = [
+            {"name": n, "labels": dict(l), "value": c.value} for (n, l), c in counter_items
+        ]
+        gauges = [{"name": n, "labels": dict(l), "value": g.value} for (n, l), g in gauge_items]
+        hists = []
+        for (n, l), h in hist_items:
+            with h._lock:
+                quantiles = {f"p{int(q * 100)}": h.quantile(q) for q in (0.5, 0.95, 0.99)}
+                hists.append({"name": n, "labels": dict(l), "count": h.count, "sum": h.sum, **quantiles})
+        return {"counters": counters, "gauges": gauges, "histograms": hists}
+
+    def render_prometheus(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        lines: List[str] = []
+        with self._lock:
+            counters = sorted((k, c.value) for k, c in self._counters.items())
+            gauges = sorted((k, g.value) for k, g in self._gauges.items())
+            hist_items = sorted(self._histograms.items(), key=lambda kv: kv[0])
+        hists = [(k, (*h.state(), h.buckets)) for k, h in hist_items]
+
+        typed = set()
+        for (name, labels), value in counters:
+            full = f"{self.prefix}_{name}"
+            if full not in typed:
+                lines.append(f"# TYPE {full} counter")
+                typed.add(full)
+            lines.append(f"{full}{_fmt_labels(labels)} {_fmt_num(value)}")
+
+        for (name, labels), value in gauges:
+            full = f"{self.prefix}_{name}"
+            if full not in typed:
+                lines.append(f"# TYPE {full} gauge")
+                typed.add(full)
+            lines.append(f"{full}{_fmt_labels(labels)} {_fmt_num(value)}")
+
+        for (name, labels), (counts, total, count, buckets) in hists:
+            full = f"{self.prefix}_{name}"
+            if full not in typed:
+                lines.append(f"# TYPE {full} histogram")
+                typed.add(full)
+            cum = 0
+            for bound, c in zip(list(buckets) + ["+Inf"], counts):
+                cum += c
+                le = bound if isinstance(bound, str) else _fmt_num(bound)
+                lines.append(f"{full}_bucket{_fmt_labels(labels + (('le', le),))} {cum}")
+            lines.append(f"{full}_sum{_fmt_labels(labels)} {_fmt_num(total)}")
+            lines.append(f"{full}_count{_fmt_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _fmt_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    esc = [
+        (k, str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for k, v in labels
+    ]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in esc) + "}"
+
+
+def _fmt_num(v: float) -> str:
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+TELEMETRY = Telemetry()
+
+
+# -----------------------------------------------------------------------------
+# Opt-in sampling profiler
+# -----------------------------------------------------------------------------
+# Innermost frames in these files mean a thread is idle (waiting for work)
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py", "thread.py")
+
+
+class SamplingProfiler:
+    """
+    Samples every thread's Python stack each interval_s on a daemon thread and
+    counts identical stacks (folded "outer;...;inner count" lines, ready for
+    flamegraph tools). Idle threads are skipped.
+    """
+
+    def __init__(self, interval_s: float = 0.005):
+        self.interval_s = interval_s
+        self.samples: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def start(self) -> "SamplingProfiler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return self.folded()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            for tid, frame in sys._current_frames().items():
+                if tid == me or frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                self.samples[key] = self.samples.get(key, 0) + 1
+
+    def folded(self) -> str:
+        rows = sorted(self.samples.items(), key=lambda kv: -kv[1])
+        return "".join(f"{stack} {n}\n" for stack, n in rows)
+
+
+class TelemetryMiddleware:
+    """
+    ASGI middleware: request latency and count by route template and status.
+
+    With profiling enabled, a request carrying "X-Profile: 1" is sampled by a
+    SamplingProfiler; the response gets an X-Profile-Id header and the folded
+    stacks are kept by TELEMETRY for GET /metrics/profile/{id}.
+    """
+
+    def __init__(self, app, profiling: bool = False, interval_ms: float = 5.0):
+        self.app = app
+        self.profiling = profiling
+        self.interval_s = interval_ms / 1000.0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profiler = None
+        profile_id = None
+        if self.profiling and _header(scope, b"x-profile") in (b"1", b"true"):
+            profile_id = uuid.uuid4().hex[:12]
+            profiler = SamplingProfiler(self.interval_s).start()
+
+        status = {"code": 500}
+
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if profile_id is not None:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-profile-id", profile_id.encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            elapsed = time.perf_counter() - t0
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            TELEMETRY.histogram("request_seconds", method=scope["method"], route=route).observe(elapsed)
+            TELEMETRY.inc("requests_total", 1, method=scope["method"], route=route, status=str(status["code"]))
+            if profiler is not None:
+                TELEMETRY.add_profile(profile_id, profiler.stop())
+
+
+def _header(scope, name: bytes) -> Optional[bytes]:
+    for k, v in scope.get("headers", ()):
+        if k == name:
+            return v.strip().lower()
+    return None
@@ -0,0 +1,78 @@
+import os
+
+import pandas as pd
+
+from backend import inference
+from backend.artifact_cache import ArtifactCache
+
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_rebuilds_only_when_a_source_file_changes(tmp_path):
+    path = str(tmp_path / "a.csv")
+    _write(path, "x\n1\n")
+    cache, builds = ArtifactCache(), []
+
+    def build():
+        builds.append(1)
+        return open(path).read()
+
+    assert cache.get("k", [path], build) == "x\n1\n"
+    assert cache.get("k", [path], build) == "x\n1\n"
+    assert len(builds) == 1 and cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+    _write(path, "x\n1\n2\n")  # size changes
+    assert cache.get("k", [path], build) == "x\n1\n2\n"
+    assert len(builds) == 2
+
+
+def test_a_file_appearing_counts_as_a_change(tmp_path):
+    path = str(tmp_path / "late.csv")
+    cache = ArtifactCache()
+    assert cache.get("k", [path], lambda: "missing") == "missing"
+    assert cache.peek("k", [path]) == "missing"
+    _write(path, "x\n")
+    assert cache.peek("k", [path]) is None
+    assert cache.get("k", [path], lambda: "present") == "present"
+
+
+def test_least_recently_used_entries_are_dropped(tmp_path):
+    cache = ArtifactCache(max_entries=2)
+    for key in ("a", "b", "a", "c"):
+        cache.get(key, [], lambda key=key: key)
+    assert cache.peek("b", []) is None
+    assert cache.peek("a", []) == "a" and cache.peek("c", []) == "c"
+
+
+def test_refresh_drops_stale_or_all(tmp_path):
+    path = str(tmp_path / "a.csv")
+    _write(path, "1")
+    cache = ArtifactCache()
+    cache.get("file", [path], lambda: 1)
+    cache.get("other", [], lambda: 2)
+    assert cache.refresh() == 0
+    os.utime(path, ns=(0, 0))  # mtime changes
+    assert cache.refresh() == 1 and cache.peek("other", []) == 2
+    assert cache.refresh(force=True) == 1 and cache.stats()["entries"] == 0
+
+
+def test_curves_pick_up_edited_artifacts(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(inference, "_artifact_dir_for", lambda model: str(tmp_path))
+    fi = tmp_path / "feature_importance.csv"
+    pd.DataFrame({"feature": ["V14", "V4"], "importance": [5.0, 3.0]}).to_csv(fi, index=False)
+    assert client.get("/api/curves").json()["feature_importance"][0]["feature"] == "V14"
+    pd.DataFrame({"feature": ["V4", "V14"], "importance": [9.0, 3.0]}).to_csv(fi, index=False)
+    assert client.get("/api/curves").json()["feature_importance"][0]["feature"] == "V4"
+
+    fi.unlink()  # falls back to the model's own importances
+    feat = client.get("/api/curves").json()["feature_importance"]
+    expected = sorted(inference._model_importances(inference.MODEL), key=lambda r: -r["importance"])
+    assert len(feat) == 15 and feat[0] == expected[0]
+
+
+def test_refresh_endpoint(client):
+    client.get("/api/curves")
+    body = client.post("/api/refresh-artifacts", params={"force": 1}).json()
+    assert body["ok"] and body["dropped"] >= 1 and body["entries"] == 0
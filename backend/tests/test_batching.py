@@ -0,0 +1,82 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from backend import inference
+from backend.batching import MicroBatcher
+from backend.transforms import FEATURE_ORDER
+
+
+def _recording(calls, fn=lambda X: X[:, 0] * 10):
+    async def score(X):
+        calls.append(len(X))
+        return fn(X)
+
+    return score
+
+
+def _rows(n):
+    return [np.full((1, 3), float(i)) for i in range(n)]
+
+
+def test_a_full_batch_is_scored_in_one_call():
+    calls = []
+
+    async def main():
+        batcher = MicroBatcher(_recording(calls), max_rows=4, max_wait_ms=1000)
+        return batcher, await asyncio.gather(*(batcher.submit(x) for x in _rows(8)))
+
+    batcher, probs = asyncio.run(main())
+    assert calls == [4, 4]
+    assert probs == [10.0 * i for i in range(8)]  # each caller gets its own row back
+    stats = batcher.stats()
+    assert stats["batches"] == 2 and stats["rows"] == 8 and stats["max_batch_size"] == 4
+    assert stats["batch_size_hist"] == {"<=4": 2} and stats["pending"] == 0
+
+
+def test_a_partial_batch_waits_at_most_max_wait():
+    calls = []
+
+    async def main():
+        batcher = MicroBatcher(_recording(calls), max_rows=64, max_wait_ms=5)
+        first = await asyncio.gather(*(batcher.submit(x) for x in _rows(3)))
+        second = await batcher.submit(np.full((1, 3), 7.0))
+        return batcher, first, second
+
+    batcher, first, second = asyncio.run(main())
+    assert calls == [3, 1] and first == [0.0, 10.0, 20.0] and second == 70.0
+    assert batcher.stats()["max_queue_wait_ms"] >= 4.0
+
+
+def test_a_failed_batch_fails_every_caller():
+    async def boom(X):
+        raise ValueError("model down")
+
+    async def main():
+        batcher = MicroBatcher(boom, max_rows=2)
+        return await asyncio.gather(*(batcher.submit(x) for x in _rows(2)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_batched_scores_equal_single_row_scores():
+    entry = inference.DEFAULT_MODEL
+    rng = np.random.default_rng(0)
+    rows = [rng.normal(size=(1, len(FEATURE_ORDER))) for _ in range(10)]
+    expected = [float(entry.score(x.copy())[0]) for x in rows]
+
+    async def main():
+        batcher = MicroBatcher(_recording([], lambda X: entry.score(X.copy())), max_rows=10)
+        return await asyncio.gather(*(batcher.submit(x) for x in rows))
+
+    assert asyncio.run(main()) == pytest.approx(expected, abs=1e-12)
+
+
+def test_batching_stats_endpoint(client, monkeypatch):
+    monkeypatch.setattr(inference, "MICROBATCH_ENABLED", False)
+    assert client.get("/api/predict/batching").json() == {"enabled": False}
+    monkeypatch.setattr(inference, "MICROBATCH_ENABLED", True)
+    monkeypatch.setattr(inference.DEFAULT_MODEL, "batcher", None)
+    assert client.get("/api/predict/batching").json() == {"enabled": True, "batches": 0, "rows": 0}
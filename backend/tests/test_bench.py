@@ -0,0 +1,41 @@
+from backend import bench, inference
+
+
+def test_predict_case_scores_a_new_row_per_call(client):
+    cache = inference.PREDICTION_CACHE
+    hits, misses = cache.hits, cache.misses
+    out = bench.run(sizes=[20], repeat=1, client=client)
+    results = out["results"]
+    assert {"predict", "predict_cached", "predict_csv_20", "curves_cold"} <= set(results)
+    # predict: warmup + 10 timed rows, all distinct; predict_cached: the same 11 calls, all hits
+    assert cache.misses - misses == 11
+    assert cache.hits - hits == 11
+
+
+
+def _results(**medians):
+    return {"results": {case: {"median_ms": ms} for case, ms in medians.items()}}
+
+
+def test_compare_flags_only_cases_over_tolerance(capsys):
+    baseline = _results(predict=1.0, curves=10.0, gone=5.0)
+    current = _results(predict=1.2, curves=13.0, new_case=2.0)
+    assert bench.compare(current, baseline, tolerance=0.25) == ["curves"]
+    out = capsys.readouterr().out
+    assert "SLOWER" in out and "new" in out
+
+
+def test_synthetic_transactions_are_reproducible():
+    a = bench.synthetic_transactions(50, seed=3)
+    b = bench.synthetic_transactions(50, seed=3)
+    assert a.equals(b) and not a.equals(bench.synthetic_transactions(50, seed=4))
+    assert (a[["Time", "Amount"]] >= 0).all().all()
+
+
+def test_main_saves_and_compares_a_baseline(monkeypatch, tmp_path):
+    path = str(tmp_path / "baseline.json")
+    timings = [_results(predict=1.0), _results(predict=1.1), _results(predict=2.0)]
+    monkeypatch.setattr(bench, "run", lambda sizes, repeat, seed: timings.pop(0))
+    assert bench.main(["--sizes", "10", "--save", path]) == 0
+    assert bench.main(["--compare", path]) == 0
+    assert bench.main(["--compare", path, "--tolerance", "0.5"]) == 1
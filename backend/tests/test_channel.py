@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from backend import inference
+from backend.channel import CreditWindow, LineSplitter, ProtocolError, parse_frame
+from backend.transforms import FEATURE_ORDER
+
+ROWS = [dict(zip(FEATURE_ORDER, r)) for r in np.random.default_rng(0).normal(size=(600, 30)).tolist()]
+
+
+def _expected(rows):
+    X = np.array([[r[k] for k in FEATURE_ORDER] for r in rows], dtype=float)
+    return inference.DEFAULT_MODEL.score(X)
+
+
+# -- LineSplitter --------------------------------------------------------------
+def test_line_splitter_joins_lines_across_chunks():
+    lines = LineSplitter(100)
+    assert lines.feed(b'{"a":') == []
+    assert lines.feed(b'1}\n{"b":2}\n{"c"') == [b'{"a":1}', b'{"b":2}']
+    assert lines.close() == [b'{"c"']
+    assert lines.error is None
+
+
+def test_line_splitter_rejects_long_line_that_arrives_with_its_newline():
+    lines = LineSplitter(10)
+    assert lines.feed(b"short\n" + b"x" * 50 + b"\nafter\n") == [b"short"]
+    assert lines.error == "Line longer than 10 bytes."
+    assert lines.feed(b"more\n") == [] and lines.close() == []
+
+
+def test_line_splitter_rejects_long_pending_line():
+    lines = LineSplitter(10)
+    assert lines.feed(b"ok\n" + b"y" * 11) == [b"ok"]
+    assert lines.error is not None
+
+
+# -- CreditWindow ------------------------------------------------------------------
+def test_credit_window_accounting():
+    async def run():
+        credits = CreditWindow(window=5, max_batch=2, max_wait_ms=0)
+        credits.accept(parse_frame(b'[{"id":1},{"id":2},{"id":3}]'))
+        assert credits.in_flight == 3
+        with pytest.raises(ProtocolError):
+            credits.accept([(None, {})] * 3)  # 3 + 3 > 5
+        assert credits.in_flight == 3
+        credits.accept([(None, {})] * 2)  # exactly the window
+
+        batch = await credits.next_batch()
+        assert [i for i, _ in batch] == [1, 2]  # max_batch, in order
+        assert credits.in_flight == 5  # credit only comes back on release
+        credits.release(len(batch))
+        credits.accept([(None, {})] * 2)
+        assert credits.in_flight == 5
+
+        credits.close(discard=True)
+        assert await credits.next_batch() is None
+
+    asyncio.run(run())
+
+
+# -- WebSocket channel -------------------------------------------------------------
+def test_stream_scores_in_order_and_returns_credit(client):
+    with client.websocket_connect("/api/stream") as ws:
+        hello = ws.receive_json()
+        assert hello["type"] == "hello" and hello["credit"] == inference.CHANNEL_WINDOW
+        credit, sent, results = hello["credit"], 0, []
+        while len(results) < len(ROWS):
+            while sent < len(ROWS) and credit:
+                n = min(50, credit, len(ROWS) - sent)
+                ws.send_text(json.dumps([{"id": i, "input": ROWS[i]} for i in range(sent, sent + n)]))
+                sent, credit = sent + n, credit - n
+            msg = ws.receive_json()
+            assert msg["type"] == "scores" and msg["credit"] == len(msg["results"])
+            assert msg["credit"] <= hello["max_batch"]
+            credit += msg["credit"]
+            results += msg["results"]
+        assert credit == hello["credit"]
+    assert [r["id"] for r in results] == list(range(len(ROWS)))
+    assert np.allclose([r["probability"] for r in results], _expected(ROWS))
+
+
+def test_stream_closes_on_credit_overrun(client):
+    with client.websocket_connect("/api/stream") as ws:
+        window = ws.receive_json()["credit"]
+        ws.send_text(json.dumps([ROWS[0]] * (window + 1)))
+        msg = ws.receive_json()
+        assert msg["type"] == "error" and "Credit exceeded" in msg["detail"]
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+        assert closed.value.code == 1008
+
+
+# -- NDJSON over HTTP --------------------------------------------------------------
+def test_ndjson_results_in_order_with_per_line_errors(client):
+    body = "\n".join(
+        [json.dumps({"id": i, **ROWS[i]}) for i in range(3)] + ["not json", "[1]", json.dumps(ROWS[3])]
+    )
+    r = client.post("/api/predict/ndjson", content=body.encode())
+    assert r.status_code == 200 and r.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [line.get("id") for line in lines[:3]] == [0, 1, 2]
+    assert "error" in lines[3] and "error" in lines[4]
+    assert np.allclose([lines[i]["probability"] for i in (0, 1, 2, 5)], _expected(ROWS[:4]))
+
+
+def test_ndjson_rejects_long_line_followed_by_newline(client, monkeypatch):
+    monkeypatch.setattr(inference, "CHANNEL_MAX_LINE_BYTES", 2000)
+    ok = json.dumps(ROWS[0])
+    long_line = json.dumps({"id": "x" * 3000, **ROWS[1]})
+    body = f"{ok}\n{long_line}\n{ok}\n".encode()
+    lines = [json.loads(line) for line in client.post("/api/predict/ndjson", content=body).text.splitlines()]
+    assert len(lines) == 2
+    assert "probability" in lines[0]
+    assert lines[1] == {"error": "Line longer than 2000 bytes."}
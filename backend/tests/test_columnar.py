@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from backend.columnar import COLUMNAR_SUFFIX, convert_dir, read_columnar, read_table, write_columnar
+
+
+def _frame(n=50):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "Amount": rng.random(n),
+            "label": rng.integers(0, 2, n),
+            "name": [f"row{i}" for i in range(n)],
+            "V1": rng.normal(size=n).astype(np.float32),
+        }
+    )
+
+
+def test_round_trip_keeps_columns_and_dtypes(tmp_path):
+    base = str(tmp_path / "t")
+    df = _frame()
+    df.to_csv(base + ".csv", index=False)
+    assert write_columnar(base, df)
+    back = read_columnar(base)
+    pd.testing.assert_frame_equal(back, df, check_dtype=False)
+    assert list(back.columns) == list(df.columns)
+    assert back["V1"].dtype == np.float32 and back["label"].dtype == df["label"].dtype
+    assert not back["Amount"].to_numpy().flags.writeable  # memory-mapped, read-only
+
+
+def test_stale_copy_falls_back_to_the_csv(tmp_path):
+    base = str(tmp_path / "t")
+    df = _frame()
+    df.to_csv(base + ".csv", index=False)
+    write_columnar(base, df)
+    df.iloc[:10].to_csv(base + ".csv", index=False)
+    assert read_columnar(base) is None
+    assert len(read_table(base)) == 10
+
+
+def test_unstorable_columns_write_nothing(tmp_path):
+    base = str(tmp_path / "t")
+    assert not write_columnar(base, pd.DataFrame({"s": ["a", None]}))
+    assert not os.path.exists(base + COLUMNAR_SUFFIX)
+
+
+def test_rewrite_replaces_the_previous_copy(tmp_path):
+    base = str(tmp_path / "t")
+    df = _frame()
+    df.to_csv(base + ".csv", index=False)
+    write_columnar(base, df)
+    held = read_columnar(base)  # a reader still mapping the old blocks
+    df2 = df.assign(Amount=df["Amount"] * 2)
+    df2.to_csv(base + ".csv", index=False)
+    write_columnar(base, df2)
+    assert np.allclose(read_columnar(base)["Amount"], df2["Amount"])
+    assert np.allclose(held["Amount"], df["Amount"])
+    assert sorted(os.listdir(tmp_path)) == ["t.csv", "t" + COLUMNAR_SUFFIX]
+
+
+def test_convert_dir(tmp_path):
+    _frame().to_csv(tmp_path / "a.csv", index=False)
+    pd.DataFrame({"s": ["x", None]}).to_csv(tmp_path / "b.csv", index=False)
+    assert convert_dir(str(tmp_path)) == [str(tmp_path / "a")]
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import average_precision_score, precision_recall_curve, roc_auc_score, roc_curve
+
+from backend import inference
+from backend.curves import CurveCounts
+from backend.operating_points import ScoreIndex
+
+
+def _scored(n, seed):
+    rng = np.random.default_rng(seed)
+    y = (rng.random(n) < 0.05).astype(int)
+    p = np.clip(rng.normal(0.2 + 0.5 * y, 0.2), 0, 1).round(3)  # ties on purpose
+    return pd.DataFrame({"Amount": rng.random(n), "true_label": y, "fraud_probability": p})
+
+
+def _rebuild(art_dir, full=False):
+    return inference._compute_and_save_curves_and_importances(str(art_dir), inference.MODEL, full)
+
+
+def _artifacts(art_dir):
+    return {
+        name: pd.read_csv(art_dir / f"{name}.csv")
+        for name in ("roc_curve", "pr_curve", "threshold_sweep")
+    }
+
+
+def test_counts_match_sklearn():
+    df = _scored(5000, 0)
+    y, p = df["true_label"].to_numpy(), df["fraud_probability"].to_numpy()
+    counts = CurveCounts.from_labels(y, p)
+    fpr, tpr, _ = counts.roc()
+    precision, recall, _ = counts.pr()
+    sk_fpr, sk_tpr, _ = roc_curve(y, p)
+    sk_p, sk_r, _ = precision_recall_curve(y, p)
+    assert np.allclose(fpr, sk_fpr) and np.allclose(tpr, sk_tpr)
+    assert np.allclose(precision, sk_p) and np.allclose(recall, sk_r)
+    assert counts.average_precision() == pytest.approx(average_precision_score(y, p), abs=1e-12)
+    assert counts.roc_auc() == pytest.approx(roc_auc_score(y, p), abs=1e-12)
+
+
+def test_merge_equals_counting_everything():
+    df = _scored(3000, 1)
+    y, p = df["true_label"].to_numpy(), df["fraud_probability"].to_numpy()
+    merged = CurveCounts.from_labels(y[:1000], p[:1000]).merge(CurveCounts.from_labels(y[1000:], p[1000:]))
+    whole = CurveCounts.from_labels(y, p)
+    assert np.array_equal(merged.scores, whole.scores)
+    assert np.array_equal(merged.pos, whole.pos) and np.array_equal(merged.neg, whole.neg)
+
+
+def test_incremental_rebuild_equals_full_rebuild(tmp_path):
+    csv = tmp_path / "test_scored.csv"
+    _scored(4000, 2).to_csv(csv, index=False)
+    assert _rebuild(tmp_path)["build"]["mode"] == "full"
+    assert _rebuild(tmp_path)["build"] == {"mode": "unchanged", "rows": 4000, "added": 0}
+
+    with open(csv, "a") as f:
+        f.write(_scored(500, 3).to_csv(index=False, header=False))
+    out = _rebuild(tmp_path)
+    assert out["build"] == {"mode": "incremental", "rows": 4500, "added": 500}
+    incremental = _artifacts(tmp_path)
+
+    full = _rebuild(tmp_path, full=True)
+    assert full["build"]["mode"] == "full"
+    assert out["roc"]["auc"] == pytest.approx(full["roc"]["auc"], abs=1e-12)
+    assert out["pr"]["ap"] == pytest.approx(full["pr"]["ap"], abs=1e-12)
+    for name, df in _artifacts(tmp_path).items():
+        pd.testing.assert_frame_equal(incremental[name], df)
+
+
+def test_edited_rows_force_a_full_rebuild(tmp_path):
+    csv = tmp_path / "test_scored.csv"
+    df = _scored(1000, 4)
+    df.to_csv(csv, index=False)
+    _rebuild(tmp_path)
+    df.iloc[:600].to_csv(csv, index=False)  # rewritten, not appended
+    assert _rebuild(tmp_path)["build"] == {"mode": "full", "rows": 600, "added": 600}
+
+
+def test_partial_trailing_row_waits_for_its_newline(tmp_path):
+    csv = tmp_path / "test_scored.csv"
+    _scored(100, 5).to_csv(csv, index=False)
+    _rebuild(tmp_path)
+    with open(csv, "a") as f:
+        f.write("0.5,1,0.9\n0.1,0")
+    assert _rebuild(tmp_path)["build"]["added"] == 1
+    with open(csv, "a") as f:
+        f.write(",0.2\n")
+    assert _rebuild(tmp_path)["build"] == {"mode": "incremental", "rows": 102, "added": 1}
+
+
+def test_sweep_is_the_operating_points_index():
+    df = _scored(2000, 6)
+    y, p = df["true_label"].to_numpy(), df["fraud_probability"].to_numpy()
+    grid = np.linspace(0, 1, 101)
+    sweep = CurveCounts.from_labels(y, p).sweep(grid)
+    points = pd.DataFrame(ScoreIndex(y, p).query(grid))
+    assert np.allclose(sweep["threshold"], points["threshold"])
+    for col, key in (("true_pos", "tp"), ("false_pos", "fp"), ("false_neg", "fn")):
+        assert (sweep[col].to_numpy() == points[key].to_numpy()).all()
+    assert np.allclose(sweep["recall"], points["recall"])
+    assert np.allclose(sweep["precision"], points["precision"].astype(float), equal_nan=True)
+    flagged = p[:, None] >= grid
+    assert (sweep["true_pos"].to_numpy() == (flagged & (y[:, None] == 1)).sum(axis=0)).all()
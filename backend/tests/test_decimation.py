@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from backend import inference
+from backend.decimation import decimate_curve, lttb_indices
+
+
+def test_keeps_endpoints_and_order():
+    x = np.linspace(0, 1, 1000)
+    y = np.sqrt(x)
+    idx = lttb_indices(x, y, 50)
+    assert len(idx) == 50 and idx[0] == 0 and idx[-1] == 999
+    assert (np.diff(idx) > 0).all()
+
+
+def test_preserves_a_spike():
+    x = np.arange(500, dtype=float)
+    y = np.zeros(500)
+    y[123] = 10.0
+    assert 123 in lttb_indices(x, y, 20)
+
+
+def test_short_curves_are_untouched():
+    x, y = [0.0, 0.5, 1.0], [0.0, 0.8, 1.0]
+    assert decimate_curve(x, y, None) == (x, y)
+    assert decimate_curve(x, y, 10) == (x, y)
+    assert list(lttb_indices(np.arange(5), np.arange(5), 2)) == [0, 1, 2, 3, 4]
+
+
+def test_curves_endpoint_decimates_but_keeps_full_auc(client, monkeypatch, tmp_path):
+    fpr = np.linspace(0, 1, 2000)
+    pd.DataFrame({"fpr": fpr, "tpr": fpr ** 0.25, "auc": 0.8}).to_csv(tmp_path / "roc_curve.csv", index=False)
+    pd.DataFrame({"recall": fpr[::-1], "precision": 1 - fpr / 2}).to_csv(tmp_path / "pr_curve.csv", index=False)
+    monkeypatch.setattr(inference, "_artifact_dir_for", lambda model: str(tmp_path))
+
+    full = client.get("/api/curves").json()
+    small = client.get("/api/curves", params={"max_points": 100}).json()
+    assert len(full["roc"]["fpr"]) == 2000
+    assert len(small["roc"]["fpr"]) == len(small["roc"]["tpr"]) == 100
+    assert len(small["pr"]["recall"]) == 100
+    assert small["roc"]["auc"] == full["roc"]["auc"]
+    assert small["roc"]["fpr"][0] == 0.0 and small["roc"]["fpr"][-1] == 1.0
+    assert client.get("/api/curves", params={"max_points": 2}).status_code == 422
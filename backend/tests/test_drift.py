@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from backend.drift import DriftMonitor, FeatureSketch, psi
+
+NAMES = ["a", "b", "c"]
+
+
+def _monitor(**kwargs):
+    return DriftMonitor(NAMES, np.zeros(3), np.ones(3), **kwargs)
+
+
+def _report(monitor):
+    return monitor.report(min_rows=500, mean_z=0.5, std_ratio=2.0, fill_rate=0.05, psi_limit=0.2)
+
+
+def test_psi():
+    ref = np.array([10, 20, 40, 20, 10])
+    assert psi(ref, ref * 3) == pytest.approx(0.0)
+    assert psi(ref, ref[::-1] + np.array([0, 0, 0, 30, 60])) > 0.2
+    assert psi(ref, np.zeros(5)) is None
+
+
+def test_sketch_merge_matches_one_pass():
+    rng = np.random.default_rng(0)
+    X = rng.normal(5.0, 2.0, size=(3000, 3))
+    X[::50, 1] = np.nan
+    whole, left, right = FeatureSketch(3), FeatureSketch(3), FeatureSketch(3)
+    whole.update(X)
+    left.update(X[:1000])
+    right.update(X[1000:])
+    left.merge(right)
+    assert np.allclose(left.mean, whole.mean) and np.allclose(left.std(), whole.std())
+    assert (left.buckets == whole.buckets).all() and (left.nan == whole.nan).all()
+    assert np.allclose(whole.mean, np.nanmean(X, axis=0))
+    assert np.allclose(whole.std(), np.nanstd(X, axis=0, ddof=1))
+    median = whole.quantiles([0.5])[:, 0]
+    assert np.allclose(median, np.nanmedian(X, axis=0), rtol=0.02)
+
+
+def test_in_distribution_traffic_is_ok():
+    monitor = _monitor(ref_scores=np.linspace(0, 1, 1000))
+    rng = np.random.default_rng(1)
+    monitor.observe_features(rng.normal(size=(1000, 3)), np.zeros(3))
+    monitor.observe_scores(rng.uniform(size=1000), 0.5)
+    report = _report(monitor)
+    assert report["status"] == "ok" and report["drifted_features"] == []
+    assert report["score"]["psi"] < 0.05
+
+
+def test_shifted_sample_is_flagged():
+    monitor = _monitor(ref_scores=np.linspace(0, 1, 1000))
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(1000, 3))
+    X[:, 1] += 2.0  # mean shift in "b"
+    X[:, 2] *= 5.0  # spread change in "c"
+    monitor.observe_features(X, np.array([200, 0, 0]))  # "a" mostly median-filled
+    monitor.observe_scores(np.full(1000, 0.95), 0.5)
+    report = _report(monitor)
+    assert report["status"] == "drift"
+    flags = {f["feature"]: f["flags"] for f in report["features"]}
+    assert flags == {"a": ["fill_rate"], "b": ["mean_shift"], "c": ["std_ratio"]}
+    assert report["score"]["flags"] == ["psi"] and report["score"]["alert_rate"] == 1.0
+
+
+def test_too_few_rows_are_not_judged():
+    monitor = _monitor()
+    monitor.observe_features(np.full((10, 3), 100.0))
+    report = _report(monitor)
+    assert report["status"] == "insufficient_data" and report["drifted_features"] == []
+
+
+def test_single_rows_are_buffered_and_reset():
+    monitor = _monitor(row_block=4)
+    for i in range(3):
+        monitor.observe_row(np.array([i, i, i], dtype=float), 0.9, 0.5, np.zeros(3, dtype=np.int64))
+    assert monitor.features.rows == 0  # still buffered
+    report = _report(monitor)  # reads flush the buffer
+    assert report["rows"] == 3 and report["score"]["count"] == 3
+    monitor.reset()
+    assert _report(monitor)["rows"] == 0
+
+
+def test_fraud_reference_is_reported_but_not_judged():
+    monitor = _monitor(fraud_mean=np.array([np.nan, -7.0, np.nan]), fraud_std=np.array([np.nan, 4.3, np.nan]))
+    monitor.observe_features(np.random.default_rng(3).normal(size=(1000, 3)))
+    report = _report(monitor)
+    a, b, _ = report["features"]
+    assert "fraud_ref_mean" not in a
+    assert b["fraud_ref_mean"] == -7.0 and b["fraud_ref_std"] == 4.3 and b["flags"] == []
+
+
+def test_drift_endpoint_uses_the_training_references(client):
+    body = client.get("/api/drift").json()
+    assert body["enabled"]
+    features = {f["feature"]: f for f in body["features"]}
+    assert set(features) >= {"Time", "V14", "Amount"}
+    assert features["V14"]["fraud_ref_mean"] == pytest.approx(-7.0, abs=0.1)
+    assert features["Amount"]["fraud_ref_mean"] > features["Amount"]["ref_mean"]
+    assert "fraud_ref_mean" not in features["V2"]
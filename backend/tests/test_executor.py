@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from backend import inference
+from backend.executor import CpuExecutor, OverloadedError
+
+
+def _row(seed):
+    rng = np.random.default_rng(seed)
+    return {"Time": float(rng.integers(1, 10**6)), "Amount": float(rng.uniform(1, 500))}
+
+
+def test_full_queue_rejects_new_work_but_not_follow_ups():
+    async def main():
+        cpu = CpuExecutor(workers=1, max_queued=1)
+        gate = threading.Event()
+        running = asyncio.ensure_future(cpu.run(gate.wait))
+        queued = asyncio.ensure_future(cpu.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(OverloadedError):
+            await cpu.run(lambda: "rejected")
+        follow_up = asyncio.ensure_future(cpu.run(lambda: "admitted", admit=False))
+        gate.set()
+        results = await asyncio.gather(running, queued, follow_up)
+        stats = cpu.stats()
+        cpu.shutdown()
+        return results, stats
+
+    results, stats = asyncio.run(main())
+    assert results == [True, "queued", "admitted"]
+    assert stats["rejected"] == 1 and stats["completed"] == 3
+
+
+def _record_threads(monkeypatch, name):
+    seen = []
+    fn = getattr(inference, name)
+
+    def wrapped(*args, **kwargs):
+        seen.append(threading.current_thread().name)
+        return fn(*args, **kwargs)
+
+    monkeypatch.setattr(inference, name, wrapped)
+    return seen
+
+
+def test_predict_scores_and_explains_on_the_executor(client, monkeypatch):
+    scores = _record_threads(monkeypatch, "_score_matrix")
+    explains = _record_threads(monkeypatch, "_explain_matrix")
+    r = client.post("/api/predict", json={"input": _row(1)}, params={"explain": "top_k"})
+    assert r.status_code == 200, r.text
+    assert scores and all(t.startswith("cpu") for t in scores)
+    assert explains and all(t.startswith("cpu") for t in explains)
+
+
+def test_predict_is_rejected_when_the_executor_is_full(client, monkeypatch):
+    cpu = inference.CPU
+    monkeypatch.setattr(cpu, "_pending", cpu.workers + cpu.max_queued)
+    r = client.post("/api/predict", json={"input": _row(2)})
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == str(cpu.retry_after_s)
+
+
+def test_micro_batches_are_scored_on_the_executor(client, monkeypatch):
+    monkeypatch.setattr(inference, "MICROBATCH_ENABLED", True)
+    monkeypatch.setattr(inference.DEFAULT_MODEL, "batcher", None)
+    scores = _record_threads(monkeypatch, "_score_matrix")
+    r = client.post("/api/predict", json={"input": _row(3)})
+    assert r.status_code == 200, r.text
+    assert scores and all(t.startswith("cpu") for t in scores)
+    assert inference.DEFAULT_MODEL.batcher.stats()["rows"] == 1
+
+    cpu = inference.CPU
+    monkeypatch.setattr(cpu, "_pending", cpu.workers + cpu.max_queued)
+    assert client.post("/api/predict", json={"input": _row(4)}).status_code == 503
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from backend import inference
+from backend.explain import ExplainBudget, top_reasons
+from backend.transforms import FEATURE_ORDER
+
+
+def test_top_reasons_are_the_largest_contributions_in_order():
+    contrib = np.array([[0.1, -2.0, 0.7, 0.3, 9.0], [-1.0, 0.5, 0.4, 0.6, 0.0]])
+    idx, vals = top_reasons(contrib, 2)  # last column is the bias
+    assert idx.tolist() == [[2, 3], [3, 1]]
+    assert vals.tolist() == [[0.7, 0.3], [0.6, 0.5]]
+
+
+def test_budget_bounds_rows():
+    budget = ExplainBudget(max_rows=100, multiple=1.0)
+    budget.row_cost_s = 0.001
+    assert budget.rows(1000, spent_s=0.05) == 50  # time budget
+    assert budget.rows(1000, spent_s=10.0) == 100  # max_rows
+    assert budget.rows(20, spent_s=10.0) == 20  # all rows
+    assert budget.rows(1000, spent_s=0.0) == 1  # the riskiest row always
+
+
+def test_budget_learns_row_cost():
+    budget = ExplainBudget(max_rows=100, multiple=1.0, alpha=0.5)
+    budget.row_cost_s = 0.001
+    budget.observe(rows=10, seconds=0.03)  # 3 ms per row observed
+    assert budget.row_cost_s == 0.002
+
+
+def test_predict_reasons_sum_to_the_score(client):
+    row = {k: 0.5 for k in FEATURE_ORDER}
+    row["V14"], row["V4"] = -8.0, 5.0
+    r = client.post("/api/predict", json={"input": row}, params={"explain": "top_k", "top_k": 4})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    X = np.array([[row[k] for k in FEATURE_ORDER]], dtype=float)
+    contrib = inference.DEFAULT_MODEL.contributions(X.copy())
+    assert np.isclose(1 / (1 + np.exp(-contrib.sum())), body["probability"])
+    expected = [FEATURE_ORDER[i] for i in np.argsort(-contrib[0, :-1])[:4]]
+    assert [reason["feature"] for reason in body["reasons"]] == expected
+    assert client.post("/api/predict", json={"input": row}, params={"explain": "shap"}).status_code == 400
+
+
+def test_predict_csv_explains_the_riskiest_rows_within_budget(client, monkeypatch):
+    monkeypatch.setattr(inference.EXPLAIN, "max_rows", 25)
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(300, len(FEATURE_ORDER))), columns=FEATURE_ORDER)
+    df["V14"] *= 4
+    r = client.post(
+        "/api/predict-csv",
+        files={"file": ("a.csv", df.to_csv(index=False).encode())},
+        params={"fields": "scores", "explain": "top_k", "top_k": 2},
+    )
+    assert r.status_code == 200, r.text
+    rows = r.json()["rows"]
+    explained = int(r.headers["x-explained-rows"])
+    has = np.array([row["reason_1"] is not None for row in rows])
+    probs = np.array([row["fraud_probability"] for row in rows])
+    assert 1 <= explained <= 25 and has.sum() == explained
+    if explained < len(rows):
+        assert probs[has].min() >= probs[~has].max()
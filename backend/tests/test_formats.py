@@ -0,0 +1,72 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import formats
+from backend.formats import negotiate
+from backend.transforms import FEATURE_ORDER
+
+
+@pytest.mark.parametrize(
+    "accept, fmt",
+    [
+        (None, "json"),
+        ("", "json"),
+        ("*/*", "json"),
+        ("text/csv", "csv"),
+        ("application/vnd.apache.arrow.stream", "arrow"),
+        ("application/json, text/csv;q=0.1", "json"),
+        ("text/csv;q=0.9, application/json;q=0.8", "csv"),
+        ("text/csv;q=0", "json"),
+        ("*/*, text/csv;q=0", "json"),
+        ("text/*;q=0.5, application/json;q=0.4", "csv"),
+        ("text/csv, application/json", "csv"),  # equal q: first listed
+        ("Text/CSV; Q=1", "csv"),
+        ("text/csv;q=abc", "json"),
+        ("text/html, image/png", "json"),
+    ],
+)
+def test_negotiate(accept, fmt):
+    assert negotiate(accept) == fmt
+
+
+def _upload(n=30):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.normal(size=(n, len(FEATURE_ORDER))), columns=FEATURE_ORDER).to_csv(index=False).encode()
+
+
+def _post(client, accept, **params):
+    return client.post(
+        "/api/predict-csv", files={"file": ("a.csv", _upload())}, headers={"Accept": accept}, params=params
+    )
+
+
+def test_csv_and_json_bodies_agree(client):
+    as_json = _post(client, "application/json, text/csv;q=0.1")
+    assert as_json.headers["content-type"].startswith("application/json")
+    as_csv = _post(client, "text/csv")
+    assert as_csv.headers["content-type"].startswith("text/csv")
+    rows = pd.read_csv(io.StringIO(as_csv.text))
+    assert len(rows) == len(as_json.json()["rows"]) == 30
+    expected = [r["fraud_probability"] for r in as_json.json()["rows"]]
+    assert np.allclose(rows["fraud_probability"], expected)
+
+
+def test_columnar_layout(client):
+    records = _post(client, "application/json").json()
+    columnar = _post(client, "application/json", layout="columnar").json()
+    assert columnar["columns"] == records["columns"] and columnar["n_rows"] == 30
+    assert np.allclose(
+        columnar["data"]["fraud_probability"], [r["fraud_probability"] for r in records["rows"]]
+    )
+
+
+def test_json_encoders_agree(monkeypatch):
+    df = pd.DataFrame({"p": [0.25, np.nan], "d": [1, 0], "s": ["a", None]})
+    fast = json.loads(formats.json_body(df, 0.5, layout="columnar"))
+    monkeypatch.setattr(formats, "orjson", None)
+    assert json.loads(formats.json_body(df, 0.5, layout="columnar")) == fast
+    assert fast["data"] == {"p": [0.25, None], "d": [1, 0], "s": ["a", None]}
@@ -0,0 +1,50 @@
+import io
+
+import numpy as np
+
+from backend import inference
+from backend.ingest import read_upload, sniff
+from backend.transforms import FEATURE_ORDER
+
+
+def test_sniff_header_without_feature_names():
+    sep, fields, has_header = sniff(b"id,foo\n1,2\n3,4\n")
+    assert (sep, fields, has_header) == (",", ["id", "foo"], True)
+
+
+def test_sniff_numeric_first_line_is_data():
+    assert sniff(b"1,2,,3\n4,5,6,7\n") == (",", ["1", "2", "", "3"], False)
+    assert sniff(b"0.5;-1e3\n")[2] is False
+
+
+def test_read_upload_keeps_non_feature_header():
+    df = read_upload(io.BytesIO(b"id,foo\n1,2\n3,4\n"))
+    assert list(df.columns) == ["id", "foo"]
+    assert df["id"].tolist() == ["1", "3"]
+
+
+def test_read_upload_headerless_maps_by_position():
+    df = read_upload(io.BytesIO(b"1,2\n3,4\n"))
+    assert list(df.columns) == FEATURE_ORDER[:2]
+    assert df["Time"].tolist() == [1.0, 3.0]
+
+
+def test_predict_csv_non_feature_header_is_median_filled(client):
+    r = client.post(
+        "/api/predict-csv", files={"file": ("a.csv", b"id,foo\n1,2\n3,4\n")}
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["columns"] == ["id", "foo", "fraud_probability", "model_decision"]
+    assert [row["id"] for row in body["rows"]] == ["1", "3"]
+    median = inference.DEFAULT_MODEL.bundle.median_vec
+    expected = inference.DEFAULT_MODEL.score(np.array([median]))[0]
+    assert np.allclose([row["fraud_probability"] for row in body["rows"]], expected)
+
+
+def test_predict_csv_headerless_upload(client):
+    r = client.post("/api/predict-csv", files={"file": ("a.csv", b"10,0.5\n20,-0.5\n")})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["columns"][:2] == ["Time", "V1"]
+    assert [row["Time"] for row in body["rows"]] == [10.0, 20.0]
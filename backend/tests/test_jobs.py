@@ -0,0 +1,113 @@
+import io
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import inference
+from backend.jobs import JobManager, QueueFullError
+from backend.transforms import FEATURE_ORDER
+
+
+def _csv(n):
+    rng = np.random.default_rng(n)
+    return pd.DataFrame(rng.normal(size=(n, len(FEATURE_ORDER))), columns=FEATURE_ORDER).to_csv(index=False).encode()
+
+
+def _wait(jobs, job_id, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = jobs.get(job_id)
+        if job is None or job.finished_at is not None:
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def _double(chunk):
+    return chunk.assign(score=chunk["Amount"] * 2)
+
+
+def test_job_scores_in_chunks_and_publishes_atomically(tmp_path):
+    jobs = JobManager(str(tmp_path), chunk_rows=7)
+    job = _wait(jobs, jobs.submit(io.BytesIO(_csv(20)), _double, model=None).id)
+    assert job.status == "done" and job.rows_scored == 20
+    out = pd.read_csv(job.output_path)
+    assert len(out) == 20 and np.allclose(out["score"], out["Amount"] * 2)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"{job.id}.csv"]  # input spool removed
+
+
+def test_failed_job_keeps_no_partial_output(tmp_path):
+    jobs = JobManager(str(tmp_path), chunk_rows=5)
+
+    calls = []
+
+    def fail_late(chunk):
+        calls.append(len(chunk))
+        if len(calls) > 1:
+            raise ValueError("bad chunk")
+        return chunk
+
+    job = _wait(jobs, jobs.submit(io.BytesIO(_csv(20)), fail_late).id)
+    assert job.status == "failed" and job.error == "bad chunk"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_finished_jobs_expire_after_ttl(tmp_path):
+    jobs = JobManager(str(tmp_path), chunk_rows=100, ttl=60.0)
+    job = _wait(jobs, jobs.submit(io.BytesIO(_csv(5)), _double).id)
+    assert job.to_dict(jobs.ttl)["expires_at"] == pytest.approx(job.finished_at + 60.0)
+    assert jobs.expire() == []
+    job.finished_at -= 61.0
+    assert jobs.get(job.id) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_queue_limit(tmp_path):
+    release = threading.Event()
+    jobs = JobManager(str(tmp_path), chunk_rows=100, max_concurrent=1, max_queued=1)
+
+    def blocked(chunk):
+        release.wait(5)
+        return chunk
+
+    first = jobs.submit(io.BytesIO(_csv(3)), blocked)
+    while jobs.get(first.id).status == "queued":
+        time.sleep(0.01)
+    jobs.submit(io.BytesIO(_csv(3)), blocked)  # waits behind the running one
+    with pytest.raises(QueueFullError):
+        jobs.submit(io.BytesIO(_csv(3)), blocked)
+    release.set()
+
+
+def test_job_endpoints_feed_drift_and_top_risks(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(inference, "JOBS", JobManager(str(tmp_path), chunk_rows=40))
+    tracked = []
+    track = inference._track_risks
+    monkeypatch.setattr(
+        inference, "_track_risks", lambda model, scored, bundle: tracked.append(len(scored)) or track(model, scored, bundle)
+    )
+    drift = inference._drift_for(inference.DEFAULT_MODEL)
+    rows_before = drift.report(1, 1, 1, 1, 1)["rows"]
+
+    r = client.post("/api/jobs", files={"file": ("a.csv", _csv(100))})
+    assert r.status_code == 202, r.text
+    job_id = r.json()["job_id"]
+    _wait(inference.JOBS, job_id)
+    status = client.get(f"/api/jobs/{job_id}").json()
+    assert status["status"] == "done" and status["rows_scored"] == 100
+    assert tracked == [40, 40, 20]
+    assert drift.report(1, 1, 1, 1, 1)["rows"] == rows_before + 100
+
+    result = pd.read_csv(io.StringIO(client.get(f"/api/jobs/{job_id}/result").text))
+    assert {"fraud_probability", "model_decision"} <= set(result.columns) and len(result) == 100
+    assert client.delete(f"/api/jobs/{job_id}").json() == {"deleted": job_id}
+    assert client.get(f"/api/jobs/{job_id}").status_code == 404
+
+
+def test_full_job_queue_is_a_503(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(inference, "JOBS", JobManager(str(tmp_path), chunk_rows=40, max_queued=0))
+    r = client.post("/api/jobs", files={"file": ("a.csv", _csv(10))})
+    assert r.status_code == 503 and "queue full" in r.json()["detail"]
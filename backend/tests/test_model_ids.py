@@ -0,0 +1,24 @@
+import pytest
+
+from backend import inference
+
+
+@pytest.mark.parametrize(
+    "model", ["CTGAN/.", "CTGAN/./.", "..", "../model_artifacts", "CTGAN\n", "a b", "x%00"]
+)
+def test_unsafe_model_ids_are_rejected(client, model):
+    trackers = set(inference.TOP_RISKS._trackers)
+    models = set(inference.REGISTRY._entries)
+    for path in ("/api/top-risks", "/api/curves", "/api/metrics"):
+        r = client.get(path, params={"model": model})
+        assert r.status_code == 400, (path, r.text)
+    r = client.post("/api/predict", json={"input": {"Amount": 1.0}}, params={"model": model})
+    assert r.status_code == 400
+    assert set(inference.TOP_RISKS._trackers) == trackers
+    assert set(inference.REGISTRY._entries) == models
+
+
+def test_plain_model_ids_still_resolve(client):
+    assert client.get("/api/top-risks", params={"model": "CTGAN"}).status_code == 200
+    assert inference._artifact_dir_for("CTGAN").endswith("model_artifacts_CTGAN")
+    assert inference._artifact_dir_for("no_such-model") == inference.ARTIFACT_DIR
@@ -0,0 +1,81 @@
+import copy
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+from backend import inference
+from backend.transforms import FEATURE_ORDER
+
+
+def _upload(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n, len(FEATURE_ORDER))), columns=FEATURE_ORDER)
+    df["V14"] *= 4  # spread the scores around the threshold
+    return df.to_csv(index=False).encode()
+
+
+def _post(client, data, params, form=None):
+    return client.post("/api/predict-csv", files={"file": ("a.csv", data)}, params=params, data=form or {})
+
+
+def test_models_match_single_model_runs(client):
+    data = _upload()
+    single = _post(client, data, {"fields": "scores"}).json()
+    multi = _post(client, data, {"models": "default,CTGAN", "fields": "scores"})
+    assert multi.status_code == 200, multi.text
+    body = multi.json()
+    assert body["columns"] == [
+        "fraud_probability_default",
+        "model_decision_default",
+        "fraud_probability_CTGAN",
+        "model_decision_CTGAN",
+        "disagreement",
+    ]
+    expected = [row["fraud_probability"] for row in single["rows"]]
+    for name in ("default", "CTGAN"):
+        assert np.allclose([row[f"fraud_probability_{name}"] for row in body["rows"]], expected)
+
+    comparison = body["comparison"]
+    # CTGAN has no model file of its own here, so both names share one model call
+    assert comparison["shared"] == {"fills": 1, "scalings": 1, "model_calls": 1}
+    assert comparison["disagreements"] == 0
+    assert json.loads(multi.headers["x-model-comparison"])["pairs"] == comparison["pairs"]
+
+
+def test_disagreement_counts(client):
+    data = _upload(seed=1)
+    body = _post(client, data, [("models", "default"), ("models", "CTGAN")], {"threshold": "0.3"}).json()
+    rows = body["rows"]
+    alerts = sum(row["model_decision_default"] for row in rows)
+    assert alerts == sum(row["fraud_probability_default"] >= 0.3 for row in rows)
+    assert [m["alerts"] for m in body["comparison"]["models"]] == [alerts, alerts]
+    assert body["comparison"]["pairs"][0]["disagreements"] == sum(row["disagreement"] for row in rows)
+
+
+def test_models_rejects_bad_combinations(client):
+    data = _upload(n=5)
+    assert _post(client, data, {"models": "default", "model": "CTGAN"}).status_code == 400
+    assert _post(client, data, {"models": "default", "explain": "top_k"}).status_code == 400
+    too_many = ",".join(f"m{i}" for i in range(50))
+    assert _post(client, data, {"models": too_many}).status_code == 400
+    assert _post(client, data, {"models": "default,CTGAN/."}).status_code == 400
+
+
+def test_models_with_different_thresholds_disagree(monkeypatch):
+    monkeypatch.setattr(inference, "_drift_for", lambda entry: None)
+    strict = inference.DEFAULT_MODEL
+    lenient = copy.copy(strict)
+    lenient.key, lenient.threshold = "lenient", 0.05
+    df = pd.read_csv(io.BytesIO(_upload(seed=2)))
+
+    comparison = inference._score_models_frame(df, ["strict", "lenient"], [strict, lenient], None)
+    p = df["fraud_probability_strict"].to_numpy()
+    assert np.array_equal(p, df["fraud_probability_lenient"].to_numpy())
+    expected = int(((p >= 0.05) & (p < strict.threshold)).sum())
+    assert expected > 0
+    assert comparison["disagreements"] == expected == int(df["disagreement"].sum())
+    pair = comparison["pairs"][0]
+    assert (pair["a_only"], pair["b_only"]) == (0, expected)
+    assert comparison["shared"] == {"fills": 1, "scalings": 1, "model_calls": 2}
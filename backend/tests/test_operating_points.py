@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import inference
+from backend.operating_points import ScoreIndex
+
+
+def _brute(y, p, t):
+    flagged = p >= t
+    tp = int((flagged & (y == 1)).sum())
+    fp = int((flagged & (y == 0)).sum())
+    return tp, fp, int((y == 1).sum()) - tp, int((y == 0).sum()) - fp
+
+
+def test_query_matches_counting_every_row():
+    rng = np.random.default_rng(0)
+    y = (rng.random(3000) < 0.1).astype(int)
+    p = rng.random(3000).round(2)  # ties on purpose
+    index = ScoreIndex(y, p)
+    assert (index.n, index.positives) == (3000, int(y.sum()))
+    for point in index.query([0.0, 0.01, 0.5, p.max(), 0.999, 1.0]):
+        tp, fp, fn, tn = _brute(y, p, point["threshold"])
+        assert (point["tp"], point["fp"], point["fn"], point["tn"]) == (tp, fp, fn, tn)
+        assert point["alerts"] == tp + fp
+        if tp + fp:
+            assert point["precision"] == pytest.approx(tp / (tp + fp))
+        else:
+            assert point["precision"] is None  # undefined, not 0
+
+
+def test_from_counts_equals_labels():
+    y = np.array([0, 1, 0, 1, 1, 0])
+    p = np.array([0.1, 0.9, 0.9, 0.4, 0.1, 0.3])
+    scores, inverse = np.unique(p, return_inverse=True)
+    pos = np.bincount(inverse, weights=y).astype(int)
+    neg = np.bincount(inverse, weights=1 - y).astype(int)
+    grid = np.linspace(0, 1, 21)
+    assert ScoreIndex.from_counts(scores, pos, neg).query(grid) == ScoreIndex(y, p).query(grid)
+
+
+def _serve_scored(monkeypatch, tmp_path, n=500):
+    rng = np.random.default_rng(1)
+    y = (rng.random(n) < 0.2).astype(int)
+    p = np.clip(rng.normal(0.3 + 0.4 * y, 0.15), 0, 1)
+    pd.DataFrame({"true_label": y, "fraud_probability": p}).to_csv(tmp_path / "test_scored.csv", index=False)
+    monkeypatch.setattr(inference, "_artifact_dir_for", lambda model: str(tmp_path))
+    return y, p
+
+
+def test_endpoint_get_and_post_agree(client, monkeypatch, tmp_path):
+    y, p = _serve_scored(monkeypatch, tmp_path)
+    got = client.get("/api/operating-points", params={"threshold": [0.5, 0.7], "grid": 3})
+    assert got.status_code == 200, got.text
+    body = got.json()
+    assert (body["n"], body["positives"]) == (len(y), int(y.sum()))
+    assert [pt["threshold"] for pt in body["points"]] == [0.5, 0.7, 0.0, 0.5, 1.0]
+    assert body["points"][0]["tp"] == _brute(y, p, 0.5)[0]
+    posted = client.post("/api/operating-points", json={"thresholds": [0.5, 0.7, 0.0, 0.5, 1.0]})
+    assert posted.json() == body
+
+
+def test_endpoint_rebuilds_when_the_scored_set_changes(client, monkeypatch, tmp_path):
+    _serve_scored(monkeypatch, tmp_path)
+    assert client.get("/api/operating-points", params={"threshold": 0.5}).json()["n"] == 500
+    _serve_scored(monkeypatch, tmp_path, n=800)
+    assert client.get("/api/operating-points", params={"threshold": 0.5}).json()["n"] == 800
+
+
+def test_endpoint_errors(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(inference, "_artifact_dir_for", lambda model: str(tmp_path))
+    assert client.get("/api/operating-points").status_code == 400  # no thresholds
+    assert client.post("/api/operating-points", json={"thresholds": ["nan"]}).status_code in (400, 422)
+    assert client.get("/api/operating-points", params={"threshold": 0.5}).status_code == 404
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import inference, prediction_cache
+from backend.prediction_cache import PredictionCache, RowDeduplicator, row_key
+from backend.transforms import FEATURE_ORDER
+
+
+def test_row_key_normalises_zero_and_separates_models():
+    row = np.array([0.0, 1.5, np.nan])
+    assert row_key(row, "m") == row_key(np.array([-0.0, 1.5, np.nan]), "m")
+    assert row_key(row, "m") != row_key(row, "other")
+    assert row_key([1.0000001], decimals=3) == row_key([1.0], decimals=3)
+    assert row_key([1.0000001]) != row_key([1.0])
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(prediction_cache.time, "monotonic", lambda: now[0])
+    cache = PredictionCache(max_entries=10, ttl_s=5.0)
+    key = cache.key("m", np.ones(3))
+    cache.put(key, 0.7)
+    now[0] = 104.0
+    assert cache.get(key) == 0.7
+    now[0] = 106.0
+    assert cache.get(key) is None
+    assert cache.stats()["expired"] == 1 and cache.stats()["hits"] == 1
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = PredictionCache(max_entries=2, ttl_s=60)
+    a, b, c = (cache.key("m", np.full(3, v)) for v in (1.0, 2.0, 3.0))
+    cache.put(a, 0.1)
+    cache.put(b, 0.2)
+    cache.get(a)  # b is now the oldest
+    cache.put(c, 0.3)
+    assert cache.get(b) is None and cache.get(a) == 0.1 and cache.get(c) == 0.3
+    assert cache.stats()["evictions"] == 1
+    assert not PredictionCache(max_entries=0, ttl_s=60).enabled
+
+
+def test_dedup_skips_distinct_batches():
+    dedup = RowDeduplicator()
+    X = np.random.default_rng(0).normal(size=(100, 5))
+    assert dedup.unique(X) == (None, None)
+    assert dedup.stats() == {"rows": 100, "unique_rows": 100, "dedup_ratio": 0.0}
+
+
+def test_dedup_groups_equal_rows_including_nan():
+    X = np.random.default_rng(1).normal(size=(6, 4))
+    X[:, 2] = np.nan
+    X[3], X[5] = X[0], X[1]
+    dedup = RowDeduplicator()
+    first, inverse = dedup.unique(X)
+    assert len(first) == 4
+    assert np.array_equal(X[first][inverse], X, equal_nan=True)
+    assert dedup.stats()["unique_rows"] == 4
+
+
+def test_hash_collisions_disable_dedup(monkeypatch):
+    X = np.ones((4, 3))
+    X[1, 1] = 2.0  # same first/last columns, different row
+    monkeypatch.setattr(pd.util, "hash_pandas_object", lambda df, index: pd.Series(np.zeros(len(df), dtype=np.uint64)))
+    assert RowDeduplicator().unique(X) == (None, None)
+
+
+def test_repeated_predict_is_served_from_the_cache(client):
+    client.get("/api/predict/cache", params={"clear": 1})
+    body = {"input": {"Amount": 123.45, "V14": -2.5}}
+    first = client.post("/api/predict", json=body).json()
+    hits = inference.PREDICTION_CACHE.hits
+    assert client.post("/api/predict", json=body).json() == first
+    assert inference.PREDICTION_CACHE.hits == hits + 1
+    stats = client.get("/api/predict/cache").json()
+    assert stats["enabled"] and stats["entries"] >= 1 and stats["dedup"]["rows"] >= 0
+
+
+def test_duplicate_upload_rows_score_once(client, monkeypatch):
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame(rng.normal(size=(10, len(FEATURE_ORDER))), columns=FEATURE_ORDER)
+    df = pd.concat([df, df, df], ignore_index=True)
+    scored = []
+    score = inference.DEFAULT_MODEL.score
+    monkeypatch.setattr(inference.DEFAULT_MODEL, "score", lambda X: scored.append(len(X)) or score(X))
+    r = client.post(
+        "/api/predict-csv", files={"file": ("a.csv", df.to_csv(index=False).encode())}, params={"fields": "scores"}
+    )
+    assert r.status_code == 200, r.text
+    assert scored == [10]
+    probs = np.array([row["fraud_probability"] for row in r.json()["rows"]])
+    assert np.array_equal(probs[:10], probs[10:20]) and np.array_equal(probs[:10], probs[20:])
+    assert probs[:10] == pytest.approx(score(df.iloc[:10].to_numpy(dtype=float, copy=True)), abs=1e-12)
@@ -0,0 +1,110 @@
+import threading
+import time
+
+from backend import registry
+from backend.registry import LoadedModel, ModelRegistry
+
+
+class _SlowLock:
+    """
+    The registry lock; once a model has loaded, the loading thread pauses
+    after each release, so another caller runs in that gap.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.loader_thread = None
+
+    def __enter__(self):
+        self._lock.acquire()
+
+    def __exit__(self, *exc):
+        self._lock.release()
+        if threading.current_thread() is self.loader_thread:
+            time.sleep(0.05)
+
+
+def _model(key, size=0):
+    entry = LoadedModel(key, None, None, 0.5)
+    entry.size_bytes = size
+    return entry
+
+
+def _registry(loader, **kwargs):
+    return ModelRegistry(loader, _model("default"), **kwargs)
+
+
+def test_concurrent_first_requests_load_once():
+    calls = []
+    loaded = threading.Event()
+
+    def loader(key):
+        calls.append(key)
+        time.sleep(0.02)
+        lock.loader_thread = threading.current_thread()
+        loaded.set()
+        return _model(key)
+
+    reg = _registry(loader)
+    reg._lock = lock = _SlowLock()
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(reg.get("m"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    loaded.wait()
+    time.sleep(0.01)  # the loading thread is between its lock sections now
+    got.append(reg.get("m"))
+    for t in threads:
+        t.join()
+    assert calls == ["m"]
+    assert reg.loads == 1
+    assert len({id(e) for e in got}) == 1
+
+
+def test_failed_load_can_be_retried():
+    fail = [True]
+
+    def loader(key):
+        if fail.pop():
+            raise OSError("missing model file")
+        return _model(key)
+
+    reg = _registry(loader)
+    try:
+        reg.get("m")
+    except OSError:
+        pass
+    fail.append(False)
+    assert reg.get("m").key == "m"
+    assert reg.loads == 1 and not reg._loading
+
+
+def test_least_recently_used_models_are_evicted():
+    reg = _registry(_model, max_models=3)
+    reg.get("a")
+    reg.get("b")
+    reg.get("a")  # b is now the least recently used
+    reg.get("c")
+    assert list(reg._entries) == ["default", "a", "c"]
+    assert reg.evictions == 1
+    assert reg.peek("b") is None
+
+
+def test_rss_budget_evicts_but_keeps_default_and_newest(monkeypatch):
+    mb = 1024 * 1024
+    rss = [100 * mb]
+    monkeypatch.setattr(registry, "_rss_bytes", lambda: rss[0])
+
+    def loader(key):
+        rss[0] += 40 * mb
+        return _model(key)
+
+    reg = _registry(loader, max_models=10, rss_budget_mb=150)
+    reg.get("a")  # 140 MB: within budget
+    assert reg.evictions == 0
+    reg.get("b")  # 180 MB: "a" (40 MB) goes
+    assert list(reg._entries) == ["default", "b"]
+    assert reg.peek("b").size_bytes == 40 * mb
+    rss[0] = 500 * mb
+    reg.get("c")  # over budget with nothing left to drop but the pinned ones
+    assert list(reg._entries) == ["default", "c"]
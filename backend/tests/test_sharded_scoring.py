@@ -0,0 +1,114 @@
+import asyncio
+import threading
+
+import numpy as np
+import pandas as pd
+
+from backend import inference, sharding
+from backend.sharding import ShardedScorer
+from backend.telemetry import TELEMETRY
+from backend.transforms import FEATURE_ORDER
+
+
+class _InProcessSharder:
+    """ShardedScorer stand-in that scores the shared block in this process."""
+
+    alloc = staticmethod(ShardedScorer.alloc)
+
+    def __init__(self):
+        self.loop_thread = None
+
+    async def score(self, art_dir, x_shm, n_rows):
+        self.loop_thread = threading.current_thread()
+        X = np.ndarray((n_rows, len(FEATURE_ORDER)), dtype=np.float64, buffer=x_shm.buf)
+        return inference.DEFAULT_MODEL.score(X.copy())
+
+
+def test_sharded_fill_and_drift_run_off_the_event_loop(client, monkeypatch):
+    sharder = _InProcessSharder()
+    fill_threads = []
+    real_fill = inference.fill_and_order_frame
+
+    def recording_fill(*args, **kwargs):
+        fill_threads.append(threading.current_thread())
+        return real_fill(*args, **kwargs)
+
+    monkeypatch.setattr(inference, "SHARDER", sharder)
+    monkeypatch.setattr(inference, "SHARD_MIN_ROWS", 10)
+    monkeypatch.setattr(inference, "fill_and_order_frame", recording_fill)
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(50, len(FEATURE_ORDER))), columns=FEATURE_ORDER)
+    r = client.post(
+        "/api/predict-csv",
+        files={"file": ("a.csv", df.to_csv(index=False).encode())},
+        params={"fields": "scores"},
+    )
+    assert r.status_code == 200, r.text
+
+    assert sharder.loop_thread is not None
+    assert fill_threads and all(t is not sharder.loop_thread for t in fill_threads)
+    assert all(t.name.startswith("cpu") for t in fill_threads)
+    probs = [row["fraud_probability"] for row in r.json()["rows"]]
+    assert np.allclose(probs, inference.DEFAULT_MODEL.score(df.to_numpy(dtype=float, copy=True)))
+
+
+def _matrix(n, seed=1):
+    return np.random.default_rng(seed).normal(size=(n, len(FEATURE_ORDER)))
+
+
+def test_shards_write_their_own_rows():
+    X = _matrix(30)
+    x_shm, block = ShardedScorer.alloc(30)
+    p_shm = sharding.SharedMemory(create=True, size=30 * 8)
+    try:
+        block[:] = X
+        for lo in range(0, 30, 8):
+            sharding._score_shard(inference.ARTIFACT_DIR, x_shm.name, p_shm.name, 30, lo, min(lo + 8, 30))
+        probs = np.ndarray((30,), dtype=np.float64, buffer=p_shm.buf).copy()
+    finally:
+        block = None
+        for shm in (x_shm, p_shm):
+            shm.close()
+            shm.unlink()
+    assert np.allclose(probs, inference.DEFAULT_MODEL.score(X.copy()), rtol=0, atol=1e-12)
+
+
+def test_process_pool_matches_in_process_scoring():
+    scorer = ShardedScorer(2, inference.ARTIFACT_DIR)
+    try:
+        assert len(set(scorer.warm())) >= 1
+        X = _matrix(101)
+        x_shm, block = scorer.alloc(101)
+        block[:] = X
+        block = None
+        try:
+            probs = asyncio.run(scorer.score(inference.ARTIFACT_DIR, x_shm, 101))
+        finally:
+            x_shm.close()
+            x_shm.unlink()
+    finally:
+        scorer.shutdown()
+    assert np.allclose(probs, inference.DEFAULT_MODEL.score(X.copy()), rtol=0, atol=1e-12)
+
+
+class _BrokenSharder(_InProcessSharder):
+    async def score(self, art_dir, x_shm, n_rows):
+        raise RuntimeError("worker died")
+
+
+def test_pool_failure_falls_back_to_in_process(client, monkeypatch):
+    monkeypatch.setattr(inference, "SHARDER", _BrokenSharder())
+    monkeypatch.setattr(inference, "SHARD_MIN_ROWS", 10)
+    fallbacks = TELEMETRY.counter("fallbacks_total", kind="shard")
+    before = fallbacks.value
+    df = pd.DataFrame(_matrix(40), columns=FEATURE_ORDER)
+    r = client.post(
+        "/api/predict-csv",
+        files={"file": ("a.csv", df.to_csv(index=False).encode())},
+        params={"fields": "scores"},
+    )
+    assert r.status_code == 200, r.text
+    assert fallbacks.value == before + 1
+    probs = [row["fraud_probability"] for row in r.json()["rows"]]
+    assert np.allclose(probs, inference.DEFAULT_MODEL.score(df.to_numpy(dtype=float, copy=True)))
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from backend import inference
+from backend.startup import StartupTimer
+
+
+def test_phases_are_timed_in_order_and_errors_kept():
+    timer = StartupTimer()
+    with timer.phase("a"):
+        pass
+    with pytest.raises(OSError):
+        with timer.phase("b"):
+            raise OSError("no scaler")
+
+    def background():
+        with timer.phase("c"):
+            pass
+
+    worker = threading.Thread(target=background, name="curve-artifacts")
+    worker.start()
+    worker.join()
+    report = timer.report()
+    assert [p["phase"] for p in report["phases"]] == ["a", "b", "c"]
+    assert report["phases"][2]["thread"] == "curve-artifacts"
+    assert report["phases"][1]["error"] == "no scaler" and report["phases"][0]["error"] is None
+    assert not report["ready"] and report["ready_ms"] is None
+    timer.mark_ready()
+    assert timer.report()["ready"] and timer.summary().startswith("ready in ")
+
+
+def test_startup_endpoint_reports_load_and_warmup(client):
+    report = client.get("/api/startup").json()
+    assert report["ready"] and report["ready_ms"] > 0
+    phases = {p["phase"] for p in report["phases"]}
+    assert {"import inference", "bundle", "model", "warmup"} <= phases
+
+
+def test_warmup_scores_without_feeding_drift(monkeypatch):
+    drift = inference._drift_for(inference.DEFAULT_MODEL)
+    rows = drift.report(1, 1, 1, 1, 1)["rows"]
+    timer = StartupTimer()
+    monkeypatch.setattr(inference, "STARTUP", timer)
+    inference.warmup(rows=8)
+    assert [p["phase"] for p in timer.report()["phases"]] == ["warmup"]
+    assert drift.report(1, 1, 1, 1, 1)["rows"] == rows
+    inference.warmup(rows=0)  # disabled
+    assert len(timer.report()["phases"]) == 1
+
+
+def test_startup_without_curves_only_warms(monkeypatch):
+    built = []
+    monkeypatch.setattr(inference, "STARTUP_CURVES", "off")
+    monkeypatch.setattr(inference, "_ensure_curve_artifacts_on_startup", lambda: built.append(1))
+    monkeypatch.setattr(inference, "warmup", lambda: built.append("warm"))
+    inference.startup()
+    assert built == ["warm"]
+    monkeypatch.setattr(inference, "STARTUP_CURVES", "sync")
+    inference.startup()
+    assert built == ["warm", 1, "warm"]
@@ -0,0 +1,56 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+from backend import inference
+from backend.transforms import FEATURE_ORDER
+
+
+def _upload(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n, len(FEATURE_ORDER))), columns=FEATURE_ORDER)
+    df.insert(0, "txn", np.arange(n))
+    return df.to_csv(index=False).encode()
+
+
+def _stream(client, data, **params):
+    return client.post("/api/predict-csv/stream", files={"file": ("a.csv", data)}, params=params)
+
+
+def test_stream_scores_chunk_by_chunk(client, monkeypatch):
+    monkeypatch.setattr(inference, "STREAM_CHUNK_ROWS", 50)
+    sizes = []
+    score = inference._score_frame
+    monkeypatch.setattr(inference, "_score_frame", lambda df, *a, **k: sizes.append(len(df)) or score(df, *a, **k))
+
+    data = _upload(230)
+    r = _stream(client, data)
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/csv")
+    assert sizes == [50, 50, 50, 50, 30]  # never more than one chunk at a time
+    streamed = pd.read_csv(io.StringIO(r.text))  # one header, then rows only
+    assert list(streamed["txn"]) == list(range(230))
+
+    whole = client.post(
+        "/api/predict-csv", files={"file": ("a.csv", data)}, headers={"Accept": "text/csv"}
+    )
+    expected = pd.read_csv(io.StringIO(whole.text))
+    assert np.allclose(streamed["fraud_probability"], expected["fraud_probability"])
+    assert (streamed["model_decision"] == expected["model_decision"]).all()
+
+
+def test_stream_ndjson(client, monkeypatch):
+    monkeypatch.setattr(inference, "STREAM_CHUNK_ROWS", 40)
+    r = _stream(client, _upload(100), format="ndjson")
+    assert r.status_code == 200
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [int(row["txn"]) for row in rows] == list(range(100))  # passthrough columns stay text
+    assert all(0.0 <= row["fraud_probability"] <= 1.0 for row in rows)
+
+
+def test_stream_rejects_bad_requests(client):
+    assert _stream(client, _upload(5), format="xml").status_code == 400
+    header_only = ",".join(FEATURE_ORDER).encode() + b"\n"
+    r = _stream(client, header_only)
+    assert r.status_code == 400 and "no rows" in r.json()["detail"]
@@ -0,0 +1,64 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.telemetry import TELEMETRY, Histogram, Telemetry, TelemetryMiddleware
+
+
+def test_histogram_quantiles_interpolate_within_buckets():
+    h = Histogram(buckets=(1.0, 2.0, 4.0))
+    assert h.quantile(0.5) is None
+    for v in (0.5, 1.5, 1.5, 3.0):
+        h.observe(v)
+    assert h.state() == ([1, 2, 1, 0], 6.5, 4)
+    assert h.quantile(0.5) == pytest.approx(1.5)  # halfway through the (1, 2] bucket
+    assert h.quantile(1.0) == pytest.approx(4.0)
+
+
+def test_stages_time_and_count_errors():
+    t = Telemetry()
+    with t.stage("model.predict"):
+        pass
+    with pytest.raises(ValueError):
+        with t.stage("model.predict"):
+            raise ValueError
+    assert t.histogram("stage_seconds", stage="model.predict").count == 2
+    assert t.counter("errors_total", stage="model.predict").value == 1
+
+
+def test_prometheus_exposition():
+    t = Telemetry(prefix="x")
+    t.inc("rows_total", 3, path='a"b')
+    t.gauge("depth").set(2)
+    t.histogram("lat").observe(0.003)
+    text = t.render_prometheus()
+    lines = text.splitlines()
+    assert "# TYPE x_rows_total counter" in lines and 'x_rows_total{path="a\\"b"} 3' in lines
+    assert "# TYPE x_depth gauge" in lines and "x_depth 2" in lines
+    assert 'x_lat_bucket{le="0.0025"} 0' in lines and 'x_lat_bucket{le="0.005"} 1' in lines
+    assert 'x_lat_bucket{le="+Inf"} 1' in lines and "x_lat_count 1" in lines
+    assert text.endswith("\n")
+
+
+def test_metrics_endpoint_reports_routes_and_stages(client):
+    client.post("/api/predict", json={"input": {"Amount": 10.0}})
+    text = client.get("/metrics").text
+    assert 'fraudsynth_requests_total{method="POST",route="/api/predict",status="200"}' in text
+    assert 'fraudsynth_stage_seconds_count{stage="predict.fill"}' in text
+    snap = client.get("/metrics", params={"format": "json"}).json()
+    hists = {(h["name"], h["labels"].get("stage")) for h in snap["histograms"]}
+    assert ("stage_seconds", "model.predict") in hists
+    assert client.get("/metrics/profile/nope").status_code == 404
+
+
+def test_profiled_requests_keep_their_stacks():
+    app = FastAPI()
+
+    @app.get("/work")
+    def work():
+        return sum(i * i for i in range(200_000))
+
+    c = TestClient(TelemetryMiddleware(app, profiling=True, interval_ms=1))
+    assert "x-profile-id" not in c.get("/work").headers
+    profile_id = c.get("/work", headers={"X-Profile": "1"}).headers["x-profile-id"]
+    assert TELEMETRY.get_profile(profile_id) is not None
@@ -0,0 +1,83 @@
+import json
+import os
+
+import numpy as np
+
+from backend import inference
+from backend.topk import TopK, TopRiskTracker
+
+
+def _row(i, p):
+    return {"Time": float(i), "fraud_probability": p}
+
+
+def test_topk_keeps_the_k_best():
+    tk = TopK(3)
+    probs = np.array([0.1, 0.9, np.nan, 0.5, 0.7, 0.3])
+    assert tk.offer(probs, lambda i: _row(i, probs[i])) == 3
+    assert [r["Time"] for r in tk.top(10)] == [1.0, 4.0, 3.0]
+    assert tk.offer(np.array([0.2]), lambda i: _row(9, 0.2)) == 0
+    assert tk.offer(np.array([0.6]), lambda i: _row(9, 0.6)) == 1
+    assert [r["Time"] for r in tk.top(10)] == [1.0, 4.0, 9.0]
+
+
+def test_topk_replaces_rows_with_a_known_identity():
+    tk = TopK(5)
+    probs = np.array([0.9, 0.8, 0.7])
+    keys = np.array([b"a", b"b", b"c"], dtype=object)
+    for _ in range(3):
+        tk.offer(probs, lambda i: _row(i, probs[i]), lambda idx: keys[idx])
+    assert len(tk) == 3
+    # a new score for a known row replaces it, duplicates inside a batch too
+    tk.offer(np.array([0.95, 0.95]), lambda i: _row(7, 0.95), lambda idx: [b"c"] * len(idx))
+    assert len(tk) == 3
+    assert [r["Time"] for r in tk.top(5)] == [7.0, 0.0, 1.0]
+
+
+def test_evicted_identities_can_enter_again():
+    tk = TopK(2)
+    tk.offer(np.array([0.5, 0.6]), lambda i: _row(i, 0), lambda idx: [b"a", b"b"])
+    tk.offer(np.array([0.9]), lambda i: _row(2, 0), lambda idx: [b"c"])  # evicts b"a"
+    tk.offer(np.array([0.95]), lambda i: _row(0, 0), lambda idx: [b"a"])
+    assert [r["Time"] for r in tk.top(2)] == [0.0, 2.0]
+
+
+def test_tracker_persists_identities(tmp_path):
+    seed = [(b"\x01", _row(1, 0.9)), (None, _row(2, 0.8))]
+    tracker = TopRiskTracker(5, "fraud_probability", lambda key: seed, str(tmp_path))
+    tracker.get("m")
+    (path,) = tracker.save_all()
+    restored = TopRiskTracker(5, "fraud_probability", lambda key: [], str(tmp_path)).get("m")
+    assert restored.entries(5) == seed
+    restored.offer(np.array([0.7]), lambda i: _row(1, 0.7), lambda idx: [b"\x01"])
+    assert len(restored) == 2
+
+    # files written before rows had identities hold bare rows
+    with open(path, "w") as f:
+        json.dump([_row(3, 0.5)], f)
+    old = TopRiskTracker(5, "fraud_probability", lambda key: [], str(tmp_path)).get("m")
+    assert old.entries(5) == [(None, _row(3, 0.5))]
+
+
+def test_replayed_uploads_do_not_duplicate_top_risks(client):
+    path = os.path.join(inference.ARTIFACT_DIR, "top_risks.csv")
+    with open(path, "rb") as f:
+        data = f.read()
+    for _ in range(3):
+        r = client.post("/api/predict-csv", files={"file": ("t.csv", data)}, params={"fields": "scores"})
+        assert r.status_code == 200, r.text
+    rows = client.get("/api/top-risks", params={"limit": 20}).json()["rows"]
+    assert len(rows) == 20
+    assert len({(r["Time"], r["Amount"]) for r in rows}) == 20
+
+    # the same transaction through /api/predict and the channel
+    one = {k: v for k, v in rows[0].items() if k in ("Time", "Amount")}
+    full = next(
+        r for r in inference.pd.read_csv(path).to_dict(orient="records") if r["Time"] == one["Time"]
+    )
+    features = {k: full[k] for k in inference.FEATURE_ORDER}
+    assert client.post("/api/predict", json={"input": features}).status_code == 200
+    r = client.post("/api/predict/ndjson", content=json.dumps(features).encode() + b"\n")
+    assert r.status_code == 200
+    rows = client.get("/api/top-risks", params={"limit": 20}).json()["rows"]
+    assert len({(r["Time"], r["Amount"]) for r in rows}) == 20
@@ -0,0 +1,59 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from backend.transforms import (
+    BUNDLE,
+    FEATURE_ORDER,
+    fill_and_order_features,
+    fill_and_order_frame,
+    fill_features_into,
+    to_model_space,
+)
+
+V14 = FEATURE_ORDER.index("V14")
+AMOUNT = FEATURE_ORDER.index("Amount")
+
+
+def test_row_fill_keeps_medians_for_missing_and_unparsable_keys():
+    out = np.empty(len(FEATURE_ORDER))
+    fills = np.zeros(len(FEATURE_ORDER), dtype=np.int64)
+    fill_features_into({"Amount": "12.5", "V14": "abc", "V1": None, "V2": "", "bogus": 3}, out, fills=fills)
+    expected = BUNDLE.median_vec.copy()
+    expected[AMOUNT] = 12.5
+    assert np.array_equal(out, expected)
+    assert fills[AMOUNT] == 0 and fills[V14] == 1 and fills.sum() == len(FEATURE_ORDER) - 1
+
+
+def test_row_and_frame_fills_agree():
+    df = pd.DataFrame({"Time": ["10", "20", "30"], "amount": [5.0, 7.0, None], "V14": ["-3.2", "x", None]})
+    fills = np.zeros(len(FEATURE_ORDER), dtype=np.int64)
+    X = fill_and_order_frame(df, fills=fills)  # "amount" matches case-insensitively
+
+    rows = [{"Time": "10", "Amount": 5.0, "V14": "-3.2"}, {"Time": "20", "Amount": 7.0, "V14": "x"}]
+    for i, rec in enumerate(rows):
+        assert np.array_equal(X[i], fill_and_order_features(rec)[1][0])
+    assert np.isnan(X[2, V14]) and np.isnan(X[2, AMOUNT])  # empty cells stay NaN
+    assert fills[V14] == 1 and fills[FEATURE_ORDER.index("V1")] == 3
+
+
+def test_frame_fill_writes_into_a_given_buffer():
+    df = pd.DataFrame({"Amount": [1.0, 2.0]})
+    buf = np.zeros((2, len(FEATURE_ORDER)))
+    assert fill_and_order_frame(df, out=buf) is buf
+    assert list(buf[:, AMOUNT]) == [1.0, 2.0]
+
+
+def test_model_space_matches_the_scaler():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(50, len(FEATURE_ORDER))) * 10
+    expected = BUNDLE.scaler.transform(pd.DataFrame(X, columns=FEATURE_ORDER))
+    assert BUNDLE.scale_offset is not None  # the affine fast path is in use
+    assert np.allclose(to_model_space(X), expected, rtol=0, atol=1e-12)
+    Y = X.copy()
+    assert to_model_space(Y, out=Y) is Y and np.allclose(Y, expected, rtol=0, atol=1e-12)
+
+    generic = copy.copy(BUNDLE)
+    generic.scale_offset = generic.scale_div = None  # e.g. a scaler without an affine form
+    assert np.allclose(to_model_space(X, bundle=generic), expected, rtol=0, atol=1e-12)
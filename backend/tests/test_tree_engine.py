@@ -0,0 +1,70 @@
+import lightgbm as lgb
+import numpy as np
+import pytest
+
+from backend import inference
+from backend.tree_engine import FlatTreeEnsemble
+
+
+def _booster():
+    return getattr(inference.MODEL, "booster_", inference.MODEL)
+
+
+def test_matches_lightgbm_on_the_served_model():
+    booster = _booster()
+    flat = FlatTreeEnsemble.from_booster(booster)
+    rng = np.random.default_rng(0)
+    X = rng.normal(scale=3.0, size=(FlatTreeEnsemble.BLOCK_ROWS + 500, flat.n_features))
+    X[::7, 3] = np.nan
+    X[::11, 5] = 0.0
+    assert np.allclose(flat.predict(X), booster.predict(X), rtol=0, atol=1e-12)  # two blocks
+    assert np.allclose(flat.predict(X[:40]), booster.predict(X[:40]), rtol=0, atol=1e-12)
+    assert flat.predict(X[0]) == pytest.approx(booster.predict(X[:1])[0], abs=1e-12)  # single row
+
+
+def test_values_on_split_thresholds_follow_lightgbm():
+    booster = _booster()
+    flat = FlatTreeEnsemble.from_booster(booster)
+    internal = flat.threshold[np.isfinite(flat.threshold)]
+    feats = flat.feature[np.isfinite(flat.threshold)]
+    X = np.zeros((len(internal), flat.n_features))
+    X[np.arange(len(internal)), feats] = internal
+    assert np.allclose(flat.predict(X), booster.predict(X), rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("missing", ["nan", "zero"])
+def test_missing_value_rules(missing):
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(2000, 4))
+    y = (X[:, 0] + np.nan_to_num(X[:, 1]) > 0).astype(int)
+    if missing == "nan":
+        X[rng.random(2000) < 0.2, 1] = np.nan
+        y[np.isnan(X[:, 1])] = 1
+        params = {"use_missing": True}
+    else:
+        X[rng.random(2000) < 0.2, 1] = 0.0
+        params = {"zero_as_missing": True}
+    booster = lgb.train(
+        {"objective": "binary", "verbose": -1, "num_leaves": 8, **params}, lgb.Dataset(X, y), num_boost_round=20
+    )
+    flat = FlatTreeEnsemble.from_booster(booster)
+    T = rng.normal(size=(300, 4))
+    T[::3, 1] = np.nan
+    T[1::3, 1] = 0.0
+    assert np.allclose(flat.predict(T), booster.predict(T), rtol=0, atol=1e-12)
+
+
+def test_unsupported_models_are_refused():
+    rng = np.random.default_rng(2)
+    X = rng.integers(0, 5, size=(500, 2)).astype(float)
+    y = (X[:, 0] == 3).astype(int)
+    booster = lgb.train(
+        {"objective": "binary", "verbose": -1, "min_data_per_group": 1, "cat_smooth": 1},
+        lgb.Dataset(X, y, categorical_feature=[0]),
+        num_boost_round=5,
+    )
+    with pytest.raises(ValueError, match="Categorical"):
+        FlatTreeEnsemble.from_booster(booster)
+    flat = FlatTreeEnsemble.from_booster(_booster())
+    with pytest.raises(ValueError, match="features"):
+        flat.predict(np.zeros((2, flat.n_features + 1)))
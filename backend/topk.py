@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import os
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Row = Dict[str, object]
+Entry = Tuple[Optional[bytes], Row]  # (identity digest or None, row)
+
+
+def _clean(row: Row) -> Row:
+    # NaN cells would make the JSON response invalid
+    return {k: (None if isinstance(v, float) and math.isnan(v) else v) for k, v in row.items()}
+
+
+class TopK:
+    """
+    Bounded min-heap of the k highest-probability rows seen so far.
+
+    Memory stays at k rows however many are offered. A batch is first cut to
+    the rows above the current k-th best score (and to at most k of those with
+    argpartition), so only real candidates become dicts. The sorted view is
+    rebuilt on the first read after a change, so reads are a slice.
+
+    Rows may carry an identity (e.g. a digest of the filled feature vector):
+    a row offered again under a key already in the heap replaces that entry
+    instead of adding a copy, so replayed traffic cannot fill the top k with
+    the same transaction.
+    """
+
+    def __init__(self, k: int):
+        self.k = max(1, int(k))
+        self._heap: List[Tuple[float, int, Row, Optional[Hashable]]] = []
+        self._where: Dict[Hashable, Tuple[float, int, Row, Optional[Hashable]]] = {}
+        self._seq = 0
+        self._sorted: Optional[List[Tuple[Optional[Hashable], Row]]] = None
+        self._lock = threading.Lock()
+
+    def floor(self) -> float:
+        heap = self._heap
+        return heap[0][0] if len(heap) >= self.k else -math.inf
+
+    def offer(
+        self,
+        probs: np.ndarray,
+        row_at: Callable[[int], Row],
+        keys_of: Optional[Callable[[np.ndarray], Sequence[Optional[Hashable]]]] = None,
+    ) -> int:
+        """
+        Consider probs[i] for every i; row_at(i) builds the row only for
+        those that enter the top k, and keys_of(indices) their identities
+        (None: no identity, never replaces). Returns how many entered.
+        """
+        probs = np.asarray(probs, dtype=float).reshape(-1)
+        cand = np.flatnonzero(probs > self.floor())  # NaN never qualifies
+        if len(cand) > self.k:
+            cand = cand[np.argpartition(-probs[cand], self.k - 1)[: self.k]]
+        if not len(cand):
+            return 0
+        cand = cand[np.argsort(-probs[cand], kind="stable")]
+        keys = list(keys_of(cand)) if keys_of is not None else [None] * len(cand)
+
+        entered = 0
+        with self._lock:
+            heap, where = self._heap, self._where
+            for i, key in zip(cand, keys):
+                p = float(probs[i])
+                old = where.get(key) if key is not None else None
+                if old is not None:
+                    # the same transaction scored again: its latest score wins
+                    entry = (p, self._seq, _clean(row_at(int(i))), key)
+                    heap[heap.index(old)] = entry
+                    heapq.heapify(heap)
+                elif len(heap) < self.k:
+                    entry = (p, self._seq, _clean(row_at(int(i))), key)
+                    heapq.heappush(heap, entry)
+                elif p > heap[0][0]:
+                    entry = (p, self._seq, _clean(row_at(int(i))), key)
+                    dropped = heapq.heapreplace(heap, entry)
+                    if dropped[3] is not None:
+                        del where[dropped[3]]
+                else:
+                    break  # candidates are in descending order
+                if key is not None:
+                    where[key] = entry
+                self._seq += 1
+                entered += 1
+            if entered:
+                self._sorted = None
+        return entered
+
+    def entries(self, n: int) -> List[Tuple[Optional[Hashable], Row]]:
+        """
+        The n best (identity, row) pairs, highest probability first.
+        """
+        snap = self._sorted
+        if snap is None:
+            with self._lock:
+                snap = self._sorted = [(e[3], e[2]) for e in sorted(self._heap, reverse=True)]
+        return snap[: max(0, n)]
+
+    def top(self, n: int) -> List[Row]:
+        return [row for _, row in self.entries(n)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class TopRiskTracker:
+    """
+    One TopK per artifact folder (i.e. per dashboard model).
+
+    A tracker starts from its persisted JSON file when persist_dir is set and
+    one exists, otherwise from seed(key) (the static top_risks.csv rows with
+    their identities), and is then fed by live scoring traffic. save_all()
+    writes every tracker, identities included, to persist_dir (temp file +
+    rename).
+    """
+
+    def __init__(
+        self,
+        k: int,
+        prob_col: str,
+        seed: Callable[[str], List[Entry]],
+        persist_dir: Optional[str] = None,
+    ):
+        self.k = k
+        self.prob_col = prob_col
+        self.persist_dir = persist_dir or None
+        self._seed = seed
+        self._trackers: Dict[str, TopK] = {}
+        self._lock = threading.Lock()
+
+    def _persist_path(self, key: str) -> Optional[str]:
+        if not self.persist_dir:
+            return None
+        name = os.path.basename(os.path.normpath(key)) or "default"
+        return os.path.join(self.persist_dir, f"top_risks_{name}.json")
+
+    def peek(self, key: str) -> Optional[TopK]:
+        """
+        The tracker for key if it has been created, without seeding one.
+        """
+        return self._trackers.get(key)
+
+    def get(self, key: str) -> TopK:
+        tk = self._trackers.get(key)
+        if tk is not None:
+            return tk
+        with self._lock:
+            tk = self._trackers.get(key)
+            if tk is None:
+                tk = TopK(self.k)
+                entries = self._initial_entries(key)
+                probs = np.array([r.get(self.prob_col, np.nan) for _, r in entries], dtype=float)
+                tk.offer(probs, lambda i: entries[i][1], lambda idx: [entries[i][0] for i in idx])
+                self._trackers[key] = tk
+        return tk
+
+    def _initial_entries(self, key: str) -> List[Entry]:
+        path = self._persist_path(key)
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    saved = json.load(f)
+                # [{"key": hex, "row": row}]; files saved before identities held bare rows
+                return [
+                    (bytes.fromhex(e["key"]) if e.get("key") else None, e["row"])
+                    if "row" in e
+                    else (None, e)
+                    for e in saved
+                ]
+            except Exception as e:
+                print(f"[WARN] Ignoring persisted top risks {path}:", e)
+        try:
+            return self._seed(key)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"[WARN] Could not seed top risks for {key}:", e)
+            return []
+
+    def save_all(self) -> List[str]:
+        if not self.persist_dir:
+            return []
+        os.makedirs(self.persist_dir, exist_ok=True)
+        written = []
+        for key, tk in list(self._trackers.items()):
+            path = self._persist_path(key)
+            tmp = path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(
+                    [{"key": k.hex() if k else None, "row": r} for k, r in tk.entries(tk.k)], f
+                )
+            os.replace(tmp, path)
+            written.append(path)
+        return written
@@ -1,6 +1,13 @@
 import json, os, joblib, numpy as np, pandas as pd
-from typing import Dict, Tuple
+from functools import cached_property
+from typing import Dict, Optional, Tuple
+from .startup import STARTUP
+
+with STARTUP.phase("import sklearn"):  # the bulk of cold start (pulls in scipy)
+    from sklearn.preprocessing import RobustScaler, StandardScaler
+from .columnar import read_table
 from .config import ARTIFACT_DIR
+from .telemetry import TELEMETRY
 
 # In Kaggle creditcard.csv, V1–V28 ARE ALREADY PCA COMPONENTS.
 # So we DO NOT need a separate pca.pkl. We only need to apply the SAME SCALER (if used in training).
@@ -11,42 +18,163 @@ FEATURE_ORDER = [
 ]
 
 class ArtifactBundle:
-    def __init__(self):
-        self.scaler = joblib.load(os.path.join(ARTIFACT_DIR, "scaler.pkl"))
-        meta_path = os.path.join(ARTIFACT_DIR, "fraud_metadata.json")
+    def __init__(self, art_dir: str = ARTIFACT_DIR):
+        # Model folders may omit scaler/metadata/scored set; those fall back to ARTIFACT_DIR
+        self.art_dir = art_dir
+        self.scaler = joblib.load(self._path("scaler.pkl"))
+        meta_path = self._path("fraud_metadata.json")
         self.metadata = json.load(open(meta_path, "r")) if os.path.exists(meta_path) else {}
-        self.medians = self._load_feature_medians()
+        # Aligned arrays for the pandas-free fast path
+        self.feature_index = {k: i for i, k in enumerate(FEATURE_ORDER)}
+        self.scale_offset, self.scale_div = self._affine_scaler()
+
+    @cached_property
+    def medians(self) -> Dict[str, float]:
+        # Deferred: without feature_medians in the metadata this scans test_scored
+        return self._load_feature_medians()
+
+    @cached_property
+    def median_vec(self) -> np.ndarray:
+        return np.array([self.medians[k] for k in FEATURE_ORDER], dtype=float)
+
+    def _path(self, name: str) -> str:
+        p = os.path.join(self.art_dir, name)
+        return p if os.path.exists(p) else os.path.join(ARTIFACT_DIR, name)
+
+    def _affine_scaler(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """(offset, div) such that scaler.transform(X) == (X - offset) / div, else (None, None)."""
+        s, n = self.scaler, len(FEATURE_ORDER)
+        names = getattr(s, "feature_names_in_", None)
+        if names is not None and list(names) != FEATURE_ORDER:
+            return None, None
+        if isinstance(s, StandardScaler):
+            offset = s.mean_ if s.with_mean else np.zeros(n)
+            div = s.scale_ if s.with_std else np.ones(n)
+        elif isinstance(s, RobustScaler):
+            offset = s.center_ if s.with_centering else np.zeros(n)
+            div = s.scale_ if s.with_scaling else np.ones(n)
+        else:
+            return None, None
+        return np.asarray(offset, dtype=float), np.asarray(div, dtype=float)
 
     def _load_feature_medians(self) -> Dict[str, float]:
         if "feature_medians" in self.metadata:
             return self.metadata["feature_medians"]
-        csv = os.path.join(ARTIFACT_DIR, "test_scored.csv")
-        if os.path.exists(csv):
-            df = pd.read_csv(csv)
+        df = read_table(os.path.join(self.art_dir, "test_scored"))
+        if df is None and self.art_dir != ARTIFACT_DIR:
+            df = read_table(os.path.join(ARTIFACT_DIR, "test_scored"))
+        if df is not None:
             meds = df[FEATURE_ORDER].median(numeric_only=True).to_dict()
             return {k: float(v) for k, v in meds.items()}
         return {k: 0.0 for k in FEATURE_ORDER}
 
-BUNDLE = ArtifactBundle()
+with STARTUP.phase("bundle"):
+    BUNDLE = ArtifactBundle()
+
+# Cells that fell back to the feature median
+_ROW_FILLS = TELEMETRY.counter("median_fills_total", path="row")
+_FRAME_FILLS = TELEMETRY.counter("median_fills_total", path="frame")
+
 
+def fill_features_into(
+    raw: Dict[str, float],
+    out: np.ndarray,
+    bundle: Optional[ArtifactBundle] = None,
+    fills: Optional[np.ndarray] = None,
+) -> None:
+    """Write raw into the length-30 row out in FEATURE_ORDER; missing or unparsable keys keep the median.
 
-def fill_and_order_features(raw: Dict[str, float]) -> Tuple[dict, np.ndarray, bool]:
+    fills, when given, gets +1 for every feature that kept the median.
+    """
+    bundle = bundle or BUNDLE
+    out[:] = bundle.median_vec
+    index = bundle.feature_index
+    given = np.zeros(len(out), dtype=bool) if fills is not None else None
+    n_given = 0
+    for k, v in raw.items():
+        j = index.get(k)
+        if j is None or v in (None, ""):
+            continue
+        try:
+            out[j] = float(v)
+            n_given += 1
+            if given is not None:
+                given[j] = True
+        except Exception:
+            pass
+    _ROW_FILLS.inc(len(out) - n_given)
+    if fills is not None:
+        fills += ~given
+
+
+def fill_and_order_features(
+    raw: Dict[str, float], bundle: Optional[ArtifactBundle] = None, fills: Optional[np.ndarray] = None
+) -> Tuple[dict, np.ndarray, bool]:
     """Fill missing keys with medians; return (filled_dict, X_ordered, time_amount_only_flag)."""
-    filled = {}
-    for k in FEATURE_ORDER:
-        if k in raw and raw[k] not in (None, ""):
-            try:
-                filled[k] = float(raw[k])
-            except Exception:
-                filled[k] = BUNDLE.medians[k]
-        else:
-            filled[k] = BUNDLE.medians[k]
+    X = np.empty((1, len(FEATURE_ORDER)), dtype=float)
+    fill_features_into(raw, X[0], bundle, fills)
+    filled = dict(zip(FEATURE_ORDER, X[0].tolist()))
     time_amount_only = set(raw.keys()) <= {"Time","Amount"} and len(raw.keys()) > 0
-    X = np.array([[filled[k] for k in FEATURE_ORDER]], dtype=float)
     return filled, X, time_amount_only
 
 
-def to_model_space(X: np.ndarray) -> np.ndarray:
-    """Apply the training scaler. No PCA here because V1–V28 are already PCA components."""
-    X_df = pd.DataFrame(X, columns=FEATURE_ORDER)
-    return BUNDLE.scaler.transform(X_df)
\ No newline at end of file
+def to_model_space(
+    X: np.ndarray, out: Optional[np.ndarray] = None, bundle: Optional[ArtifactBundle] = None
+) -> np.ndarray:
+    """Apply the training scaler. No PCA here because V1–V28 are already PCA components.
+
+    Uses the precomputed affine form when the scaler has one (no DataFrame, no
+    sklearn dispatch); out may be X itself to scale in place.
+    """
+    bundle = bundle or BUNDLE
+    if bundle.scale_offset is None:
+        X_df = pd.DataFrame(X, columns=FEATURE_ORDER)
+        Xm = bundle.scaler.transform(X_df)
+        if out is None:
+            return Xm
+        out[...] = Xm
+        return out
+    out = np.subtract(X, bundle.scale_offset, out=out)
+    return np.divide(out, bundle.scale_div, out=out)
+
+
+def fill_and_order_frame(
+    df: pd.DataFrame,
+    bundle: Optional[ArtifactBundle] = None,
+    out: Optional[np.ndarray] = None,
+    fills: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Vectorized fill_and_order_features for a whole DataFrame.
+
+    Columns are matched case-insensitively once, then each feature is filled
+    column-wise: missing columns and cells that cannot be parsed as floats fall
+    back to BUNDLE.medians, while empty cells stay NaN exactly as they do when
+    the row-by-row path calls float() on them. Returns an (n_rows, 30) matrix,
+    written into out when given (e.g. a shared-memory buffer); per-feature
+    counts of median-filled cells are added to fills when given.
+    """
+    medians = (bundle or BUNDLE).medians
+    cols_lower = {str(c).lower(): c for c in df.columns}
+    X = np.empty((len(df), len(FEATURE_ORDER)), dtype=float) if out is None else out
+    filled = 0
+    for j, k in enumerate(FEATURE_ORDER):
+        src = cols_lower.get(k.lower())
+        if src is None:
+            X[:, j] = medians[k]
+            filled += len(df)
+            if fills is not None:
+                fills[j] += len(df)
+            continue
+        col = df[src]
+        vals = pd.to_numeric(col, errors="coerce").to_numpy(dtype=float, copy=True)
+        if col.dtype.kind not in "biuf":  # object / string columns
+            unparsable = np.isnan(vals) & col.notna().to_numpy()
+            vals[unparsable] = medians[k]
+            n_unparsable = int(unparsable.sum())
+            filled += n_unparsable
+            if fills is not None:
+                fills[j] += n_unparsable
+        X[:, j] = vals
+    _FRAME_FILLS.inc(filled)
+    return X
\ No newline at end of file
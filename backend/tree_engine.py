@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List
+
+import numpy as np
+
+# LightGBM treats |x| <= kZeroThreshold as zero for missing_type == "Zero"
+_K_ZERO = 1e-35
+_MISSING_CODES = {"None": 0, "Zero": 1, "NaN": 2}
+
+
+class FlatTreeEnsemble:
+    """
+    LightGBM tree ensemble compiled into packed NumPy node arrays.
+
+    Every node of every tree lives in one set of flat arrays (feature index,
+    threshold, left/right child, default direction, missing type, leaf value).
+    Leaves point to themselves, so scoring walks all trees at once for a
+    fixed number of vectorized steps (the deepest tree's depth), sums the
+    leaf values and applies the objective's link.
+
+    This beats Booster.predict for single rows, where LightGBM's call
+    overhead dominates; for batches the multithreaded C++ predictor is
+    faster, which is why the caller only routes small batches here.
+
+    Only numerical splits are supported; from_booster raises ValueError for
+    anything else so callers can fall back to the LightGBM predictor.
+    """
+
+    BLOCK_ROWS = 4096  # bounds the (rows, trees) index matrices
+
+    def __init__(
+        self,
+        roots: np.ndarray,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        default_left: np.ndarray,
+        missing_type: np.ndarray,
+        value: np.ndarray,
+        max_depth: int,
+        n_features: int,
+        sigmoid: float = 0.0,
+        average_output: bool = False,
+    ):
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.missing_type = missing_type
+        self.value = value
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.sigmoid = sigmoid
+        self.average_output = average_output
+        self._plain_splits = not np.any(missing_type)
+
+    @classmethod
+    def from_booster(cls, booster) -> "FlatTreeEnsemble":
+        """
+        Compile a lightgbm.Booster (or an sklearn LGBM wrapper) via dump_model().
+        """
+        booster = getattr(booster, "booster_", booster)
+        dump = booster.dump_model()
+        if dump.get("num_class", 1) != 1:
+            raise ValueError("Only single-output (binary/regression) models are supported")
+
+        objective = str(dump.get("objective", ""))
+        sigmoid = 0.0
+        if objective.startswith(("binary", "cross_entropy", "xentropy")):
+            m = re.search(r"sigmoid:([0-9.eE+-]+)", objective)
+            sigmoid = float(m.group(1)) if m else 1.0
+        elif not objective.startswith("regression"):
+            raise ValueError(f"Unsupported objective: {objective}")
+
+        cols: Dict[str, List] = {
+            k: [] for k in ("feature", "threshold", "left", "right", "default_left", "missing", "value")
+        }
+        roots: List[int] = []
+        max_depth = 0
+
+        def add(node: dict, depth: int) -> int:
+            nonlocal max_depth
+            i = len(cols["feature"])
+            for k in cols:
+                cols[k].append(0)
+            if "leaf_value" in node:
+                max_depth = max(max_depth, depth)
+                cols["left"][i] = cols["right"][i] = i
+                cols["threshold"][i] = np.inf
+                cols["value"][i] = float(node["leaf_value"])
+                return i
+            if node.get("decision_type") != "<=":
+                raise ValueError("Categorical splits are not supported")
+            cols["feature"][i] = int(node["split_feature"])
+            cols["threshold"][i] = float(node["threshold"])
+            cols["default_left"][i] = bool(node.get("default_left", True))
+            cols["missing"][i] = _MISSING_CODES[node.get("missing_type", "None")]
+            cols["left"][i] = add(node["left_child"], depth + 1)
+            cols["right"][i] = add(node["right_child"], depth + 1)
+            return i
+
+        for tree in dump["tree_info"]:
+            roots.append(add(tree["tree_structure"], 0))
+
+        return cls(
+            roots=np.asarray(roots, dtype=np.int64),
+            feature=np.asarray(cols["feature"], dtype=np.int64),
+            threshold=np.asarray(cols["threshold"], dtype=np.float64),
+            left=np.asarray(cols["left"], dtype=np.int64),
+            right=np.asarray(cols["right"], dtype=np.int64),
+            default_left=np.asarray(cols["default_left"], dtype=bool),
+            missing_type=np.asarray(cols["missing"], dtype=np.int8),
+            value=np.asarray(cols["value"], dtype=np.float64),
+            max_depth=max_depth,
+            n_features=int(dump["max_feature_idx"]) + 1,
+            sigmoid=sigmoid,
+            average_output=bool(dump.get("average_output", False)),
+        )
+
+    def _go_right(self, x: np.ndarray, nodes) -> np.ndarray:
+        """
+        Split decisions for feature values x at the given nodes, applying
+        LightGBM's missing-value rules (NaN -> 0.0 unless missing_type NaN).
+        """
+        nan = np.isnan(x)
+        if self._plain_splits:
+            return np.where(nan, 0.0, x) > self.threshold[nodes]
+        mt = self.missing_type[nodes]
+        x = np.where(nan & (mt != 2), 0.0, x)
+        use_default = (nan & (mt == 2)) | ((mt == 1) & (np.abs(x) <= _K_ZERO))
+        return np.where(use_default, ~self.default_left[nodes], ~(x <= self.threshold[nodes]))
+
+    def _raw_one(self, x: np.ndarray) -> float:
+        # One row: decide every node at once, then hop max_depth times from
+        # the roots (leaves point to themselves).
+        nxt = np.where(self._go_right(x[self.feature], slice(None)), self.right, self.left)
+        idx = self.roots
+        for _ in range(self.max_depth):
+            idx = nxt[idx]
+        return self.value[idx].sum()
+
+    def _raw_block(self, X: np.ndarray) -> np.ndarray:
+        # Many rows: advance every (row, tree) pair one level per step, only
+        # evaluating the nodes actually visited.
+        flat = X.ravel()
+        row_offset = (np.arange(X.shape[0]) * X.shape[1])[:, None]
+        idx = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        for _ in range(self.max_depth):
+            go_right = self._go_right(flat[row_offset + self.feature[idx]], idx)
+            idx = np.where(go_right, self.right[idx], self.left[idx])
+        return self.value[idx].sum(axis=1)
+
+    def predict_raw(self, X: np.ndarray) -> np.ndarray:
+        """
+        Summed leaf values (LightGBM raw score) for every row of X.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+        if X.shape[0] == 1:
+            raw = np.array([self._raw_one(X[0])])
+        elif X.shape[0] <= self.BLOCK_ROWS:
+            raw = self._raw_block(X)
+        else:
+            raw = np.concatenate(
+                [self._raw_block(X[i:i + self.BLOCK_ROWS]) for i in range(0, X.shape[0], self.BLOCK_ROWS)]
+            )
+        return raw / len(self.roots) if self.average_output else raw
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Same output as Booster.predict: probabilities for binary objectives.
+        """
+        raw = self.predict_raw(X)
+        if self.sigmoid:
+            return 1.0 / (1.0 + np.exp(-self.sigmoid * raw))
+        return raw
@@ -58,8 +58,9 @@ export async function getTopRisks(limit = 50, modelId) {
 }
 
 // --- exact ROC/PR curves if available (switchable by model) ---
-export async function getCurves(modelId) {
-  const q = modelId ? `?model=${encodeURIComponent(modelId)}` : ''
+// maxPoints: server-side shape-preserving downsampling (AUC/AP stay exact)
+export async function getCurves(modelId, maxPoints = 500) {
+  const q = `?max_points=${encodeURIComponent(maxPoints)}${modelId ? `&model=${encodeURIComponent(modelId)}` : ''}`
   const res = await fetch(`${BASE}/api/curves${q}`)
   if (!res.ok) throw new Error('Curves fetch failed')
   return res.json()